@@ -1,11 +1,17 @@
 """
 AI Analysis Engine
 Uses FREE Hugging Face API to analyze AI tools
+
+Configuration (environment):
+    HUGGINGFACE_API_KEY: enables API summaries (otherwise descriptions are truncated)
+    ANALYZER_WORKERS: tools analyzed at once during ingest while summaries
+        go through the API (default: 8)
 """
 
 import os
-import requests
+from scraper import http_client
 import logging
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 import time
 
@@ -24,6 +30,12 @@ class AIAnalyzer:
         # Using free models
         self.summarization_model = "facebook/bart-large-cnn"
         self.sentiment_model = "distilbert-base-uncased-finetuned-sst-2-english"
+        
+        # With a key, most of a tool's analysis is spent waiting on the summary
+        # request, so ingest overlaps several. Without one, analysis is keyword
+        # matching (tens of microseconds a tool) - cheaper than handing tools
+        # to other threads or processes, so it stays on one
+        self.workers = int(os.getenv("ANALYZER_WORKERS", 8)) if self.api_key else 1
     
     def analyze_tool(self, tool_data: Dict) -> Dict:
         """
@@ -96,11 +108,13 @@ class AIAnalyzer:
                 }
             }
             
-            response = requests.post(
+            # Inference is a pure function of the input: safe to retry and hedge
+            response = http_client.post(
                 f"{self.api_url}/{self.summarization_model}",
                 headers=headers,
                 json=payload,
-                timeout=10
+                timeout=10,
+                idempotent=True
             )
             
             if response.status_code == 200:
@@ -151,8 +165,8 @@ class AIAnalyzer:
             if keyword in text:
                 use_cases.append(use_case)
         
-        # Add from tags if available
-        tags = tool_data.get('tags', [])
+        # Add from tags (or GitHub topics) if available
+        tags = tool_data.get('tags') or tool_data.get('topics', [])
         for tag in tags[:3]:  # Top 3 tags
             if tag not in use_cases:
                 use_cases.append(tag.title())
@@ -189,6 +203,14 @@ class AIAnalyzer:
         if downloads:
             score += min(10, downloads / 10000)
         
+        # GitHub forks and recent pushes (max +5 each)
+        forks = tool_data.get('forks', 0)
+        if forks:
+            score += min(5, forks / 200)
+        days_since_push = self._days_since(tool_data.get('pushed_at'))
+        if days_since_push is not None:
+            score += 5 if days_since_push <= 7 else 2 if days_since_push <= 30 else 0
+        
         # Product Hunt upvotes (max +15)
         upvotes = tool_data.get('upvotes', 0)
         if upvotes:
@@ -204,6 +226,20 @@ class AIAnalyzer:
         # Ensure score is between 0-100
         return min(100, max(0, int(score)))
     
+    def _days_since(self, timestamp: Optional[str]) -> Optional[float]:
+        """
+        Days since an ISO timestamp ("2024-10-03T12:00:00Z"), or None
+        """
+        if not timestamp:
+            return None
+        try:
+            then = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if then.tzinfo is None:
+            then = then.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - then).total_seconds() / 86400
+    
     def _detect_pricing(self, description: str) -> str:
         """
         Detect pricing model from description
@@ -237,7 +273,7 @@ class AIAnalyzer:
         Returns:
             Category name
         """
-        text = description.lower()
+        text = f"{description} {' '.join(tool_data.get('topics', []))}".lower()
         
         # Category keywords
         categories = {
@@ -0,0 +1,45 @@
+"""
+Opaque Cursors
+Encodes change feed positions as URL-safe tokens clients pass back unchanged
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+import orjson
+from fastapi import HTTPException
+
+
+def encode_cursor(position: dict) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(position)).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a token back into its position
+
+    Positions only hold timestamps and ids. Anything else is rejected, since
+    the values end up inside a PostgREST filter expression.
+
+    Args:
+        cursor: Token previously returned by encode_cursor
+
+    Returns:
+        The position dict
+
+    Raises:
+        HTTPException 400 if the token is malformed
+    """
+    try:
+        position = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(position, dict):
+            raise ValueError("not an object")
+        for value in position.values():
+            if isinstance(value, str):
+                datetime.fromisoformat(value)
+            elif not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError("not a timestamp or id")
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
@@ -0,0 +1,89 @@
+"""
+Field Projection
+Turns the ?fields= and ?view= query parameters into the column list sent to Supabase
+"""
+
+from typing import List, Optional
+
+from fastapi import HTTPException
+
+from database.models import AITool
+
+# Every column a client may ask for
+TOOL_FIELDS = tuple(AITool.model_fields)
+
+# Predefined projections. "card" is exactly what the dashboard's ToolCard renders
+VIEWS = {
+    "full": None,
+    "card": ("id", "name", "description", "url", "source", "category",
+             "hype_score", "github_stars", "pricing", "use_cases"),
+}
+
+# Cards clamp the description to three lines, so longer text is never shown
+CARD_DESCRIPTION_CHARS = 200
+
+
+def select_columns(fields: Optional[str], view: str = "full") -> str:
+    """
+    Build the select() argument for a list query
+
+    Args:
+        fields: Comma separated column names (takes precedence over view)
+        view: Name of a predefined projection ("full" or "card")
+
+    Returns:
+        "*" or a comma separated column list (always including id)
+
+    Raises:
+        HTTPException 400 on an unknown view or field
+    """
+    if fields:
+        columns = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [c for c in columns if c not in TOOL_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(TOOL_FIELDS)}"
+            )
+        if "id" not in columns:
+            columns.insert(0, "id")
+        return ",".join(dict.fromkeys(columns))
+
+    if view not in VIEWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown view: {view}. Available: {', '.join(VIEWS)}"
+        )
+    return ",".join(VIEWS[view]) if VIEWS[view] else "*"
+
+
+def card_row(row: dict) -> dict:
+    """
+    A full row reduced to the card view (what view=card returns for it)
+    """
+    card = {column: row.get(column) for column in VIEWS["card"]}
+    return shape_rows([card], "card")[0]
+
+
+def shape_rows(rows: List[dict], view: str = "full") -> List[dict]:
+    """
+    Apply the parts of a view that can't be pushed into the select
+
+    Args:
+        rows: Rows returned by Supabase
+        view: View the rows were selected for
+
+    Returns:
+        The rows, with card descriptions shortened (rows are copied, not
+        modified - they may be shared with other requests)
+    """
+    if view != "card":
+        return rows
+    return [_shorten(row) for row in rows]
+
+
+def _shorten(row: dict) -> dict:
+    description = row.get("description")
+    if description and len(description) > CARD_DESCRIPTION_CHARS:
+        return {**row, "description": description[:CARD_DESCRIPTION_CHARS - 1].rstrip() + "…"}
+    return row
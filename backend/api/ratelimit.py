@@ -0,0 +1,174 @@
+"""
+Rate Limiting
+Per-client token buckets (by API key or IP) with separate budgets for reads
+and scans, plus concurrency caps for full-table reads
+
+Configuration (environment):
+    RATE_LIMIT_ENABLED: "false" to turn limiting off (default: on)
+    RATE_LIMIT_READ: read budget per client (default: "120/minute")
+    RATE_LIMIT_SCAN: scan trigger budget per client (default: "5/hour")
+    API_KEYS: comma separated keys; a request with a known X-API-Key gets
+        its own budget instead of sharing its IP's
+    MAX_CONCURRENT_FULL_READS: full-table database reads allowed at once
+        (default: 4)
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from monitoring.metrics import RATE_LIMITED
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Hard cap on tracked clients, in case idle eviction can't keep up
+MAX_CLIENTS = 100_000
+
+
+def parse_rate(rate: str) -> tuple:
+    """
+    "120/minute" -> (120, 60.0); the period may also be given in seconds ("5/30")
+    """
+    count, period = rate.split("/")
+    seconds = PERIODS.get(period.strip()) or float(period)
+    return float(count), float(seconds)
+
+
+class RateLimiter:
+    """
+    Token bucket per client: `rate` requests per `per` seconds, with bursts
+    up to `rate`
+
+    Each client costs one dict entry (tokens, last seen). Entries sit in
+    least-recently-seen order and are dropped once idle for `per` seconds,
+    by which time their bucket would have refilled - so dropping them
+    loses nothing.
+    """
+
+    def __init__(self, name: str, rate: float, per: float, max_clients: int = MAX_CLIENTS):
+        self.name = name
+        self.capacity = rate
+        self.refill_per_second = rate / per
+        self.idle_seconds = per
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str) -> float:
+        """
+        Take one token for client
+
+        Returns:
+            0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+
+            bucket = self._buckets.pop(client, None)
+            if bucket is None:
+                tokens = self.capacity
+            else:
+                tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+
+            if tokens >= 1:
+                self._buckets[client] = (tokens - 1, now)
+                return 0.0
+
+            self._buckets[client] = (tokens, now)
+            return (1 - tokens) / self.refill_per_second
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _evict(self, now: float):
+        buckets = self._buckets
+        while buckets:
+            client, (_, last_seen) = next(iter(buckets.items()))
+            if now - last_seen < self.idle_seconds and len(buckets) < self.max_clients:
+                break
+            buckets.popitem(last=False)
+
+
+class ConcurrencyLimit:
+    """
+    Caps how many expensive operations run at once; callers over the cap
+    are turned away rather than queued
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def acquire(self):
+        """
+        Raises:
+            HTTPException 429 if every slot is taken
+        """
+        if not self._slots.acquire(blocking=False):
+            RATE_LIMITED.inc(budget=self.name)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many concurrent requests, try again shortly",
+                headers={"Retry-After": "1"}
+            )
+
+    def release(self):
+        self._slots.release()
+
+
+ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+API_KEYS = {key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip()}
+
+LIMITERS = {
+    "read": RateLimiter("read", *parse_rate(os.getenv("RATE_LIMIT_READ", "120/minute"))),
+    "scan": RateLimiter("scan", *parse_rate(os.getenv("RATE_LIMIT_SCAN", "5/hour"))),
+}
+
+full_table_reads = ConcurrencyLimit("full_table", int(os.getenv("MAX_CONCURRENT_FULL_READS", 4)))
+
+
+def client_key(request: Request) -> str:
+    """
+    Who a request counts against: a known API key, else the client's IP
+
+    Behind Render's proxy the client address is the last X-Forwarded-For
+    entry (the one the proxy appended); earlier entries are client-supplied.
+    """
+    api_key: Optional[str] = request.headers.get("x-api-key")
+    if api_key and api_key in API_KEYS:
+        return f"key:{api_key}"
+
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return f"ip:{forwarded.rsplit(',', 1)[-1].strip()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def rate_limit(budget: str):
+    """
+    Route dependency charging one request against a budget
+
+    Example:
+        @app.post("/api/scan/manual", dependencies=[Depends(rate_limit("scan"))])
+    """
+    limiter = LIMITERS[budget]
+
+    async def dependency(request: Request):
+        if not ENABLED:
+            return
+        wait = limiter.acquire(client_key(request))
+        if wait:
+            RATE_LIMITED.inc(budget=budget)
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded ({budget})",
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+
+    return dependency
@@ -0,0 +1,127 @@
+"""
+Fast List Responses
+Encodes large row lists straight to bytes with orjson (or MessagePack on request),
+skipping FastAPI's per-row response_model validation and jsonable_encoder walk
+"""
+
+import zlib
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+
+try:
+    import msgpack
+except ImportError:  # optional - clients asking for MessagePack get JSON instead
+    msgpack = None
+
+MSGPACK_TYPES = ("application/x-msgpack", "application/msgpack")
+
+
+class MsgPackResponse(Response):
+    """
+    MessagePack-encoded response (smaller and faster to decode than JSON)
+    """
+
+    media_type = "application/x-msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True, default=str)
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    Streaming response that calls on_close once it is done being sent, however
+    that ends: stream finished, client gone mid-stream, request cancelled, or
+    the body never iterated at all. A generator's own finally only runs if the
+    generator was started, and only when it is closed or collected.
+    """
+
+    def __init__(self, content: Iterable, on_close: Callable[[], None], **kwargs):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.on_close()
+
+
+def wants_msgpack(request: Request) -> bool:
+    if msgpack is None:
+        return False
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_TYPES)
+
+
+def json_bytes_response(request: Request, body: bytes, gzipped_body: Optional[bytes] = None,
+                        version: Optional[int] = None) -> Response:
+    """
+    Send JSON that is already encoded (e.g. from the catalog snapshot)
+
+    Args:
+        request: Incoming request (Accept-Encoding decides on gzip)
+        body: Encoded JSON
+        gzipped_body: The same body pre-compressed, sent to clients accepting gzip
+        version: Catalog snapshot version, exposed as X-Catalog-Version
+
+    Returns:
+        Response with the bytes as-is
+    """
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if version is not None:
+        headers["X-Catalog-Version"] = str(version)
+    if gzipped_body is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        body = gzipped_body
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def list_response(request: Request, rows: List[dict]) -> Response:
+    """
+    Encode database rows for a list endpoint
+
+    Rows come straight from Supabase and are already JSON-safe, so they are
+    encoded as-is without validating each one against a model.
+
+    Args:
+        request: Incoming request (its Accept header picks the format)
+        rows: Rows to return
+
+    Returns:
+        MessagePack response if the client asked for it, otherwise orjson
+    """
+    if wants_msgpack(request):
+        return MsgPackResponse(rows, headers={"Vary": "Accept"})
+    return ORJSONResponse(rows, headers={"Vary": "Accept"})
+
+
+def ndjson_chunks(pages: Iterable[List[dict]], compress: bool = False) -> Iterator[bytes]:
+    """
+    Encode pages of rows as newline-delimited JSON, one chunk per page
+
+    Only the current page is ever held in memory, so a full-table export
+    costs the same as exporting a single page.
+
+    Args:
+        pages: Row pages, e.g. Database.iter_tool_pages()
+        compress: gzip the stream (send with Content-Encoding: gzip)
+
+    Yields:
+        Encoded bytes, one chunk per page
+    """
+    # wbits=31: zlib writes a gzip header and trailer
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    for page in pages:
+        chunk = b"".join(orjson.dumps(row) + b"\n" for row in page)
+        if compressor is None:
+            yield chunk
+        else:
+            # Z_SYNC_FLUSH so every page reaches the client as soon as it's read
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    if compressor is not None:
+        yield compressor.flush()
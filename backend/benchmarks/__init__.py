@@ -0,0 +1,4 @@
+"""
+Benchmarks
+Offline performance checks for the backend (run from the backend folder)
+"""
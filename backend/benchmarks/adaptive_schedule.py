@@ -0,0 +1,170 @@
+"""
+Adaptive Scheduling Benchmark
+Simulates weeks of scheduled scans to compare a fixed daily cadence with the
+per-source intervals of scheduler/adaptive.py
+
+Usage (from the backend folder):
+    python -m benchmarks.adaptive_schedule
+    python -m benchmarks.adaptive_schedule --days 90 --items 200
+
+Three synthetic sources change at very different speeds (each item changes
+at random, a few times a day, every couple of weeks, or about every few
+months). The scheduler checks every 6 hours, as the cron does, and scans the
+sources ScanPolicy says are due; its scan_logs history is kept in memory.
+Each scan finds the items that changed since the last one, and the time each
+change waited to be picked up is its staleness.
+
+Reports scans (upstream traffic), items fetched (database lookups) and
+staleness per source for both policies. Exits 1 if the adaptive policy
+scans more than the fixed one, or if changes wait longer on average.
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import adaptive
+from scheduler.adaptive import ScanPolicy
+
+# Chance per hour that a given item changes (new stars, new version, ...)
+SOURCES = {
+    "fast": 0.03,       # ~50% of items a day, like GitHub trending
+    "slow": 0.003,      # ~7% a day
+    "idle": 0.0005,     # ~1% a day
+}
+TICK_HOURS = 6
+JITTER_MINUTES = 5
+
+
+class ScanLogs:
+    """
+    In-memory stand-in for the scan_logs queries the policy makes
+    """
+
+    def __init__(self):
+        self.rows: Dict[str, List[dict]] = {}
+
+    def get_source_scans(self, source: str, limit: int = 20) -> List[dict]:
+        return list(reversed(self.rows.get(source, [])[-limit:]))
+
+    def log(self, source: str, at: datetime, scraped: int, changed: int):
+        self.rows.setdefault(source, []).append({
+            "started_at": at.isoformat(), "status": "success",
+            "rows_scraped": scraped, "rows_inserted": 0, "rows_updated": changed,
+        })
+
+
+class Source:
+    """
+    Items that each change at random (a Poisson process per item)
+    """
+
+    def __init__(self, hazard: float, items: int, start: datetime, rng: random.Random):
+        self.hazard = hazard
+        self.rng = rng
+        self.next_change = [start + self._wait() for _ in range(items)]
+        self.pending: List[datetime] = [None] * items
+
+    def _wait(self) -> timedelta:
+        return timedelta(hours=self.rng.expovariate(self.hazard))
+
+    def scan(self, at: datetime) -> List[float]:
+        """
+        Pick up every change up to `at`; returns each changed item's wait in hours
+        """
+        waits = []
+        for i, when in enumerate(self.next_change):
+            while when <= at:
+                if self.pending[i] is None:
+                    self.pending[i] = when
+                when += self._wait()
+            self.next_change[i] = when
+            if self.pending[i] is not None:
+                waits.append((at - self.pending[i]).total_seconds() / 3600)
+                self.pending[i] = None
+        return waits
+
+
+def simulate(policy: ScanPolicy, days: int, items: int, seed: int) -> Dict[str, dict]:
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 1)
+    sources = {name: Source(hazard, items, start, random.Random(seed + i))
+               for i, (name, hazard) in enumerate(SOURCES.items())}
+    stats = {name: {"scans": 0, "fetched": 0, "changes": 0, "wait_hours": 0.0, "max_wait": 0.0}
+             for name in sources}
+    logs = ScanLogs()
+
+    with mock.patch.object(adaptive, "db", logs):
+        for tick in range(days * 24 // TICK_HOURS):
+            now = start + timedelta(hours=tick * TICK_HOURS, minutes=rng.uniform(0, JITTER_MINUTES))
+            for name in policy.due(list(sources), now):
+                waits = sources[name].scan(now)
+                logs.log(name, now, items, len(waits))
+                s = stats[name]
+                s["scans"] += 1
+                s["fetched"] += items
+                s["changes"] += len(waits)
+                s["wait_hours"] += sum(waits)
+                s["max_wait"] = max([s["max_wait"]] + waits)
+        for name in sources:
+            stats[name]["interval"] = policy.interval(list(reversed(logs.get_source_scans(name))))
+    return stats
+
+
+def _summary(stats: Dict[str, dict]) -> dict:
+    changes = sum(s["changes"] for s in stats.values())
+    return {
+        "scans": sum(s["scans"] for s in stats.values()),
+        "fetched": sum(s["fetched"] for s in stats.values()),
+        "mean_wait": sum(s["wait_hours"] for s in stats.values()) / max(changes, 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Adaptive scan scheduling benchmark")
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--items", type=int, default=100, help="items per source")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    fixed_policy = ScanPolicy()
+    fixed_policy.enabled = False
+    # Quiet the per-tick plan lines
+    adaptive.logger.disabled = True
+
+    results = {
+        "fixed": simulate(fixed_policy, args.days, args.items, args.seed),
+        "adaptive": simulate(ScanPolicy(), args.days, args.items, args.seed),
+    }
+
+    for label, stats in results.items():
+        print(f"{label}:")
+        for name, s in stats.items():
+            print(f"  {name:<5} | every {s['interval'] / 3600:>5.1f}h | {s['scans']:>4} scans | "
+                  f"{s['changes']:>5} changes | mean wait {s['wait_hours'] / max(s['changes'], 1):>5.1f}h | "
+                  f"max {s['max_wait']:>5.1f}h")
+
+    fixed, adapted = _summary(results["fixed"]), _summary(results["adaptive"])
+    print(
+        f"\nscans {fixed['scans']} -> {adapted['scans']} | "
+        f"items fetched {fixed['fetched']} -> {adapted['fetched']} | "
+        f"mean wait per change {fixed['mean_wait']:.1f}h -> {adapted['mean_wait']:.1f}h"
+    )
+
+    if adapted["scans"] > fixed["scans"]:
+        print(f"\nREGRESSION: adaptive scheduling scanned more ({adapted['scans']} vs {fixed['scans']})")
+        return 1
+    if adapted["mean_wait"] > fixed["mean_wait"]:
+        print(f"\nREGRESSION: changes waited longer ({adapted['mean_wait']:.1f}h vs {fixed['mean_wait']:.1f}h)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Archival Benchmark
+Read query latency on ai_tools before and after archiving stale tools
+
+Usage (from the backend folder, against a scratch Postgres - never production):
+    DATABASE_URL=postgresql://... python -m benchmarks.archive_latency
+    DATABASE_URL=postgresql://... python -m benchmarks.archive_latency --rows 50000
+
+Builds the schema from database/migrations in a throwaway schema, fills it
+with --rows tools discovered over the last --days days, times the queries
+behind /api/tools, /api/stats, /api/categories and /api/trending, then moves
+rows with the same rules as scheduler/archive.py (ARCHIVE_* settings) and
+times them again. Exits 1 if the hot table ends up over ARCHIVE_MAX_HOT_ROWS
+or the full-list query didn't get faster.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.migrate import _connect, load_migrations
+from scheduler.archive import Archiver
+
+SCHEMA = "archive_benchmark"
+
+QUERIES = [
+    ("list (/api/tools)", "SELECT * FROM ai_tools ORDER BY created_at DESC"),
+    ("stats (/api/stats)", "SELECT count(*), avg(hype_score) FROM ai_tools"),
+    ("categories", "SELECT category, count(*) FROM ai_tools GROUP BY category ORDER BY 2 DESC"),
+    ("trending", "SELECT * FROM ai_tools WHERE discovered_date >= CURRENT_DATE ORDER BY hype_score DESC"),
+]
+
+
+def setup(conn, rows: int, days: int):
+    conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    conn.execute(f"SET search_path TO {SCHEMA}")
+    for _, _, sql in load_migrations():
+        conn.execute(sql)
+
+    conn.execute("""
+        INSERT INTO ai_tools (name, description, url, source, category, hype_score,
+                              github_stars, pricing, use_cases, tags,
+                              discovered_date, created_at, updated_at)
+        SELECT 'tool-' || g,
+               'An open-source model for text generation, summarization and question answering.',
+               'https://github.com/example/tool-' || g,
+               (ARRAY['github', 'huggingface', 'producthunt'])[1 + g %% 3],
+               (ARRAY['NLP', 'Computer Vision', 'Audio', 'Code', 'Multimodal', 'Other'])[1 + g %% 6],
+               CASE WHEN g %% 10 = 0 THEN NULL ELSE (g * 37) %% 100 END,
+               g %% 5000, 'Free',
+               ARRAY['Text generation', 'Summarization'], ARRAY['llm', 'nlp'],
+               d, d, d
+        FROM (
+            SELECT g, NOW() - (g %% %(days)s) * INTERVAL '1 day' AS d
+            FROM generate_series(1, %(rows)s) g
+        ) generated
+    """, {"rows": rows, "days": days})
+    conn.execute("VACUUM ANALYZE ai_tools")
+
+
+def archive(conn, archiver: Archiver) -> int:
+    """
+    The moves Archiver.run() makes through Supabase, as single statements
+    """
+    moved = conn.execute("""
+        WITH moved AS (
+            DELETE FROM ai_tools
+            WHERE discovered_date < NOW() - %(days)s * INTERVAL '1 day'
+              AND (hype_score IS NULL OR hype_score < %(hype)s)
+            RETURNING *
+        )
+        INSERT INTO ai_tools_archive SELECT *, NOW() FROM moved
+    """, {"days": archiver.after_days, "hype": archiver.max_hype}).rowcount
+
+    if archiver.max_hot_rows > 0:
+        moved += conn.execute("""
+            WITH moved AS (
+                DELETE FROM ai_tools WHERE id IN (
+                    SELECT id FROM ai_tools
+                    ORDER BY discovered_date DESC, hype_score DESC
+                    OFFSET %(keep)s
+                )
+                RETURNING *
+            )
+            INSERT INTO ai_tools_archive SELECT *, NOW() FROM moved
+        """, {"keep": archiver.max_hot_rows}).rowcount
+
+    conn.execute("VACUUM ANALYZE ai_tools")
+    return moved
+
+
+def measure(conn, repeats: int) -> dict:
+    timings = {}
+    for name, sql in QUERIES:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best * 1000
+    return timings
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Archival benchmark")
+    parser.add_argument("--database-url", help="defaults to $DATABASE_URL")
+    parser.add_argument("--rows", type=int, default=200000, help="tools to generate")
+    parser.add_argument("--days", type=int, default=730, help="spread of discovery dates")
+    parser.add_argument("--repeats", type=int, default=5, help="timings per query (best counts)")
+    args = parser.parse_args(argv)
+
+    archiver = Archiver()
+    conn = _connect(args.database_url)
+    conn.autocommit = True
+
+    try:
+        print(f"Generating {args.rows} tools over {args.days} days...")
+        setup(conn, args.rows, args.days)
+        before = measure(conn, args.repeats)
+
+        moved = archive(conn, archiver)
+        hot = conn.execute("SELECT count(*) FROM ai_tools").fetchone()[0]
+        after = measure(conn, args.repeats)
+
+        print(
+            f"Archived {moved} tools (older than {archiver.after_days} days with hype < {archiver.max_hype}, "
+            f"cap {archiver.max_hot_rows}); hot table: {args.rows} -> {hot} rows\n"
+        )
+        for name, _ in QUERIES:
+            print(
+                f"{name:<20} | {before[name]:>9.2f} ms -> {after[name]:>8.2f} ms | "
+                f"{before[name] / after[name]:>6.1f}x"
+            )
+    finally:
+        conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.close()
+
+    if archiver.max_hot_rows > 0 and hot > archiver.max_hot_rows:
+        print(f"\nREGRESSION: hot table has {hot} rows, cap is {archiver.max_hot_rows}")
+        return 1
+    if after["list (/api/tools)"] >= before["list (/api/tools)"]:
+        print("\nREGRESSION: archiving did not speed up the full list")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
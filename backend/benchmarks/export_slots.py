@@ -0,0 +1,132 @@
+"""
+Export Slot Benchmark
+Checks that /api/tools/export gives back its full-table read slot however
+the stream ends, and times a full export
+
+Usage (from the backend folder):
+    python -m benchmarks.export_slots
+    python -m benchmarks.export_slots --rows 20000
+
+Drives the ASGI app directly (no network) over the in-memory fake Supabase
+client, with MAX_CONCURRENT_FULL_READS=1 so a single leaked slot turns every
+later full-table read into a 429. Each case ends one export a different way,
+then makes a complete export that must get its slot:
+    complete     the client reads the whole stream
+    disconnect   the client goes away after the first chunk
+    unread       the client is gone before the headers: the body is never
+                 iterated
+    cancelled    the request task is cancelled mid-stream
+Exits 1 if a follow-up export is turned away or comes back short.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_db import FakeSupabaseClient, install_fake_client
+
+fake_client = FakeSupabaseClient()
+
+PATH = "/api/tools/export"
+
+
+class ClientGone(Exception):
+    """
+    What a server's send() raises once the peer has closed the connection
+    """
+
+
+async def export(app, abort: str = "") -> tuple:
+    """
+    Run one export; returns (status, rows received)
+
+    Args:
+        abort: "" to read everything, or how the client ends it early:
+            "disconnect", "unread" or "cancelled"
+    """
+    first_chunk = asyncio.Event()
+    status, rows = None, 0
+    requested = []
+
+    async def receive():
+        if not requested:
+            requested.append(True)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Starlette listens for the disconnect while it streams
+        await first_chunk.wait()
+        if abort == "disconnect":
+            return {"type": "http.disconnect"}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status, rows
+        if message["type"] == "http.response.start":
+            if abort == "unread":
+                raise ClientGone()
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            rows += message.get("body", b"").count(b"\n")
+            first_chunk.set()
+            # Let the disconnect listener run between chunks, like a real socket
+            await asyncio.sleep(0)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": PATH, "raw_path": PATH.encode(),
+        "query_string": b"", "root_path": "", "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+    }
+    task = asyncio.ensure_future(app(scope, receive, send))
+    if abort == "cancelled":
+        await first_chunk.wait()
+        task.cancel()
+    try:
+        await task
+    except (ClientGone, asyncio.CancelledError):
+        pass
+    return status, rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export slot benchmark")
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    os.environ["MAX_CONCURRENT_FULL_READS"] = "1"
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    install_fake_client(fake_client)
+    fake_client.table("ai_tools").insert([
+        {"name": f"tool-{i}", "url": f"https://example.com/{i}", "source": "benchmark"}
+        for i in range(args.rows)
+    ]).execute()
+
+    import main as api
+
+    failures = []
+    for case in ("complete", "disconnect", "unread", "cancelled"):
+        start = time.perf_counter()
+        status, rows = asyncio.run(export(api.app, "" if case == "complete" else case))
+        elapsed = time.perf_counter() - start
+        after_status, after_rows = asyncio.run(export(api.app))
+        print(f"{case:<11} {rows:>7} rows, {elapsed * 1000:8.1f} ms | "
+              f"next export: {after_status}, {after_rows} rows")
+
+        if case == "complete" and rows != args.rows:
+            failures.append(f"complete: got {rows} of {args.rows} rows")
+        if after_status != 200 or after_rows != args.rows:
+            failures.append(f"after {case}: the next export got {after_status} with {after_rows} rows "
+                            f"(the full-table slot leaked)")
+
+    for failure in failures:
+        print(f"\nREGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+"""
+In-memory Fake Database
+Stands in for the Supabase client so benchmarks never touch the network
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from unittest import mock
+import itertools
+import os
+
+# Columns that get a hash index, like the real table's unique/btree indexes
+INDEXED_COLUMNS = ("id", "url", "name")
+
+# Columns the real tables' triggers set from the database clock on every
+# insert and update (migration 0008), whatever the client sent
+CLOCK_COLUMNS = {"ai_tools": "updated_at", "ai_tools_tombstones": "deleted_at"}
+
+
+def _db_now() -> str:
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+class FakeResponse:
+    """
+    Mimics the response object returned by postgrest's execute()
+    """
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class FakeTable:
+    """
+    Rows of a single table, keyed by id, with hash indexes on hot columns
+    """
+
+    def __init__(self, name: str, retain_columns: Optional[tuple] = None):
+        self.name = name
+        self.retain_columns = retain_columns
+        self.clock_column = CLOCK_COLUMNS.get(name)
+        self.rows: Dict[int, dict] = {}
+        self.indexes: Dict[str, Dict[Any, set]] = {col: {} for col in INDEXED_COLUMNS}
+        self._ids = itertools.count(1)
+
+    def add(self, row: dict) -> dict:
+        if self.clock_column:
+            row = {**row, self.clock_column: _db_now()}
+        row = self._trim(row)
+        if row.get("id") is None:
+            row["id"] = next(self._ids)
+        self.rows[row["id"]] = row
+        self._index(row)
+        return row
+
+    def remove(self, row: dict):
+        self._unindex(row)
+        self.rows.pop(row["id"], None)
+
+    def replace(self, row: dict, updates: dict) -> dict:
+        self._unindex(row)
+        if self.clock_column:
+            updates = {**updates, self.clock_column: _db_now()}
+        row.update(self._trim(updates))
+        self._index(row)
+        return row
+
+    def _trim(self, row: dict) -> dict:
+        if self.retain_columns is None:
+            return dict(row)
+        return {k: v for k, v in row.items() if k in self.retain_columns}
+
+    def candidates(self, filters: List[tuple]) -> List[dict]:
+        """
+        Use an index for the first indexed equality or IN filter, else scan everything
+        """
+        for op, column, value in filters:
+            if op == "eq" and column in self.indexes:
+                ids = self.indexes[column].get(value, ())
+                return [self.rows[i] for i in sorted(ids)]
+            if op == "in" and column in self.indexes:
+                # Like Postgres probing its index once per listed value
+                index = self.indexes[column]
+                ids = set().union(*(index.get(v, ()) for v in value))
+                return [self.rows[i] for i in sorted(ids)]
+        return list(self.rows.values())
+
+    def _index(self, row: dict):
+        for column, index in self.indexes.items():
+            value = row.get(column)
+            if value is not None:
+                index.setdefault(value, set()).add(row["id"])
+
+    def _unindex(self, row: dict):
+        for column, index in self.indexes.items():
+            ids = index.get(row.get(column))
+            if ids:
+                ids.discard(row["id"])
+
+
+def _split_top_level(expr: str) -> List[str]:
+    """
+    Split a PostgREST logic expression on commas that aren't inside () or quotes
+    """
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in expr:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _parse_condition(item: str) -> tuple:
+    """
+    "updated_at.gt.\"2024-01-01\"" -> ("gt", "updated_at", "2024-01-01")
+    "and(a.eq.1,b.gt.2)"            -> ("and", None, [(...), (...)])
+    """
+    if item.startswith("and(") and item.endswith(")"):
+        return ("and", None, [_parse_condition(p) for p in _split_top_level(item[4:-1])])
+    column, op, value = item.split(".", 2)
+    value = value.strip('"')
+    if op == "is" and value == "null":
+        return (op, column, None)
+    if value.lstrip("-").isdigit():
+        value = int(value)
+    return (op, column, value)
+
+
+def _matches(row: dict, filters: List[tuple]) -> bool:
+    for op, column, value in filters:
+        if op == "or":
+            if not any(_matches(row, [condition]) for condition in value):
+                return False
+            continue
+        if op == "and":
+            if not _matches(row, value):
+                return False
+            continue
+        field = row.get(column)
+        if op == "eq" and field != value:
+            return False
+        if op == "neq" and field == value:
+            return False
+        if op == "in" and field not in value:
+            return False
+        if op == "is" and field is not value:
+            return False
+        if op in ("gt", "gte", "lt", "lte"):
+            if field is None:
+                return False
+            if op == "gt" and not field > value:
+                return False
+            if op == "gte" and not field >= value:
+                return False
+            if op == "lt" and not field < value:
+                return False
+            if op == "lte" and not field <= value:
+                return False
+    return True
+
+
+class FakeQuery:
+    """
+    Chainable query builder with the subset of the postgrest API the backend uses
+    """
+
+    def __init__(self, client: "FakeSupabaseClient", table: FakeTable):
+        self.client = client
+        self.table = table
+        self.operation = "select"
+        self.columns: Optional[List[str]] = None
+        self.payload: Any = None
+        self.on_conflict = "id"
+        self.filters: List[tuple] = []
+        self.orders: List[tuple] = []
+        self.row_limit: Optional[int] = None
+        self.row_offset = 0
+        self.count_mode: Optional[str] = None
+
+    # ---- operations ----
+
+    def select(self, *columns: str, count: Optional[str] = None):
+        self.operation = "select"
+        joined = ",".join(columns) if columns else "*"
+        if joined.strip() != "*":
+            self.columns = [c.strip() for c in joined.split(",") if c.strip()]
+        self.count_mode = count
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.operation = "insert"
+        self.payload = rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "id", **kwargs):
+        self.operation = "upsert"
+        self.payload = rows
+        self.on_conflict = on_conflict or "id"
+        return self
+
+    def update(self, values: dict, **kwargs):
+        self.operation = "update"
+        self.payload = values
+        return self
+
+    def delete(self, **kwargs):
+        self.operation = "delete"
+        return self
+
+    # ---- filters and modifiers ----
+
+    def eq(self, column: str, value):
+        self.filters.append(("eq", column, value))
+        return self
+
+    def neq(self, column: str, value):
+        self.filters.append(("neq", column, value))
+        return self
+
+    def gt(self, column: str, value):
+        self.filters.append(("gt", column, value))
+        return self
+
+    def gte(self, column: str, value):
+        self.filters.append(("gte", column, value))
+        return self
+
+    def lt(self, column: str, value):
+        self.filters.append(("lt", column, value))
+        return self
+
+    def lte(self, column: str, value):
+        self.filters.append(("lte", column, value))
+        return self
+
+    def in_(self, column: str, values):
+        self.filters.append(("in", column, set(values)))
+        return self
+
+    def is_(self, column: str, value):
+        self.filters.append(("is", column, None if value in (None, "null") else value))
+        return self
+
+    def or_(self, filters: str, **kwargs):
+        self.filters.append(("or", None, [_parse_condition(p) for p in _split_top_level(filters)]))
+        return self
+
+    def order(self, column: str, desc: bool = False, **kwargs):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size: int, **kwargs):
+        self.row_limit = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs):
+        self.row_offset = start
+        self.row_limit = end - start + 1
+        return self
+
+    # ---- execution ----
+
+    def execute(self) -> FakeResponse:
+        self.client.record(self.operation, self.table.name)
+
+        if self.operation == "insert":
+            rows = self.payload if isinstance(self.payload, list) else [self.payload]
+            return FakeResponse([dict(self.table.add(row)) for row in rows])
+
+        if self.operation == "upsert":
+            rows = self.payload if isinstance(self.payload, list) else [self.payload]
+            saved = []
+            for row in rows:
+                key = row.get(self.on_conflict)
+                existing = self.table.candidates([("eq", self.on_conflict, key)])
+                existing = [r for r in existing if r.get(self.on_conflict) == key]
+                if key is not None and existing:
+                    saved.append(dict(self.table.replace(existing[0], dict(row))))
+                else:
+                    saved.append(dict(self.table.add(row)))
+            return FakeResponse(saved)
+
+        matched = [r for r in self.table.candidates(self.filters) if _matches(r, self.filters)]
+
+        if self.operation == "update":
+            return FakeResponse([dict(self.table.replace(r, dict(self.payload))) for r in matched])
+
+        if self.operation == "delete":
+            for row in matched:
+                self.table.remove(row)
+            return FakeResponse([dict(r) for r in matched])
+
+        total = len(matched)
+        for column, desc in reversed(self.orders):
+            present = [r for r in matched if r.get(column) is not None]
+            missing = [r for r in matched if r.get(column) is None]
+            present.sort(key=lambda r: r[column], reverse=desc)
+            # Postgres puts NULLs first when sorting descending
+            matched = missing + present if desc else present + missing
+
+        end = None if self.row_limit is None else self.row_offset + self.row_limit
+        matched = matched[self.row_offset:end]
+
+        if self.columns is not None:
+            data = [{c: r.get(c) for c in self.columns} for r in matched]
+        else:
+            data = [dict(r) for r in matched]
+
+        return FakeResponse(data, count=total if self.count_mode else None)
+
+
+class FakeRpc:
+    """
+    A call to one of the database functions the migrations define
+    """
+
+    def __init__(self, client: "FakeSupabaseClient", fn: str, params: dict):
+        self.client = client
+        self.fn = fn
+        self.params = params or {}
+
+    def execute(self) -> FakeResponse:
+        self.client.record("rpc", self.fn)
+        if self.fn == "update_tools":
+            # UPDATE ... FROM the rows: ids that don't exist match nothing
+            table = self.client.table("ai_tools").table
+            updated = 0
+            for row in self.params["rows"]:
+                existing = table.rows.get(row["id"])
+                if existing is not None:
+                    table.replace(existing, dict(row))
+                    updated += 1
+            return FakeResponse(updated)
+        raise NotImplementedError(f"no fake for database function {self.fn}")
+
+
+class FakeSupabaseClient:
+    """
+    Drop-in for supabase.Client: client.table(name) returns a chainable query,
+    client.rpc(fn, params) calls a database function
+    Every execute() is counted so benchmarks can report DB calls per record
+
+    Pass retain_columns to keep only those columns of each stored row, so that
+    memory measurements reflect the code under test rather than the fake table.
+    """
+
+    def __init__(self, *args, retain_columns: Optional[tuple] = None, **kwargs):
+        self.retain_columns = retain_columns
+        self.tables: Dict[str, FakeTable] = {}
+        self.calls: Dict[tuple, int] = {}
+
+    def table(self, name: str) -> FakeQuery:
+        if name not in self.tables:
+            self.tables[name] = FakeTable(name, self.retain_columns)
+        return FakeQuery(self, self.tables[name])
+
+    def from_(self, name: str) -> FakeQuery:
+        return self.table(name)
+
+    def rpc(self, fn: str, params: Optional[dict] = None, **kwargs) -> FakeRpc:
+        return FakeRpc(self, fn, params)
+
+    def record(self, operation: str, table: str):
+        key = (operation, table)
+        self.calls[key] = self.calls.get(key, 0) + 1
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self):
+        """
+        Drop all rows and call counters
+        """
+        self.tables.clear()
+        self.calls.clear()
+
+
+def install_fake_client(client: FakeSupabaseClient):
+    """
+    Make the backend's shared Database use `client` instead of Supabase
+
+    Must run before anything imports database.connection's `db`.
+    """
+    os.environ.setdefault("ENVIRONMENT", "benchmark")
+    os.environ.setdefault("SUPABASE_URL", "http://fake-supabase.local")
+    os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "eyJbenchmark")
+
+    with mock.patch("supabase.create_client", return_value=client):
+        from database.connection import get_db
+        return get_db()
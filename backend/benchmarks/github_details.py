@@ -0,0 +1,140 @@
+"""
+GitHub Details Benchmark
+Checks that repo details are fetched a batch at a time and cached, against
+a local stand-in for GitHub's GraphQL API
+
+Usage (from the backend folder):
+    python -m benchmarks.github_details
+    python -m benchmarks.github_details --repos 500
+
+Serves a minimal GraphQL endpoint that answers aliased repository(owner:,
+name:) queries with made-up details (and null, as GitHub does, for repos
+named missing-*), then runs stream_tools over synthetic trending repos with
+the details stage, against the in-memory fake Supabase client:
+    batched    every repo is resolved in ceil(repos / batch) queries, and the
+               stored tools carry topics and logo_url
+    cached     the same repos scanned again cost no query
+    down       with the endpoint unreachable, every repo is still stored
+Exits 1 if any of these doesn't hold.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Spool to a throwaway file, so runs never resume each other's leftovers
+os.environ.setdefault("INGEST_SPOOL_PATH", os.path.join(tempfile.mkdtemp(), "spool.db"))
+# Fail fast once the endpoint is gone
+os.environ.setdefault("UPSTREAM_BACKOFF_BASE", "0.01")
+
+from benchmarks.fake_db import FakeSupabaseClient, install_fake_client
+
+_queries = []
+_lock = threading.Lock()
+
+
+class GraphQLStandIn(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        aliases = re.findall(r"(r\d+): repository\(owner: \$(o\d+), name: \$(n\d+)\)", body["query"])
+        with _lock:
+            _queries.append(len(aliases))
+
+        data, errors = {}, []
+        for alias, owner_var, name_var in aliases:
+            owner, name = body["variables"][owner_var], body["variables"][name_var]
+            if name.startswith("missing-"):
+                data[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias],
+                               "message": f"Could not resolve to a Repository with the name '{owner}/{name}'."})
+                continue
+            data[alias] = {
+                "stargazerCount": 1000 + len(name),
+                "forkCount": 120,
+                "pushedAt": "2024-10-01T12:00:00Z",
+                "homepageUrl": f"https://{name}.dev",
+                "licenseInfo": {"spdxId": "MIT", "name": "MIT License"},
+                "owner": {"avatarUrl": f"https://avatars.githubusercontent.com/{owner}"},
+                "repositoryTopics": {"nodes": [{"topic": {"name": "llm"}}, {"topic": {"name": "rag"}}]},
+            }
+        self._reply({"data": data, **({"errors": errors} if errors else {})})
+
+    def _reply(self, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def repos(count: int, prefix: str):
+    for i in range(count):
+        name = f"missing-{prefix}-{i}" if i % 25 == 24 else f"{prefix}-agent-{i}"
+        yield {"name": f"example-{name}", "url": f"https://github.com/example/{name}",
+               "description": "An LLM agent framework", "stars": 1000, "today_stars": 10,
+               "language": "Python", "source": "github"}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="GitHub details batching benchmark")
+    parser.add_argument("--repos", type=int, default=120)
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GraphQLStandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = FakeSupabaseClient()
+    install_fake_client(client)
+
+    from scraper.github_details import GitHubDetails
+    from scraper.github_ingest import _build_tool
+    from scraper.refresh import stream_tools
+
+    details = GitHubDetails()
+    details.token = "stand-in"
+    details.url = f"http://127.0.0.1:{server.server_port}/graphql"
+    expected = math.ceil(args.repos / details.batch_size)
+    failures = []
+
+    def check(name: str, ok: bool, detail: str):
+        print(f"{name:<8} | {'ok  ' if ok else 'FAIL'} | {detail}")
+        if not ok:
+            failures.append(name)
+
+    counts = stream_tools("github", repos(args.repos, "a"), _build_tool, details=details.enrich)
+    rows = client.table("ai_tools").select("*").execute().data
+    enriched = [row for row in rows if "llm" in (row.get("tags") or []) and row.get("logo_url")]
+    missing = sum(1 for row in rows if "/missing-" in row["url"])
+    check("batched", len(_queries) == expected and counts["inserted"] == args.repos
+          and len(enriched) == args.repos - missing,
+          f"{args.repos} repos in {len(_queries)} queries (one per repo: {args.repos}); "
+          f"{len(enriched)} stored with topics and logo, {missing} not found upstream")
+
+    before = len(_queries)
+    stream_tools("github", repos(args.repos, "a"), _build_tool, details=details.enrich)
+    check("cached", len(_queries) == before, f"rescan made {len(_queries) - before} queries")
+
+    server.shutdown()
+    server.server_close()
+    counts = stream_tools("github", repos(args.repos, "b"), _build_tool, details=details.enrich)
+    check("down", counts["inserted"] == args.repos,
+          f"endpoint unreachable: {counts['inserted']}/{args.repos} new repos still stored")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Hugging Face Listing Memory Benchmark
+Peak memory of ranking a full=true Hugging Face listing, by listing size:
+read whole with response.json() vs. decoded as it streams in
+(scraper/json_stream.py), keeping every entity or only the top K
+
+Usage (from the backend folder):
+    python -m benchmarks.hf_listing_memory
+    python -m benchmarks.hf_listing_memory --sizes 1000,10000,50000 --top-k 50
+
+Serves listings of recorded models (benchmarks/fixtures/hf_models.json, with
+unique ids and shuffled likes) from a body that is generated as it is read,
+so the only copy of the response in memory is the one the scraper makes.
+Runs iter_trending_models in three modes under tracemalloc:
+    buffered   HF_STREAM_DECODE=false, HF_TOP_K=0: the whole listing at once
+    streamed   HF_STREAM_DECODE=true, HF_TOP_K=0: every entity kept (projected)
+    top-k      the defaults: streamed, keeping limit=--top-k entities
+Exits 1 if the modes disagree on the models or their order, if top-k's heap
+ever holds more than K entities, if its peak grows with the listing (more
+than 1.5x + 1 MB from the smallest size to the largest), or if at the
+largest size it isn't below a tenth of buffered's.
+"""
+
+import argparse
+import heapq
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tracemalloc
+from typing import Iterator, List, Optional
+from unittest import mock
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.replay import _read_fixture
+from scraper.huggingface_scraper import HuggingFaceScraper
+
+
+class _GeneratedBody(io.RawIOBase):
+    """
+    A response body produced piece by piece as it is read
+    """
+
+    def __init__(self, pieces: Iterator[bytes]):
+        self._pieces = pieces
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            self._pending = next(self._pieces, b"")
+            if not self._pending:
+                return 0
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+def listing(size: int, seed: int) -> Iterator[bytes]:
+    recorded = json.loads(_read_fixture("hf_models.json"))
+    likes = list(range(size))
+    random.Random(seed).shuffle(likes)
+    yield b"["
+    for i in range(size):
+        item = dict(recorded[i % len(recorded)])
+        item["id"] = item["modelId"] = f"{item['id']}-{i}"
+        item["likes"] = likes[i]
+        yield (b"," if i else b"") + json.dumps(item).encode()
+    yield b"]"
+
+
+def fetch(size: int, seed: int, stream: bool, top_k: Optional[int], limit: int) -> tuple:
+    """
+    Rank one listing; returns (models, peak MB, largest the heap got)
+    """
+    def serve(session, method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response.raw = _GeneratedBody(listing(size, seed))
+        return response
+
+    scraper = HuggingFaceScraper()
+    scraper.stream_decode = stream
+    scraper.top_k = top_k
+    largest_heap = [0]
+    real_push = heapq.heappush
+
+    def heappush(heap, item):
+        real_push(heap, item)
+        largest_heap[0] = max(largest_heap[0], len(heap))
+
+    with mock.patch.object(requests.Session, "request", serve), \
+            mock.patch.object(heapq, "heappush", heappush):
+        tracemalloc.start()
+        try:
+            models = list(scraper.iter_trending_models(limit=limit))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return models, peak / (1024 * 1024), largest_heap[0]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Hugging Face listing memory benchmark")
+    parser.add_argument("--sizes", default="1000,4000,16000", help="comma separated listing sizes")
+    parser.add_argument("--top-k", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    # Per-model INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+    sizes: List[int] = [int(s) for s in args.sizes.split(",") if s]
+    failures = []
+    peaks = {}
+
+    for size in sizes:
+        # The served listing ignores the limit, like a server returning more than asked
+        buffered, buffered_peak, _ = fetch(size, args.seed, stream=False, top_k=0, limit=size)
+        streamed, streamed_peak, _ = fetch(size, args.seed, stream=True, top_k=0, limit=size)
+        top, top_peak, top_heap = fetch(size, args.seed, stream=True, top_k=None, limit=args.top_k)
+        peaks[size] = (buffered_peak, top_peak)
+        print(f"{size:>7} models | buffered {buffered_peak:>8.2f} MB | streamed {streamed_peak:>8.2f} MB | "
+              f"top {args.top_k} {top_peak:>6.2f} MB, heap <= {top_heap}")
+
+        if len(buffered) != size:
+            failures.append(f"{size}: buffered mode found {len(buffered)} models")
+        if streamed != buffered:
+            failures.append(f"{size}: streamed models differ from buffered")
+        if top != buffered[:args.top_k]:
+            failures.append(f"{size}: top {args.top_k} differ from buffered's first {args.top_k}")
+        if top_heap > args.top_k:
+            failures.append(f"{size}: the heap held {top_heap} entities with limit {args.top_k}")
+
+    smallest, largest = peaks[sizes[0]][1], peaks[sizes[-1]][1]
+    if largest > smallest * 1.5 + 1:
+        failures.append(f"top {args.top_k} peak grew with the listing: {smallest:.2f} MB at {sizes[0]} "
+                        f"-> {largest:.2f} MB at {sizes[-1]}")
+    if largest > peaks[sizes[-1]][0] / 10:
+        failures.append(f"top {args.top_k} peak {largest:.2f} MB at {sizes[-1]} is not under a tenth "
+                        f"of buffered's {peaks[sizes[-1]][0]:.2f} MB")
+
+    for failure in failures:
+        print(f"\nREGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Import-Time Budget
+Checks how long `import main` takes on a cold interpreter, using `python -X importtime`
+
+Usage (from the backend folder):
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --budget-ms 100 --runs 5
+
+The API's own startup cost (everything `main` imports beyond FastAPI itself)
+must stay under the budget, and scraping, scheduling and database client
+modules must not be imported at all until they are first used. Exits
+non-zero on either failure.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Milliseconds `main` may spend importing on top of fastapi
+DEFAULT_BUDGET_MS = 150
+
+# Loaded lazily - a read-only API worker should never pay for these at startup
+FORBIDDEN = [
+    "supabase", "postgrest", "gotrue", "httpx",  # DB client, built on first query
+    "bs4", "lxml", "requests",                   # scraping
+    "apscheduler",                               # embedded scheduler (when enabled)
+    "scraper", "ai_engine",
+    "scheduler.daily_job", "scheduler.jobs", "scheduler.scan_log",
+]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile() -> Dict[str, int]:
+    """
+    Import main in a fresh interpreter
+
+    Returns:
+        Cumulative import time in microseconds per top-level module name
+    """
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")}
+    # No credentials: importing must not try to connect
+    env["ENVIRONMENT"] = "benchmark"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    for match in _LINE.finditer(proc.stderr):
+        cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def forbidden_imports(modules: List[str]) -> List[str]:
+    return sorted(
+        name for name in modules
+        if any(name == f or name.startswith(f + ".") for f in FORBIDDEN)
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="allowed import time of main beyond fastapi")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="fresh interpreters to try (the fastest one counts)")
+    args = parser.parse_args(argv)
+
+    try:
+        runs = [import_profile() for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(f"REGRESSION: {e}")
+        return 1
+    own_ms = min((r["main"] - r.get("fastapi", 0)) / 1000 for r in runs)
+    total_ms = min(r["main"] for r in runs) / 1000
+    fastapi_ms = min(r.get("fastapi", 0) for r in runs) / 1000
+
+    print(f"import main      {total_ms:>8.1f} ms")
+    print(f"  fastapi        {fastapi_ms:>8.1f} ms")
+    print(f"  app modules    {own_ms:>8.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    problems = []
+    if own_ms > args.budget_ms:
+        problems.append(f"main imports take {own_ms:.1f} ms beyond fastapi (budget {args.budget_ms:.0f} ms)")
+    for name in forbidden_imports(list(runs[0])):
+        problems.append(f"{name} is imported at startup")
+
+    for problem in problems:
+        print(f"REGRESSION: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Ingest Throughput Benchmark
+Replays recorded upstream pages through the real ingest_* functions against
+an in-memory fake of the Supabase client
+
+Usage (from the backend folder):
+    python -m benchmarks.ingest_throughput
+    python -m benchmarks.ingest_throughput --sizes 10,1000 --sources github
+    python -m benchmarks.ingest_throughput --update-baseline
+
+Reports records/sec, DB calls per record and peak traced memory per source
+and size, and exits non-zero if any figure regresses past the stored baseline.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_db import FakeSupabaseClient, install_fake_client
+
+# Spool to a throwaway file, so runs never resume each other's leftovers
+os.environ.setdefault("INGEST_SPOOL_PATH", os.path.join(tempfile.mkdtemp(), "spool.db"))
+# The replayed Hugging Face listings hold `size` entities whatever limit is
+# asked for: keep them all rather than the top `limit`
+os.environ.setdefault("HF_TOP_K", "0")
+from benchmarks.replay import RecordedUpstream, replay
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SIZES = [10, 1000, 100000]
+SOURCES = ["github", "huggingface", "producthunt"]
+
+# Allowed drift before a figure counts as a regression.
+# Throughput is noisy across machines; DB calls per record are deterministic.
+THROUGHPUT_TOLERANCE = 0.5
+CALLS_TOLERANCE = 0.05
+MEMORY_TOLERANCE = 0.5
+
+# Keep just the columns ingest reads back, so peak memory is the ingest layer's
+fake_client = FakeSupabaseClient(
+    retain_columns=("id", "url", "name", "source", "github_stars", "hype_score", "updated_at")
+)
+
+
+def _load_ingest_functions() -> Dict[str, Callable]:
+    """
+    Import the ingest layer with the Supabase client swapped for the fake
+    """
+    install_fake_client(fake_client)
+
+    from scraper.github_ingest import ingest_github
+    from scraper.huggingface_ingest import ingest_huggingface
+    from scraper.producthunt_ingest import ingest_producthunt
+    from scraper.parse_pool import parse_pool
+
+    # Parse workers start once per process, not once per scan
+    parse_pool.start()
+
+    return {
+        "github": ingest_github,
+        "huggingface": ingest_huggingface,
+        "producthunt": ingest_producthunt,
+    }
+
+
+def _scraped_count(result: dict) -> int:
+    return result.get("total_scraped", result.get("scraped", 0))
+
+
+def _run_once(ingest: Callable, source: str, size: int) -> Dict:
+    """
+    Call the ingest function until the replayed upstream has served `size` records
+    """
+    fake_client.reset()
+    upstream = RecordedUpstream(source, size)
+    records = 0
+    with replay(upstream):
+        while not upstream.exhausted:
+            result = ingest()
+            if result.get("status") == "error":
+                raise RuntimeError(f"{source} ingest failed: {result.get('error')}")
+            records += _scraped_count(result)
+    return {
+        "records": records,
+        "db_calls": fake_client.total_calls,
+        "http_requests": upstream.requests,
+        "http_bytes": upstream.bytes,
+    }
+
+
+def measure(ingest: Callable, source: str, size: int, with_memory: bool = True) -> Dict:
+    """
+    Time one pass, then (optionally) repeat it under tracemalloc for peak memory
+    """
+    # Don't bill this pass for freeing the previous (larger) one's rows and garbage
+    fake_client.reset()
+    gc.collect()
+    start = time.perf_counter()
+    run = _run_once(ingest, source, size)
+    elapsed = time.perf_counter() - start
+
+    records = max(run["records"], 1)
+    result = {
+        "records": run["records"],
+        "seconds": round(elapsed, 4),
+        "records_per_sec": round(run["records"] / elapsed, 1) if elapsed else 0.0,
+        "db_calls_per_record": round(run["db_calls"] / records, 3),
+        "http_requests": run["http_requests"],
+    }
+
+    if with_memory:
+        fake_client.reset()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            _run_once(ingest, source, size)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_mem_mb"] = round(peak / (1024 * 1024), 2)
+
+    return result
+
+
+def find_regressions(results: Dict, baseline: Dict) -> List[str]:
+    """
+    Compare results to the stored baseline and describe every regression
+    """
+    problems = []
+    for source, by_size in results.items():
+        for size, current in by_size.items():
+            expected = baseline.get(source, {}).get(size)
+            if not expected:
+                continue
+
+            floor = expected["records_per_sec"] * (1 - THROUGHPUT_TOLERANCE)
+            if current["records_per_sec"] < floor:
+                problems.append(
+                    f"{source}@{size}: {current['records_per_sec']} records/sec "
+                    f"< {floor:.1f} (baseline {expected['records_per_sec']})"
+                )
+
+            ceiling = expected["db_calls_per_record"] * (1 + CALLS_TOLERANCE)
+            if current["db_calls_per_record"] > ceiling + 1e-9:
+                problems.append(
+                    f"{source}@{size}: {current['db_calls_per_record']} DB calls/record "
+                    f"> {ceiling:.3f} (baseline {expected['db_calls_per_record']})"
+                )
+
+            if "peak_mem_mb" in current and "peak_mem_mb" in expected:
+                ceiling = expected["peak_mem_mb"] * (1 + MEMORY_TOLERANCE) + 1
+                if current["peak_mem_mb"] > ceiling:
+                    problems.append(
+                        f"{source}@{size}: {current['peak_mem_mb']} MB peak "
+                        f"> {ceiling:.2f} (baseline {expected['peak_mem_mb']})"
+                    )
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest throughput benchmark")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma separated record counts")
+    parser.add_argument("--sources", default=",".join(SOURCES),
+                        help="comma separated sources")
+    parser.add_argument("--skip-memory", action="store_true",
+                        help="skip the tracemalloc pass")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    sources = [s for s in args.sources.split(",") if s]
+
+    # Per-record INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+
+    ingest_functions = _load_ingest_functions()
+    results: Dict[str, Dict[str, Dict]] = {}
+
+    # The scrapers sleep between items to be polite to real servers
+    with mock.patch("time.sleep"):
+        for source in sources:
+            for size in sizes:
+                stats = measure(ingest_functions[source], source, size, not args.skip_memory)
+                results.setdefault(source, {})[str(size)] = stats
+                print(
+                    f"{source:<12} {size:>7} records | "
+                    f"{stats['records_per_sec']:>10.1f} rec/s | "
+                    f"{stats['db_calls_per_record']:>6.3f} DB calls/rec | "
+                    f"{stats['http_requests']:>6} HTTP | "
+                    f"{stats.get('peak_mem_mb', float('nan')):>8.2f} MB peak"
+                )
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        for source, by_size in results.items():
+            baseline.setdefault(source, {}).update(by_size)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    problems = find_regressions(results, baseline)
+    for problem in problems:
+        print(f"REGRESSION: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
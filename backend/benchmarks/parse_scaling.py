@@ -0,0 +1,95 @@
+"""
+Parse Pool Benchmark
+How HTML parsing throughput scales with parse workers (scraper/parse_pool.py)
+
+Usage (from the backend folder):
+    python -m benchmarks.parse_scaling
+    python -m benchmarks.parse_scaling --pages 400 --workers 1,2,4,8
+
+Parses copies of the recorded GitHub trending page (20 repo cards each)
+with parse_trending_page: on the calling thread, then through pools of 1, 2,
+4... workers, up to the machine's cores. Each pool is warmed first and timed
+on a second pass, the way a long-running API process reuses its workers.
+Exits 1 if a pool returns different repos than inline parsing, if it starts
+new workers between passes, or if N workers (N <= cores) parse less than
+--min-efficiency x N times as fast as one.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.replay import RecordedUpstream
+from scraper.github_scraper import parse_trending_page
+from scraper.parse_pool import ParsePool
+
+
+def _worker_pid(_) -> int:
+    return os.getpid()
+
+
+def trending_pages(count: int) -> list:
+    upstream = RecordedUpstream("github", count * 20)
+    return [upstream.handle("GET", "https://github.com/trending/python").content for _ in range(count)]
+
+
+def main(argv=None) -> int:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Parse pool scaling benchmark")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", default=",".join(str(w) for w in (1, 2, 4, 8) if w <= max(cores, 1)),
+                        help="comma separated pool sizes")
+    parser.add_argument("--min-efficiency", type=float, default=0.6,
+                        help="required speedup per worker, up to the core count")
+    args = parser.parse_args(argv)
+
+    pages = trending_pages(args.pages)
+    start = time.perf_counter()
+    expected = [parse_trending_page(page) for page in pages]
+    inline = args.pages / (time.perf_counter() - start)
+    print(f"{cores} cores | {args.pages} pages of {len(expected[0])} repos | "
+          f"{sum(len(p) for p in pages) / args.pages / 1024:.0f} KB a page")
+    print(f"inline    | {inline:>7.1f} pages/s |")
+
+    failures = []
+    single = None
+    for workers in [int(w) for w in args.workers.split(",") if w]:
+        pool = ParsePool()
+        pool.workers = workers
+        try:
+            # Warm-up pass starts the workers; the timed pass reuses them
+            started = time.perf_counter()
+            pool.run(parse_trending_page, pages[0])
+            cold = time.perf_counter() - started
+            pids = set(pool.map(_worker_pid, range(workers * 4)))
+
+            start = time.perf_counter()
+            results = pool.map(parse_trending_page, pages)
+            rate = args.pages / (time.perf_counter() - start)
+            reused = set(pool.map(_worker_pid, range(workers * 4))) <= pids
+        finally:
+            pool.shutdown()
+
+        single = single or rate
+        speedup = rate / single
+        print(f"{workers} worker{'s' if workers > 1 else ' '} | {rate:>7.1f} pages/s | "
+              f"{speedup:.2f}x one worker | start-up {cold * 1000:.0f} ms, then reused: {reused}")
+
+        if results != expected:
+            failures.append(f"{workers} workers parsed different repos than inline")
+        if not reused:
+            failures.append(f"{workers} workers: pool started new workers between passes")
+        if workers <= cores and speedup < args.min_efficiency * workers:
+            failures.append(f"{workers} workers only {speedup:.2f}x one worker "
+                            f"(want {args.min_efficiency * workers:.2f}x)")
+
+    for failure in failures:
+        print(f"\nREGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
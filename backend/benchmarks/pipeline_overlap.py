@@ -0,0 +1,115 @@
+"""
+Ingest Pipeline Benchmark
+Checks that the streaming ingest overlaps its stages instead of running them
+one after another
+
+Usage (from the backend folder):
+    python -m benchmarks.pipeline_overlap
+    python -m benchmarks.pipeline_overlap --records 500 --fetch-ms 10 --db-ms 80
+
+Runs scraper.refresh.stream_tools over synthetic records against the in-memory
+fake Supabase client, with latency added to every fetch, every tool build and
+every database call. Reports each stage's busy time next to the wall time:
+run back to back the stages would take their sum, pipelined they should take
+about as long as the slowest one. Exits 1 if the wall time is over
+--max-ratio times the slowest stage, or if any record went missing.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_db import FakeSupabaseClient, install_fake_client
+
+# Spool to a throwaway file, so runs never resume each other's leftovers
+os.environ.setdefault("INGEST_SPOOL_PATH", os.path.join(tempfile.mkdtemp(), "spool.db"))
+
+fake_client = FakeSupabaseClient()
+
+
+def _pause(ms: float):
+    # An Event wait releases the GIL like network I/O would
+    threading.Event().wait(ms / 1000)
+
+
+def records(count: int, fetch_ms: float):
+    for i in range(count):
+        _pause(fetch_ms)
+        yield {"name": f"tool-{i}", "url": f"https://github.com/example/tool-{i}", "stars": i}
+
+
+def slow(fn, ms: float):
+    def wrapper(*args, **kwargs):
+        _pause(ms)
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest pipeline overlap benchmark")
+    parser.add_argument("--records", type=int, default=300)
+    parser.add_argument("--fetch-ms", type=float, default=5.0, help="latency per scraped record")
+    parser.add_argument("--analyze-ms", type=float, default=3.0, help="latency per tool build")
+    parser.add_argument("--db-ms", type=float, default=60.0, help="latency per database call")
+    parser.add_argument("--max-ratio", type=float, default=1.5,
+                        help="allowed wall time as a multiple of the slowest stage")
+    args = parser.parse_args(argv)
+
+    database = install_fake_client(fake_client)
+
+    from database.models import AITool
+    from scraper import pipeline as pipeline_module
+    from scraper.refresh import stream_tools
+
+    def build(record: dict) -> AITool:
+        _pause(args.analyze_ms)
+        return AITool(name=record["name"], url=record["url"], source="github",
+                      description="Synthetic tool", github_stars=record["stars"])
+
+    # Keep the Pipeline the run creates, to read its stage stats afterwards
+    created = []
+    real_pipeline = pipeline_module.Pipeline
+
+    def tracked(*a, **kw):
+        created.append(real_pipeline(*a, **kw))
+        return created[-1]
+
+    with mock.patch.object(database, "get_tools_by_url", slow(database.get_tools_by_url, args.db_ms)), \
+         mock.patch.object(database, "insert_tools", slow(database.insert_tools, args.db_ms)), \
+         mock.patch.object(database, "update_tools", slow(database.update_tools, args.db_ms)), \
+         mock.patch("scraper.refresh.Pipeline", tracked):
+        start = time.perf_counter()
+        counts = stream_tools("github", records(args.records, args.fetch_ms), build)
+        wall = time.perf_counter() - start
+
+    stats = created[0].stats
+    busy_total = sum(s.busy_seconds for s in stats)
+    slowest = max(stats, key=lambda s: s.busy_seconds)
+
+    for s in stats:
+        print(f"{s.name:<8} | {s.items_in:>6} in | {s.busy_seconds:>7.2f}s busy | {s.per_second:>8.0f}/s")
+    print(
+        f"\nwall {wall:.2f}s | stages back to back {busy_total:.2f}s | "
+        f"slowest ({slowest.name}) {slowest.busy_seconds:.2f}s | "
+        f"{busy_total / wall:.1f}x overlap"
+    )
+    print(f"counts: {counts}")
+
+    if counts["inserted"] != args.records:
+        print(f"\nREGRESSION: {counts['inserted']} of {args.records} records stored")
+        return 1
+    if wall > args.max_ratio * slowest.busy_seconds:
+        print(f"\nREGRESSION: wall time is {wall / slowest.busy_seconds:.2f}x the slowest stage "
+              f"(limit {args.max_ratio}x)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Recorded Upstream Replay
+Serves the recorded GitHub / Hugging Face / Product Hunt fixtures, scaled up
+to any number of records, in place of real HTTP calls
+"""
+
+import json
+import os
+import re
+from contextlib import contextmanager
+from typing import Dict, List
+from unittest import mock
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# The real scrapers only look at this many items per page
+GITHUB_PAGE_SIZE = 20
+PRODUCTHUNT_PAGE_SIZE = 10
+
+
+def _read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _make_response(url: str, body: str, content_type: str, status: int = 200) -> requests.Response:
+    """
+    Build a real requests.Response so scrapers exercise their normal parsing code
+    """
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response.encoding = "utf-8"
+    response.headers = CaseInsensitiveDict({"Content-Type": content_type})
+    response._content = body.encode("utf-8")
+    response._content_consumed = True
+    return response
+
+
+class RecordedUpstream:
+    """
+    Replays recorded pages for one source until `size` records have been served
+
+    GitHub trending and Product Hunt only show a page of items per request, so
+    larger sizes are served as a sequence of distinct pages (one per ingest run).
+    """
+
+    def __init__(self, source: str, size: int):
+        self.source = source
+        self.size = size
+        self.served = 0
+        self.requests = 0
+        self.bytes = 0
+
+        page = _read_fixture("github_trending.html")
+        self._gh_articles = re.findall(r"<article class=\"Box-row\">.*?</article>", page, re.S)
+        self._gh_head, _, rest = page.partition(self._gh_articles[0])
+        self._gh_tail = rest.rpartition(self._gh_articles[-1])[2]
+
+        self._hf_models = json.loads(_read_fixture("hf_models.json"))
+        self._hf_spaces = json.loads(_read_fixture("hf_spaces.json"))
+
+        topic = _read_fixture("producthunt_topic.html")
+        # The page's Next.js data is rebuilt per page, one post per listed item
+        script = re.search(r"<script id=\"__NEXT_DATA__\".*?>(.*?)</script>\n?", topic, re.S)
+        state = json.loads(script.group(1))["props"]["pageProps"]["apolloState"]
+        self._ph_posts = {post["slug"]: post for post in state.values() if post.get("__typename") == "Post"}
+        topic = topic.replace(script.group(0), "")
+        self._ph_items = re.findall(r"<section class=\"styles_item.*?</section>", topic, re.S)
+        self._ph_head, _, rest = topic.partition(self._ph_items[0])
+        self._ph_tail = rest.rpartition(self._ph_items[-1])[2]
+        self._ph_post = _read_fixture("producthunt_post.html")
+
+    @property
+    def exhausted(self) -> bool:
+        return self.served >= self.size
+
+    def handle(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Route a request to the matching recorded fixture
+        """
+        self.requests += 1
+        if "github.com/trending" in url:
+            response = self._github_page(url)
+        elif "huggingface.co/api/models" in url:
+            response = self._hf_listing(url, self._hf_models, self.size - self.size // 3)
+        elif "huggingface.co/api/spaces" in url:
+            response = self._hf_listing(url, self._hf_spaces, self.size // 3)
+        elif "producthunt.com/topics/" in url:
+            response = self._ph_topic(url)
+        elif "producthunt.com/posts/" in url:
+            response = self._ph_post_page(url)
+        else:
+            response = _make_response(url, "", "text/plain", status=404)
+        self.bytes += len(response.content)
+        return response
+
+    def _github_page(self, url: str) -> requests.Response:
+        count = min(GITHUB_PAGE_SIZE, self.size - self.served)
+        page_no = self.served // GITHUB_PAGE_SIZE
+        articles = []
+        for i in range(count):
+            article = self._gh_articles[i % len(self._gh_articles)]
+            path = re.search(r"<h2.*?href=\"/([^\"]+)\"", article, re.S).group(1)
+            articles.append(article.replace(f"/{path}", f"/{path}-{page_no}-{i}"))
+        self.served += count
+        body = self._gh_head + "\n".join(articles) + self._gh_tail
+        return _make_response(url, body, "text/html; charset=utf-8")
+
+    def _hf_listing(self, url: str, recorded: List[Dict], count: int) -> requests.Response:
+        items = []
+        for i in range(count):
+            item = dict(recorded[i % len(recorded)])
+            item["id"] = item["modelId"] = f"{item['id']}-{i}"
+            item["likes"] = item["likes"] + i
+            items.append(item)
+        self.served += count
+        return _make_response(url, json.dumps(items), "application/json; charset=utf-8")
+
+    def _ph_topic(self, url: str) -> requests.Response:
+        count = min(PRODUCTHUNT_PAGE_SIZE, self.size - self.served)
+        page_no = self.served // PRODUCTHUNT_PAGE_SIZE
+        items = []
+        state = {}
+        for i in range(count):
+            item = self._ph_items[i % len(self._ph_items)]
+            slug = re.search(r"href=\"/posts/([^\"]+)\"", item).group(1)
+            items.append(item.replace(f"/posts/{slug}", f"/posts/{slug}-{page_no}-{i}"))
+            post = dict(self._ph_posts[slug], slug=f"{slug}-{page_no}-{i}", id=f"{page_no}{i:04d}")
+            post["votesCount"] += i
+            state[f"Post{post['id']}"] = post
+        self.served += count
+        next_data = json.dumps({"props": {"pageProps": {"apolloState": state}}})
+        tail = self._ph_tail.replace(
+            "</body>", f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script>\n</body>'
+        )
+        body = self._ph_head + "\n".join(items) + tail
+        return _make_response(url, body, "text/html; charset=utf-8")
+
+    def _ph_post_page(self, url: str) -> requests.Response:
+        return _make_response(url, self._ph_post, "text/html; charset=utf-8")
+
+
+@contextmanager
+def replay(upstream: RecordedUpstream):
+    """
+    Route every requests call (module-level helpers and Sessions) to `upstream`
+    """
+    def fake_request(session, method, url, *args, **kwargs):
+        return upstream.handle(method, url, **kwargs)
+
+    with mock.patch.object(requests.Session, "request", fake_request):
+        yield upstream
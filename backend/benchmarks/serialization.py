@@ -0,0 +1,124 @@
+"""
+List Serialization Benchmark
+Time to turn N ai_tools rows into response bytes, per encoding path
+
+Usage (from the backend folder):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --sizes 100,5000
+
+Compares the stock FastAPI path (response_model=List[dict] validation +
+serialization, then stdlib json) with the orjson and MessagePack responses
+used by the list endpoints.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from api.responses import MsgPackResponse, msgpack
+
+DEFAULT_SIZES = [100, 1000, 10000]
+CATEGORIES = ["NLP", "Computer Vision", "Audio", "Code", "Multimodal", "Other"]
+SOURCES = ["github", "huggingface", "producthunt"]
+
+
+def make_rows(count: int) -> List[dict]:
+    """
+    Rows shaped like what Supabase returns for select("*") on ai_tools
+    """
+    return [
+        {
+            "id": i,
+            "name": f"tool-{i}",
+            "description": f"An open-source model number {i} for text generation, "
+                           "summarization and question answering across domains.",
+            "url": f"https://github.com/example/tool-{i}",
+            "source": SOURCES[i % len(SOURCES)],
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "hype_score": i % 100,
+            "github_stars": i * 7,
+            "pricing": "Free",
+            "use_cases": ["Text generation", "Summarization"],
+            "tags": ["llm", "nlp", "open-source"],
+            "discovered_date": "2024-05-01T12:00:00",
+            "created_at": "2024-05-01T12:00:00.123456+00:00",
+            "updated_at": "2024-05-02T08:30:00.654321+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+_LIST_FIELD = create_response_field(name="Response_List", type_=List[dict])
+
+
+def stock(rows: List[dict]) -> bytes:
+    """What FastAPI does for response_model=List[dict] with the default JSONResponse"""
+    content = asyncio.run(serialize_response(field=_LIST_FIELD, response_content=rows))
+    return JSONResponse(content).body
+
+
+def fast_json(rows: List[dict]) -> bytes:
+    return ORJSONResponse(rows).body
+
+
+def fast_msgpack(rows: List[dict]) -> bytes:
+    return MsgPackResponse(rows).body
+
+
+def measure(encode: Callable[[List[dict]], bytes], rows: List[dict], min_seconds: float = 0.5) -> dict:
+    """
+    Best-of timing over as many repetitions as fit in min_seconds
+    """
+    body = encode(rows)
+    best = float("inf")
+    spent = 0.0
+    repeats = 0
+    while spent < min_seconds or repeats < 3:
+        start = time.perf_counter()
+        encode(rows)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        repeats += 1
+    return {"ms": best * 1000, "bytes": len(body)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="List serialization benchmark")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma separated row counts")
+    args = parser.parse_args(argv)
+
+    paths = [("stock json", stock), ("orjson", fast_json)]
+    if msgpack is not None:
+        paths.append(("msgpack", fast_msgpack))
+    else:
+        print("msgpack not installed - skipping MessagePack")
+
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        rows = make_rows(size)
+        baseline_ms = None
+        for name, encode in paths:
+            stats = measure(encode, rows)
+            baseline_ms = baseline_ms or stats["ms"]
+            print(
+                f"{size:>7} rows | {name:<10} | "
+                f"{stats['ms']:>9.2f} ms | "
+                f"{size / (stats['ms'] / 1000):>11.0f} rows/s | "
+                f"{stats['bytes'] / 1024:>9.1f} KB | "
+                f"{baseline_ms / stats['ms']:>5.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
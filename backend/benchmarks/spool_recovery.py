@@ -0,0 +1,146 @@
+"""
+Spool Recovery Benchmark
+Kills an ingest part way and checks that the next run finishes it from the
+spool before scraping, without redoing the written records
+
+Usage (from the backend folder):
+    python -m benchmarks.spool_recovery
+    python -m benchmarks.spool_recovery --records 5000 --crash-after 20
+
+Runs stream_tools over synthetic records in child processes against the
+in-memory fake Supabase client:
+    crash    hard-exits (os._exit, like a killed worker) right after the
+             --crash-after'th batch write
+    resume   the next run: ingests the records the crash left unfinished,
+             all of them ahead of the scrape, then scrapes as usual
+    flaky    a run whose --crash-after'th batch write is rejected
+    rescan   the run after it: nothing to resume, a normal scrape
+Exits 1 if the resumed run didn't process exactly the unfinished records
+first and then the full scrape, or if a rejected write left records to
+resume.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SOURCE = "benchmark"
+
+
+def _child(mode: str, records: int, crash_after: int):
+    from benchmarks.fake_db import FakeSupabaseClient, install_fake_client
+
+    database = install_fake_client(FakeSupabaseClient())
+
+    from database.models import AITool
+    from scraper import refresh
+    from scraper.spool import spool
+
+    def scrape():
+        for i in range(records):
+            yield {"name": f"tool-{i}", "url": f"https://example.com/tool-{i}", "description": "Synthetic tool"}
+
+    built = []
+
+    def build(record: dict) -> AITool:
+        built.append(record["url"])
+        return AITool(name=record["name"], url=record["url"], source="github",
+                      description=record["description"])
+
+    writes = [0]
+    real_insert = database.insert_tools
+
+    def insert_tools(tools):
+        rows = real_insert(tools)
+        writes[0] += 1
+        if mode == "crash" and writes[0] == crash_after:
+            # Checkpoint this batch as the insert stage would, then die (its
+            # done marks may not have reached the disk: resume dedups them)
+            refresh.spool.checkpoint(SOURCE, [tool.url for tool in tools])
+            print(json.dumps({"written": len(database.client.table("ai_tools").select("id").execute().data)}))
+            sys.stdout.flush()
+            os._exit(1)
+        if mode == "flaky" and writes[0] == crash_after:
+            raise RuntimeError("write rejected")
+        return rows
+
+    database.insert_tools = insert_tools
+    unfinished = spool.pending(SOURCE)
+    spooled = {url for (url,) in spool._db().execute(
+        "SELECT url FROM spool WHERE source = ? AND status = 'pending'", (SOURCE,)
+    )}
+    start = time.perf_counter()
+    counts = refresh.stream_tools(SOURCE, scrape(), build, enrich=False)
+    print(json.dumps({"unfinished": unfinished, "counts": counts,
+                      "resumed_first": set(built[:unfinished]) == spooled,
+                      "seconds": time.perf_counter() - start, **spool.counts(SOURCE)}))
+
+
+def _run(mode: str, args, spool_path: str) -> dict:
+    env = dict(os.environ, INGEST_SPOOL_PATH=spool_path, INGEST_SPOOL_ENABLED="true")
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.spool_recovery", "--child", mode,
+         "--records", str(args.records), "--crash-after", str(args.crash_after)],
+        env=env, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    lines = [line for line in out.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(f"{mode} run printed nothing (exit {out.returncode}):\n{out.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Spool crash recovery benchmark")
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--crash-after", type=int, default=10, help="batch writes before the crash")
+    parser.add_argument("--child", choices=["crash", "resume", "flaky", "rescan"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.child, args.records, args.crash_after)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spool_path = os.path.join(tmp, "spool.db")
+        crashed = _run("crash", args, spool_path)
+        resumed = _run("resume", args, spool_path)
+        flaky_path = os.path.join(tmp, "flaky.db")
+        flaky = _run("flaky", args, flaky_path)
+        rescan = _run("rescan", args, flaky_path)
+
+    unfinished = resumed["unfinished"]
+    processed = resumed["counts"]["scraped"]
+    print(
+        f"crash after {crashed['written']} of {args.records} records written: "
+        f"{unfinished} spooled but unfinished\n"
+        f"resume: {processed} records ({unfinished} from the spool first: {resumed['resumed_first']}, "
+        f"then the scrape), {resumed['counts']['inserted']} inserted, {resumed['seconds']:.2f}s | "
+        f"spool after: {resumed.get('pending', 0)} pending, {resumed.get('failed', 0)} failed\n"
+        f"rejected write: {flaky.get('failed', 0)} records failed, {flaky.get('pending', 0)} left "
+        f"to resume | next run resumed {rescan['unfinished']}, scraped {rescan['counts']['scraped']}"
+    )
+
+    problems = []
+    if not unfinished or not resumed["resumed_first"] or processed != unfinished + args.records:
+        problems.append(f"resumed run processed {processed} records, expected the {unfinished} "
+                        f"unfinished ones first, then {args.records} scraped")
+    if resumed.get("pending", 0) or resumed["counts"]["inserted"] != args.records:
+        problems.append(f"resumed run left {resumed.get('pending', 0)} pending, "
+                        f"inserted {resumed['counts']['inserted']} of {args.records}")
+    if flaky.get("pending", 0) or rescan["unfinished"] or rescan["counts"]["scraped"] != args.records:
+        problems.append("a rejected write left records to resume instead of a normal scan")
+
+    for problem in problems:
+        print(f"\nREGRESSION: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
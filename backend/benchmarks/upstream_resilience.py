@@ -0,0 +1,159 @@
+"""
+Upstream Resilience Benchmark
+How long calls take against a degraded upstream, with the retries, circuit
+breaker, hedging and deadlines of scraper/http_client.py
+
+Usage (from the backend folder):
+    python -m benchmarks.upstream_resilience
+
+Serves a local HTTP upstream whose paths misbehave on purpose (fail then
+recover, always fail, answer slowly once, hang) and times the shared client
+against each:
+    retry      two 503s then 200: recovered within the retry budget
+    breaker    a host that always fails: once the circuit opens, calls fail fast
+    hedge      first copy stalls, the backup answers: latency ~ hedge delay
+    deadline   a hanging host under a 1s deadline: the call gives up in ~1s,
+               and later calls fail immediately instead of waiting
+    trial-429  the half-open trial request gets a 429: the breaker reopens,
+               and the next trial after the cooldown closes it
+    trial-err  the half-open trial fails with a non-network error (too many
+               redirects): same, the host isn't shut out for good
+Exits 1 if any scenario misses its expected outcome or time.
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Short backoff, a low breaker threshold, a short cooldown and a quick hedge
+# so the run takes seconds
+os.environ.setdefault("UPSTREAM_BACKOFF_BASE", "0.05")
+os.environ.setdefault("UPSTREAM_BREAKER_FAILURES", "3")
+os.environ.setdefault("UPSTREAM_BREAKER_COOLDOWN", "0.5")
+os.environ.setdefault("UPSTREAM_HEDGE_AFTER", "0.3")
+
+import requests
+
+from scraper import http_client
+from scraper.resilience import CircuitOpenError, DeadlineExceeded, breaker, deadline
+
+_hits = {}
+_lock = threading.Lock()
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        with _lock:
+            _hits[self.path] = _hits.get(self.path, 0) + 1
+            hit = _hits[self.path]
+
+        if self.path == "/retry" and hit <= 2:
+            return self._reply(503)
+        if self.path == "/down":
+            return self._reply(500)
+        if self.path == "/pacing":
+            return self._reply(429)
+        if self.path == "/loop":
+            self.send_response(302)
+            self.send_header("Location", "/loop")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/hedge" and hit == 1:
+            time.sleep(3)
+        if self.path == "/hang":
+            time.sleep(5)
+        self._reply(200)
+
+    def _reply(self, status: int):
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(fn):
+    start = time.perf_counter()
+    try:
+        outcome = fn()
+    except requests.RequestException as e:
+        outcome = e
+    return outcome, time.perf_counter() - start
+
+
+def main() -> int:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    failures = []
+
+    def check(name: str, ok: bool, detail: str):
+        print(f"{name:<9} | {'ok  ' if ok else 'FAIL'} | {detail}")
+        if not ok:
+            failures.append(name)
+
+    # Retry: 503, 503, 200
+    result, seconds = timed(lambda: http_client.get(f"{base}/retry", timeout=2))
+    check("retry", getattr(result, "status_code", None) == 200 and _hits["/retry"] == 3,
+          f"status {getattr(result, 'status_code', result)} after {_hits['/retry']} attempts in {seconds:.2f}s")
+
+    # Breaker: keeps failing until the circuit opens, then fails without a request
+    # (each call retries, so the first one already fails three times)
+    http_client.get(f"{base}/down", timeout=2)
+    sent = _hits["/down"]
+    result, seconds = timed(lambda: http_client.get(f"{base}/down", timeout=2))
+    check("breaker", isinstance(result, CircuitOpenError) and _hits["/down"] == sent and seconds < 0.05,
+          f"{breaker('127.0.0.1').state} after {sent} failed requests; next call "
+          f"{type(result).__name__} in {seconds * 1000:.1f} ms")
+    breaker("127.0.0.1").record_success()
+
+    # Hedge: the first copy stalls for 3s, the backup answers at once
+    result, seconds = timed(lambda: http_client.get(f"{base}/hedge", timeout=5, hedge=True))
+    check("hedge", getattr(result, "status_code", None) == 200 and seconds < 1.5,
+          f"status {getattr(result, 'status_code', result)} in {seconds:.2f}s (unhedged: 3s+)")
+
+    # Deadline: a 5s hang under a 1s budget, then a call after the budget is gone
+    with deadline(1.0):
+        result, seconds = timed(lambda: http_client.get(f"{base}/hang", timeout=10))
+        late, late_seconds = timed(lambda: http_client.get(f"{base}/hang", timeout=10))
+    check("deadline", isinstance(result, requests.Timeout) and seconds < 1.5
+          and isinstance(late, DeadlineExceeded) and late_seconds < 0.05,
+          f"{type(result).__name__} after {seconds:.2f}s (timeout 10s); "
+          f"next call {type(late).__name__} in {late_seconds * 1000:.1f} ms")
+
+    # Half-open trials that end in neither success nor a network failure.
+    # A separate host name (same server) keeps this breaker apart.
+    trial_base = f"http://localhost:{server.server_port}"
+    trial_breaker = breaker("localhost")
+    for name, path in (("trial-429", "/pacing"), ("trial-err", "/loop")):
+        for _ in range(trial_breaker.failure_threshold):
+            trial_breaker.record_failure()
+        time.sleep(trial_breaker.cooldown)
+        trial, _ = timed(lambda: http_client.get(f"{trial_base}{path}", timeout=2))
+        after_trial = trial_breaker.state
+        time.sleep(trial_breaker.cooldown)
+        result, _ = timed(lambda: http_client.get(f"{trial_base}/ok", timeout=2))
+        check(name, after_trial == "open" and getattr(result, "status_code", None) == 200
+              and trial_breaker.state == "closed",
+              f"trial {getattr(trial, 'status_code', type(trial).__name__)} left the breaker {after_trial}; "
+              f"after the cooldown: {getattr(result, 'status_code', type(result).__name__)}, "
+              f"breaker {trial_breaker.state}")
+
+    server.shutdown()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
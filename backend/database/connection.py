@@ -4,13 +4,17 @@ Connects to Supabase (our free database)
 """
 
 import os
-from supabase import create_client, Client
 from dotenv import load_dotenv
-from typing import List, Optional, Any, Dict, Union
+from typing import TYPE_CHECKING, Iterator, List, Optional, Any, Dict, Union
 from .models import AITool
+from monitoring.db import InstrumentedClient
+from .singleflight import single_flight
 from datetime import datetime, date
 import logging
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 # Setup logging to see what's happening
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -95,6 +99,15 @@ def _normalize_value(value: Any) -> Any:
     except:
         return None
 
+def _without_rediscovered(archived: List[dict], hot_urls: set) -> List[dict]:
+    """
+    Drop archived rows whose url is also a hot tool (found again after being
+    archived); the hot row wins. Rows without a url column are kept as is.
+    """
+    if not hot_urls:
+        return archived
+    return [tool for tool in archived if tool.get('url') not in hot_urls]
+
 class Database:
     """
     This class handles all database operations
@@ -135,7 +148,12 @@ class Database:
         
         # Create connection to database with error handling
         try:
-            self.client: Client = create_client(supabase_url, supabase_key)
+            # Imported here: supabase pulls in httpx/postgrest/gotrue, which
+            # would otherwise dominate API cold start
+            from supabase import create_client
+            
+            # Wrapped so every query's latency is recorded per operation and table
+            self.client: "Client" = InstrumentedClient(create_client(supabase_url, supabase_key))
             logger.info("✅ Database connection established successfully")
         except Exception as e:
             logger.error(f"❌ Failed to create Supabase client: {str(e)}")
@@ -156,7 +174,8 @@ class Database:
         """
         try:
             # Convert Pydantic model to a dict, which handles most serialization
-            tool_data = tool.model_dump(exclude={'id'})
+            # (updated_at is the database's to set, from its own clock)
+            tool_data = tool.model_dump(exclude={'id', 'updated_at'})
             
             # Use our robust normalizer for any tricky types
             normalized_data = _normalize_dict(tool_data)
@@ -179,6 +198,82 @@ class Database:
             logger.error(f"Error saving tool '{tool.name}': {str(e)}")
             return None
     
+    def insert_tools(self, tools: List[AITool]) -> List[dict]:
+        """
+        Save many new AI tools in one request
+        
+        If the batch is rejected (one bad row fails the whole insert), each
+        tool is retried on its own so the rest still get saved.
+        
+        Args:
+            tools: AITool objects with all the data
+        
+        Returns:
+            The saved tools with their IDs (failed tools are left out)
+        """
+        if not tools:
+            return []
+        
+        try:
+            rows = [_normalize_dict(tool.model_dump(exclude={'id', 'updated_at'})) for tool in tools]
+            response = self.client.table('ai_tools').insert(rows).execute()
+            logger.info(f"DB INSERT: {len(response.data)} tools in one batch")
+            return response.data
+        
+        except Exception as e:
+            logger.error(f"Batch insert of {len(tools)} tools failed, inserting one by one: {str(e)}")
+            return [row for row in (self.insert_tool(tool) for tool in tools) if row]
+    
+    @single_flight
+    def get_tools(self, columns: str = "*", include_archive: bool = False) -> List[dict]:
+        """
+        Get every tool, newest first
+        
+        Args:
+            columns: Columns to select (comma separated)
+            include_archive: Also return archived tools (after the hot ones)
+        
+        Returns:
+            List of tools (raises on database errors)
+        """
+        response = self.client.table('ai_tools')\
+            .select(columns)\
+            .order('created_at', desc=True)\
+            .execute()
+        tools = response.data
+        
+        if include_archive:
+            response = self.client.table('ai_tools_archive')\
+                .select(columns)\
+                .order('created_at', desc=True)\
+                .execute()
+            hot_urls = {tool.get('url') for tool in tools if tool.get('url')}
+            tools = tools + _without_rediscovered(response.data, hot_urls)
+        return tools
+    
+    @single_flight
+    def get_tool(self, tool_id: int, include_archive: bool = False) -> Optional[dict]:
+        """
+        Get one tool by ID
+        
+        Args:
+            tool_id: Tool ID
+            include_archive: Look in the archive if it isn't a hot tool
+        
+        Returns:
+            Tool data if found, None otherwise (raises on database errors)
+        """
+        tables = ('ai_tools', 'ai_tools_archive') if include_archive else ('ai_tools',)
+        for table in tables:
+            response = self.client.table(table)\
+                .select("*")\
+                .eq('id', tool_id)\
+                .execute()
+            if response.data:
+                return response.data[0]
+        return None
+    
+    @single_flight
     def get_all_tools(self, limit: int = 100) -> List[dict]:
         """
         Get all AI tools from database
@@ -203,6 +298,106 @@ class Database:
             logger.error(f"Error fetching tools: {str(e)}")
             return []
     
+    def iter_tool_pages(self, columns: str = "*", page_size: int = 1000,
+                        include_archive: bool = False) -> Iterator[List[dict]]:
+        """
+        Walk the whole ai_tools table in id order, one page at a time
+        
+        Uses keyset pagination (id > last seen id) rather than offsets, so
+        every page is an index range scan no matter how deep into the table
+        
+        Args:
+            columns: Columns to select (comma separated, must include id)
+            page_size: Rows per query
+            include_archive: Walk ai_tools_archive the same way afterwards
+        
+        Yields:
+            Lists of up to page_size rows
+        """
+        tables = ('ai_tools', 'ai_tools_archive') if include_archive else ('ai_tools',)
+        # The hot table is capped (scheduler/archive.py), so its urls fit in memory
+        hot_urls = set()
+        for table in tables:
+            last_id = 0
+            while True:
+                response = self.client.table(table)\
+                    .select(columns)\
+                    .gt('id', last_id)\
+                    .order('id')\
+                    .limit(page_size)\
+                    .execute()
+                
+                page = response.data
+                if len(page) < page_size:
+                    last_id = None
+                else:
+                    last_id = page[-1]['id']
+                
+                if table == 'ai_tools':
+                    if include_archive:
+                        hot_urls.update(tool['url'] for tool in page if tool.get('url'))
+                else:
+                    page = _without_rediscovered(page, hot_urls)
+                
+                if page:
+                    yield page
+                if last_id is None:
+                    break
+    
+    def get_tools_by_url(self, urls: List[str], columns: str = "id,url",
+                         chunk_size: int = 100) -> Dict[str, dict]:
+        """
+        Look up many tools by url in a few batched reads
+        
+        Args:
+            urls: URLs to look up (duplicates are fine)
+            columns: Columns to select (comma separated, must include url)
+            chunk_size: URLs per query, keeping the request line short
+        
+        Returns:
+            Stored rows keyed by url; unknown urls are missing
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        found = {}
+        for i in range(0, len(urls), chunk_size):
+            response = self.client.table('ai_tools')\
+                .select(columns)\
+                .in_('url', urls[i:i + chunk_size])\
+                .execute()
+            found.update((row['url'], row) for row in response.data)
+        return found
+    
+    def update_tools(self, updates: List[dict], chunk_size: int = 500) -> int:
+        """
+        Update many tools at once, each with its own values
+        
+        Sent through the update_tools function (migration 0009), one call per
+        chunk, so the number of requests depends on how many rows changed,
+        not on how many were looked at. It only updates: a tool archived or
+        deleted since it was looked up stays gone.
+        
+        Args:
+            updates: One dict per tool with its id plus the columns that
+                changed; other columns keep their stored values
+            chunk_size: Rows per request
+        
+        Returns:
+            Number of tools updated (missing ids are not counted)
+        """
+        # updated_at is bumped by the database's trigger, from its own clock
+        rows = [_normalize_dict(row) for row in updates]
+        
+        updated = 0
+        for i in range(0, len(rows), chunk_size):
+            response = self.client.rpc('update_tools', {'rows': rows[i:i + chunk_size]}).execute()
+            updated += response.data or 0
+        
+        if updated < len(rows):
+            logger.info(f"Updated {updated} tools ({len(rows) - updated} no longer exist)")
+        else:
+            logger.info(f"Updated {updated} tools")
+        return updated
+    
     def get_tool_by_name(self, name: str) -> Optional[dict]:
         """
         Search for a specific tool by name
@@ -239,8 +434,9 @@ class Database:
             Updated tool data
         """
         try:
-            # Normalize updates to be JSON serializable
-            updates = _normalize_dict(updates)
+            # The database's trigger bumps updated_at, so the change feed
+            # picks this row up; normalize updates to be JSON serializable
+            updates = _normalize_dict({k: v for k, v in updates.items() if k != 'updated_at'})
             
             response = self.client.table('ai_tools')\
                 .update(updates)\
@@ -254,10 +450,159 @@ class Database:
             logger.error(f"Error updating tool: {str(e)}")
             raise
     
-    def get_trending_today(self) -> List[dict]:
+    def delete_tools(self, tool_ids: List[int]) -> int:
+        """
+        Delete tools, leaving a tombstone for each so change feed clients
+        can drop them from their local copy
+        
+        Args:
+            tool_ids: IDs of the tools to delete
+        
+        Returns:
+            Number of tools deleted
+        """
+        if not tool_ids:
+            return 0
+        
+        # Tombstones first: if the delete fails, a client drops a row that
+        # still exists and gets it back on its next full sync - never the reverse.
+        # deleted_at comes from the database's clock (a trigger), like updated_at
+        self.client.table('ai_tools_tombstones')\
+            .upsert([{'id': tool_id} for tool_id in tool_ids], on_conflict='id')\
+            .execute()
+        
+        response = self.client.table('ai_tools')\
+            .delete()\
+            .in_('id', tool_ids)\
+            .execute()
+        
+        logger.info(f"Deleted {len(response.data)} tools")
+        return len(response.data)
+    
+    def get_stale_tools(self, discovered_before: datetime, max_hype: int, limit: int = 500) -> List[dict]:
+        """
+        Hot tools discovered before a cutoff whose hype score is below max_hype
+        (or unscored)
+        
+        Args:
+            discovered_before: Only tools discovered before this
+            max_hype: Hype score a tool must stay under to count as stale
+            limit: Maximum number of tools to return
+        
+        Returns:
+            Full rows, oldest discoveries first
+        """
+        response = self.client.table('ai_tools')\
+            .select("*")\
+            .lt('discovered_date', discovered_before.isoformat())\
+            .or_(f'hype_score.is.null,hype_score.lt.{int(max_hype)}')\
+            .order('discovered_date')\
+            .limit(limit)\
+            .execute()
+        return response.data
+    
+    def get_overflow_tools(self, keep: int, limit: int = 500) -> List[dict]:
+        """
+        Hot tools past the first `keep` by discovery day, then hype score
+        
+        Args:
+            keep: How many tools stay in the hot table
+            limit: Maximum number of tools to return
+        
+        Returns:
+            Full rows of the tools ranked after `keep`
+        """
+        response = self.client.table('ai_tools')\
+            .select("*")\
+            .order('discovered_date', desc=True)\
+            .order('hype_score', desc=True)\
+            .range(keep, keep + limit - 1)\
+            .execute()
+        return response.data
+    
+    def archive_tools(self, tools: List[dict]) -> int:
+        """
+        Move tools from ai_tools to ai_tools_archive
+        
+        Rows are copied before they are deleted, so a failure part way leaves
+        a tool in both tables (fixed by the next run), never in neither. The
+        delete leaves tombstones: to change feed clients, which mirror the hot
+        table, an archived tool is a deleted one.
+        
+        Args:
+            tools: Full rows as returned by get_stale_tools/get_overflow_tools
+        
+        Returns:
+            Number of tools archived
+        """
+        if not tools:
+            return 0
+        
+        # On url: a tool rediscovered after being archived replaces its old copy
+        now = datetime.now().isoformat()
+        self.client.table('ai_tools_archive')\
+            .upsert([{**tool, 'archived_at': now} for tool in tools], on_conflict='url')\
+            .execute()
+        
+        return self.delete_tools([tool['id'] for tool in tools])
+    
+    @single_flight
+    def get_changes(self, cursor: Dict[str, Any], limit: int = 500,
+                    columns: str = "*") -> Dict[str, Any]:
+        """
+        Rows changed and rows deleted after a change feed position
+        
+        Both lists are keyset-paged on a (timestamp, id) pair, so rows that
+        share a timestamp are never skipped or repeated between pages.
+        
+        Args:
+            cursor: Position from the previous call: "u"/"i" = updated_at/id of
+                the last changed row, "d"/"di" = deleted_at/id of the last
+                tombstone. Empty dict starts from the beginning.
+            limit: Max rows (and max tombstones) to return
+            columns: Columns to select (must include id and updated_at)
+        
+        Returns:
+            {"changes": [...], "deleted": [ids], "cursor": new position,
+             "has_more": whether another call would return more}
+        """
+        query = self.client.table('ai_tools').select(columns)
+        if cursor.get("u") is not None:
+            query = query.or_(
+                f'updated_at.gt."{cursor["u"]}",'
+                f'and(updated_at.eq."{cursor["u"]}",id.gt.{int(cursor["i"])})'
+            )
+        changes = query.order('updated_at').order('id').limit(limit).execute().data
+        
+        query = self.client.table('ai_tools_tombstones').select('id,deleted_at')
+        if cursor.get("d") is not None:
+            query = query.or_(
+                f'deleted_at.gt."{cursor["d"]}",'
+                f'and(deleted_at.eq."{cursor["d"]}",id.gt.{int(cursor["di"])})'
+            )
+        tombstones = query.order('deleted_at').order('id').limit(limit).execute().data
+        
+        new_cursor = dict(cursor)
+        if changes:
+            new_cursor.update(u=changes[-1]['updated_at'], i=changes[-1]['id'])
+        if tombstones:
+            new_cursor.update(d=tombstones[-1]['deleted_at'], di=tombstones[-1]['id'])
+        
+        return {
+            "changes": changes,
+            "deleted": [t['id'] for t in tombstones],
+            "cursor": new_cursor,
+            "has_more": len(changes) == limit or len(tombstones) == limit
+        }
+    
+    @single_flight
+    def get_trending_today(self, columns: str = "*") -> List[dict]:
         """
         Get tools discovered today, sorted by hype score
         
+        Args:
+            columns: Columns to select (comma separated)
+        
         Returns:
             List of today's trending tools
         """
@@ -266,7 +611,7 @@ class Database:
             today = datetime.now().date()
             
             response = self.client.table('ai_tools')\
-                .select("*")\
+                .select(columns)\
                 .gte('discovered_date', today.isoformat())\
                 .order('hype_score', desc=True)\
                 .execute()
@@ -277,6 +622,84 @@ class Database:
             logger.error(f"Error fetching trending tools: {str(e)}")
             return []
 
+    def insert_scan_logs(self, rows: List[dict]) -> List[dict]:
+        """
+        Save scan log rows (one per source, one summary per run)
+
+        Never raises - a missing or broken logs table must not fail a scan
+
+        Args:
+            rows: Scan log rows
+
+        Returns:
+            The saved rows (empty list on failure)
+        """
+        try:
+            response = self.client.table('scan_logs').insert(_normalize_value(rows)).execute()
+            return response.data
+
+        except Exception as e:
+            logger.error(f"Error saving scan log: {str(e)}")
+            return []
+
+    @single_flight
+    def get_scan_logs(self, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """
+        Page through scan runs, newest first, each with its per-source rows
+
+        Args:
+            limit: Number of runs to return
+            offset: Number of runs to skip
+
+        Returns:
+            {"runs": [...], "total": total number of runs}
+        """
+        response = self.client.table('scan_logs')\
+            .select("*", count="exact")\
+            .eq('kind', 'run')\
+            .order('started_at', desc=True)\
+            .range(offset, offset + limit - 1)\
+            .execute()
+        runs = response.data
+
+        if runs:
+            # One query for every source row of this page of runs
+            sources = self.client.table('scan_logs')\
+                .select("*")\
+                .eq('kind', 'source')\
+                .in_('run_id', [run['run_id'] for run in runs])\
+                .order('started_at')\
+                .execute()
+
+            by_run: Dict[str, List[dict]] = {}
+            for row in sources.data:
+                by_run.setdefault(row['run_id'], []).append(row)
+            for run in runs:
+                run['sources'] = by_run.get(run['run_id'], [])
+
+        return {"runs": runs, "total": response.count or 0}
+
+    @single_flight
+    def get_source_scans(self, source: str, limit: int = 20) -> List[dict]:
+        """
+        A source's most recent scan log rows, newest first
+
+        Args:
+            source: Source name ("huggingface", "github", ...)
+            limit: Number of rows to return
+
+        Returns:
+            Rows with started_at, status, row counts and change_rate
+        """
+        response = self.client.table('scan_logs')\
+            .select("started_at, status, rows_scraped, rows_inserted, rows_updated, change_rate")\
+            .eq('kind', 'source')\
+            .eq('source', source)\
+            .order('started_at', desc=True)\
+            .limit(limit)\
+            .execute()
+        return response.data
+
 # Create a global database instance with lazy initialization
 _db_instance = None
 
@@ -290,5 +713,14 @@ def get_db() -> Database:
         _db_instance = Database()
     return _db_instance
 
-# For backward compatibility
-db = get_db()
\ No newline at end of file
+class _LazyDatabase:
+    """
+    Stands in for the Database instance until it is first used, so importing
+    this module (or anything that imports `db`) doesn't connect to Supabase
+    """
+    
+    def __getattr__(self, name):
+        return getattr(get_db(), name)
+
+# For backward compatibility - connects on first attribute access
+db: Database = _LazyDatabase()
\ No newline at end of file
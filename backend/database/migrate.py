@@ -0,0 +1,313 @@
+"""
+Schema Migrations
+Applies database/migrations/*.sql in order and checks the hot queries' plans
+
+Usage (from the backend folder):
+    python -m database.migrate              # apply pending migrations, then check
+    python -m database.migrate --status     # list applied / pending migrations
+    python -m database.migrate --check      # only run the EXPLAIN check
+
+Supabase's REST API can't run DDL, so this connects to Postgres directly
+(DATABASE_URL - the connection string from Supabase's database settings).
+Needs psycopg: pip install "psycopg[binary]"
+
+Each file runs in its own transaction and is recorded in schema_migrations
+with a checksum; editing a file that has already been applied is an error -
+add a new migration instead.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# The queries behind every read path and the ingest dedup, in the shape
+# PostgREST sends them. None of them may plan as a sequential scan.
+HOT_QUERIES = [
+    ("get_tools_by_url (ingest dedup and refresh)",
+     "SELECT id, url, name, source, github_stars, hype_score FROM ai_tools WHERE url = ANY(%(urls)s)"),
+    ("get_tool_by_name",
+     "SELECT * FROM ai_tools WHERE name = %(name)s LIMIT 1"),
+    ("get_tool",
+     "SELECT * FROM ai_tools WHERE id = %(id)s"),
+    ("get_tools (/api/tools)",
+     "SELECT * FROM ai_tools ORDER BY created_at DESC"),
+    ("get_all_tools",
+     "SELECT * FROM ai_tools ORDER BY hype_score DESC LIMIT 100"),
+    ("get_trending_today (/api/trending)",
+     "SELECT * FROM ai_tools WHERE discovered_date >= %(day)s ORDER BY hype_score DESC"),
+    ("category listing",
+     "SELECT * FROM ai_tools WHERE category = %(category)s ORDER BY hype_score DESC LIMIT 50"),
+    ("iter_tool_pages (/api/tools/export)",
+     "SELECT * FROM ai_tools WHERE id > %(id)s ORDER BY id LIMIT 1000"),
+    ("get_changes (/api/tools/changes)",
+     "SELECT * FROM ai_tools WHERE updated_at > %(ts)s OR (updated_at = %(ts)s AND id > %(id)s) "
+     "ORDER BY updated_at, id LIMIT 500"),
+    ("get_changes tombstones",
+     "SELECT id, deleted_at FROM ai_tools_tombstones "
+     "WHERE deleted_at > %(ts)s OR (deleted_at = %(ts)s AND id > %(id)s) "
+     "ORDER BY deleted_at, id LIMIT 500"),
+    ("get_stale_tools (archival)",
+     "SELECT * FROM ai_tools WHERE discovered_date < %(ts)s "
+     "AND (hype_score IS NULL OR hype_score < %(hype)s) ORDER BY discovered_date LIMIT 500"),
+    ("get_overflow_tools (archival)",
+     "SELECT * FROM ai_tools ORDER BY discovered_date DESC, hype_score DESC OFFSET %(keep)s LIMIT 500"),
+    ("get_tools include_archive",
+     "SELECT * FROM ai_tools_archive ORDER BY created_at DESC"),
+    ("get_scan_logs runs",
+     "SELECT * FROM scan_logs WHERE kind = 'run' ORDER BY started_at DESC LIMIT 10"),
+    ("get_scan_logs sources",
+     "SELECT * FROM scan_logs WHERE kind = 'source' AND run_id = ANY(%(run_ids)s) ORDER BY started_at"),
+    ("get_source_scans (adaptive scheduling)",
+     "SELECT started_at, status, rows_scraped, rows_inserted, rows_updated, change_rate FROM scan_logs "
+     "WHERE kind = 'source' AND source = %(source)s ORDER BY started_at DESC LIMIT 20"),
+]
+
+SAMPLE_PARAMS = {
+    "urls": ["https://github.com/example/tool", "https://huggingface.co/example/model"],
+    "name": "example-tool",
+    "id": 1,
+    "day": date.today(),
+    "category": "NLP",
+    "ts": datetime(2024, 1, 1),
+    "run_ids": ["example-run"],
+    "source": "github",
+    "hype": 50,
+    "keep": 10000,
+}
+
+
+# Rows per table in the plan check's shadow copy: enough that the planner
+# only picks an index where one beats reading the table
+PLAN_CHECK_ROWS = 20000
+PLAN_CHECK_SCHEMA = "plan_check"
+
+# Synthetic rows spread like the real ones: a year of discovery dates, a few
+# sources and categories, ids given explicitly so no live sequence moves
+_TOOL_ROWS = """
+SELECT i, 'tool-' || i, 'Synthetic tool', 'https://plan-check.invalid/' || i,
+       (ARRAY['github', 'huggingface', 'producthunt'])[1 + i %% 3],
+       NOW() - (i %% 365) * INTERVAL '1 day', 'category-' || (i %% 25), i %% 101, i %% 5000,
+       NOW() - (i %% 365) * INTERVAL '1 day', NOW() - i * INTERVAL '1 minute'
+FROM generate_series(1, %(rows)s) AS i
+"""
+_TOOL_COLUMNS = ("id, name, description, url, source, discovered_date, category, "
+                 "hype_score, github_stars, created_at, updated_at")
+
+PLAN_CHECK_FILL = {
+    "ai_tools": f"INSERT INTO ai_tools ({_TOOL_COLUMNS}) {_TOOL_ROWS}",
+    "ai_tools_archive": f"INSERT INTO ai_tools_archive ({_TOOL_COLUMNS}) {_TOOL_ROWS}",
+    "ai_tools_tombstones": """
+        INSERT INTO ai_tools_tombstones (id, deleted_at)
+        SELECT i, NOW() - i * INTERVAL '1 minute' FROM generate_series(1, %(rows)s) AS i
+    """,
+    "scan_logs": """
+        INSERT INTO scan_logs (id, run_id, kind, trigger, source, status, started_at)
+        SELECT i, 'run-' || (i / 4), CASE WHEN i %% 4 = 0 THEN 'run' ELSE 'source' END, 'cron',
+               CASE WHEN i %% 4 = 0 THEN NULL
+                    ELSE (ARRAY['github', 'huggingface', 'producthunt'])[i %% 4] END,
+               'success', NOW() - (i / 4) * INTERVAL '6 hours'
+        FROM generate_series(1, %(rows)s) AS i
+    """,
+}
+
+
+def _connect(database_url: Optional[str] = None):
+    if os.getenv("ENVIRONMENT", "development") == "development":
+        load_dotenv()
+
+    database_url = database_url or os.getenv("DATABASE_URL")
+    if not database_url:
+        raise ValueError(
+            "DATABASE_URL environment variable not set. "
+            "Use the Postgres connection string from Supabase: Project Settings -> Database."
+        )
+
+    try:
+        import psycopg
+    except ImportError:
+        raise RuntimeError('psycopg is required for migrations: pip install "psycopg[binary]"')
+
+    # Transactions are opened explicitly, one per migration
+    return psycopg.connect(database_url, autocommit=True)
+
+
+def load_migrations(directory: str = MIGRATIONS_DIR) -> List[Tuple[str, str, str]]:
+    """
+    Migration files in version order
+
+    Returns:
+        (version, filename, sql) per file; version is the numeric prefix
+    """
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".sql"):
+            continue
+        version = filename.split("_", 1)[0]
+        with open(os.path.join(directory, filename), encoding="utf-8") as f:
+            migrations.append((version, filename, f.read()))
+
+    versions = [m[0] for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {directory}: {versions}")
+    return migrations
+
+
+def _checksum(sql: str) -> str:
+    return hashlib.sha256(sql.encode("utf-8")).hexdigest()
+
+
+def _applied(conn) -> dict:
+    with conn.transaction():
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """)
+    rows = conn.execute("SELECT version, filename, checksum FROM schema_migrations").fetchall()
+    return {version: (filename, checksum) for version, filename, checksum in rows}
+
+
+def migrate(conn) -> List[str]:
+    """
+    Apply every pending migration, each in its own transaction
+
+    Returns:
+        Filenames applied by this call
+
+    Raises:
+        ValueError if an applied migration's file has changed since
+    """
+    applied = _applied(conn)
+    done = []
+
+    for version, filename, sql in load_migrations():
+        if version in applied:
+            if applied[version][1] != _checksum(sql):
+                raise ValueError(
+                    f"{filename} was changed after being applied - add a new migration instead"
+                )
+            continue
+
+        logger.info(f"Applying {filename}...")
+        with conn.transaction():
+            conn.execute(sql)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, filename, checksum) VALUES (%s, %s, %s)",
+                (version, filename, _checksum(sql))
+            )
+        logger.info(f"✅ Applied {filename}")
+        done.append(filename)
+
+    return done
+
+
+def _scan_nodes(plan: dict) -> List[str]:
+    """
+    Relations read by a Seq Scan anywhere in an EXPLAIN (FORMAT JSON) plan
+    """
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(_scan_nodes(child))
+    return found
+
+
+def check_plans(conn, rows: int = PLAN_CHECK_ROWS) -> List[str]:
+    """
+    EXPLAIN every hot query and report the ones that plan a sequential scan
+
+    On a small table the planner rightly prefers a seq scan, which says
+    nothing about the indexes - and forcing index plans (enable_seqscan =
+    off) would hide the seq scans this check is for. So the queries are
+    planned against a shadow copy instead: the tables are recreated with
+    all their indexes in a scratch schema, filled with `rows` synthetic
+    rows each and analyzed, and the whole thing is rolled back. The real
+    tables are never written to.
+
+    Returns:
+        One message per query that plans a sequential scan
+    """
+    problems = []
+    with conn.transaction(force_rollback=True):
+        conn.execute(f"CREATE SCHEMA {PLAN_CHECK_SCHEMA}")
+        for table in PLAN_CHECK_FILL:
+            conn.execute(
+                f"CREATE TABLE {PLAN_CHECK_SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)"
+            )
+        conn.execute(f"SET LOCAL search_path = {PLAN_CHECK_SCHEMA}")
+        for table, fill in PLAN_CHECK_FILL.items():
+            conn.execute(fill, {"rows": rows})
+            conn.execute(f"ANALYZE {table}")
+
+        for name, sql in HOT_QUERIES:
+            row = conn.execute("EXPLAIN (FORMAT JSON) " + sql, SAMPLE_PARAMS).fetchone()
+            plan = row[0] if not isinstance(row[0], str) else json.loads(row[0])
+            tables = _scan_nodes(plan[0]["Plan"])
+            if tables:
+                problems.append(f"{name}: sequential scan on {', '.join(tables)}")
+                logger.error(f"❌ {name}: sequential scan on {', '.join(tables)}")
+            else:
+                logger.info(f"✅ {name}")
+    return problems
+
+
+def status(conn):
+    applied = _applied(conn)
+    for version, filename, sql in load_migrations():
+        state = "applied" if version in applied else "pending"
+        if version in applied and applied[version][1] != _checksum(sql):
+            state = "CHANGED"
+        print(f"{state:<8} {filename}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Apply schema migrations")
+    parser.add_argument("--database-url", help="defaults to $DATABASE_URL")
+    parser.add_argument("--status", action="store_true", help="list migrations and exit")
+    parser.add_argument("--check", action="store_true", help="only check query plans")
+    args = parser.parse_args(argv)
+
+    try:
+        conn = _connect(args.database_url)
+    except (ValueError, RuntimeError) as e:
+        logger.error(f"❌ {str(e)}")
+        return 2
+
+    with conn:
+        if args.status:
+            status(conn)
+            return 0
+
+        try:
+            if not args.check:
+                applied = migrate(conn)
+                logger.info(f"{len(applied)} migration(s) applied" if applied else "Schema is up to date")
+        except Exception as e:
+            logger.error(f"❌ Migration failed: {str(e)}")
+            return 1
+
+        problems = check_plans(conn)
+        if problems:
+            logger.error(f"❌ {len(problems)} hot query(s) without a usable index")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
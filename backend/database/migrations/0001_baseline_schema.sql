@@ -0,0 +1,25 @@
+-- Baseline: the tables as they existed before migrations were tracked.
+-- IF NOT EXISTS everywhere, so this is a no-op on the live Supabase database.
+
+CREATE TABLE IF NOT EXISTS ai_tools (
+    id BIGSERIAL PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    discovered_date TIMESTAMP DEFAULT NOW(),
+    summary TEXT,
+    use_cases TEXT[],
+    category TEXT,
+    hype_score INTEGER,
+    github_stars INTEGER,
+    pricing TEXT,
+    tags TEXT[],
+    logo_url TEXT,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_hype_score ON ai_tools(hype_score DESC);
+CREATE INDEX IF NOT EXISTS idx_category ON ai_tools(category);
+CREATE INDEX IF NOT EXISTS idx_discovered_date ON ai_tools(discovered_date DESC);
@@ -0,0 +1,28 @@
+-- One row per scan run and per source scanned in it, with phase timings and
+-- row counts (scheduler/scan_log.py, /api/scan/logs)
+
+CREATE TABLE IF NOT EXISTS scan_logs (
+    id BIGSERIAL PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    trigger TEXT NOT NULL,
+    source TEXT,
+    status TEXT NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP,
+    duration_ms INTEGER,
+    scrape_ms INTEGER,
+    dedup_ms INTEGER,
+    analyze_ms INTEGER,
+    insert_ms INTEGER,
+    http_requests INTEGER,
+    http_bytes BIGINT,
+    rows_scraped INTEGER,
+    rows_inserted INTEGER,
+    rows_skipped INTEGER,
+    rows_failed INTEGER,
+    errors JSONB DEFAULT '[]'
+);
+
+CREATE INDEX IF NOT EXISTS idx_scan_logs_runs ON scan_logs(kind, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_scan_logs_run_id ON scan_logs(run_id);
@@ -0,0 +1,11 @@
+-- /api/tools/changes: rows are paged by (updated_at, id), and deleted tools
+-- leave a tombstone so clients can drop them
+
+CREATE INDEX IF NOT EXISTS idx_updated_at ON ai_tools(updated_at, id);
+
+CREATE TABLE IF NOT EXISTS ai_tools_tombstones (
+    id BIGINT PRIMARY KEY,
+    deleted_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_at ON ai_tools_tombstones(deleted_at, id);
@@ -0,0 +1,36 @@
+-- Indexes shaped after the queries the API and the ingest scripts run.
+
+-- Every ingest checks url before inserting. Duplicates that slipped through
+-- that check (concurrent scans) are removed first, keeping the oldest row,
+-- and tombstoned so change feed clients drop them too.
+WITH duplicates AS (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY url ORDER BY id) AS copy
+        FROM ai_tools
+    ) ranked
+    WHERE copy > 1
+), tombstoned AS (
+    INSERT INTO ai_tools_tombstones (id, deleted_at)
+    SELECT id, NOW() FROM duplicates
+    ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at
+    RETURNING id
+)
+DELETE FROM ai_tools WHERE id IN (SELECT id FROM tombstoned);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ai_tools_url ON ai_tools(url);
+
+-- get_tool_by_name
+CREATE INDEX IF NOT EXISTS idx_ai_tools_name ON ai_tools(name);
+
+-- /api/tools and the snapshot's list order
+CREATE INDEX IF NOT EXISTS idx_ai_tools_created_at ON ai_tools(created_at DESC);
+
+-- /api/trending: discovered_date range, ordered by hype_score
+CREATE INDEX IF NOT EXISTS idx_ai_tools_discovered_hype ON ai_tools(discovered_date DESC, hype_score DESC);
+
+-- Per-category listings ordered by hype_score
+CREATE INDEX IF NOT EXISTS idx_ai_tools_category_hype ON ai_tools(category, hype_score DESC);
+
+-- Both are leading prefixes of the composite indexes above
+DROP INDEX IF EXISTS idx_discovered_date;
+DROP INDEX IF EXISTS idx_category;
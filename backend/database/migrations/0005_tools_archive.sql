@@ -0,0 +1,15 @@
+-- Cold storage for tools that aged out of ai_tools (see scheduler/archive.py).
+-- Same columns as ai_tools plus archived_at; a migration that adds a column
+-- to ai_tools must add it here too.
+
+CREATE TABLE IF NOT EXISTS ai_tools_archive (
+    LIKE ai_tools INCLUDING DEFAULTS,
+    archived_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id)
+);
+
+-- archive_tools upserts on url: a tool archived twice keeps one copy
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ai_tools_archive_url ON ai_tools_archive(url);
+
+-- include_archive listings, newest first
+CREATE INDEX IF NOT EXISTS idx_ai_tools_archive_created_at ON ai_tools_archive(created_at DESC);
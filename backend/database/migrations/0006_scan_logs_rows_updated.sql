@@ -0,0 +1,2 @@
+-- Tools whose metrics a re-scrape refreshed (scraper/refresh.py)
+ALTER TABLE scan_logs ADD COLUMN IF NOT EXISTS rows_updated INTEGER;
@@ -0,0 +1,6 @@
+-- Share of a source's scraped items that were new or changed, per scan;
+-- scheduler/adaptive.py sets each source's scan interval from it
+ALTER TABLE scan_logs ADD COLUMN IF NOT EXISTS change_rate REAL;
+
+-- A source's recent scans, newest first (get_source_scans)
+CREATE INDEX IF NOT EXISTS idx_scan_logs_source ON scan_logs(source, started_at DESC) WHERE kind = 'source';
@@ -0,0 +1,32 @@
+-- The change feed pages by (updated_at, id) and tombstones by (deleted_at, id).
+-- Both timestamps are set here, from the database clock: writers on other
+-- hosts (the Actions runner, the Render worker) have skewed or differently
+-- zoned clocks, and a timestamp written behind a cursor a client has already
+-- passed would be skipped for good.
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION set_deleted_at() RETURNS trigger AS $$
+BEGIN
+    NEW.deleted_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- On insert too, so a client that still sends its own clock is overruled
+DROP TRIGGER IF EXISTS ai_tools_updated_at ON ai_tools;
+CREATE TRIGGER ai_tools_updated_at BEFORE INSERT OR UPDATE ON ai_tools
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- A tool deleted again (upsert on id) gets a fresh tombstone time
+DROP TRIGGER IF EXISTS ai_tools_tombstones_deleted_at ON ai_tools_tombstones;
+CREATE TRIGGER ai_tools_tombstones_deleted_at BEFORE INSERT OR UPDATE ON ai_tools_tombstones
+    FOR EACH ROW EXECUTE FUNCTION set_deleted_at();
+
+ALTER TABLE ai_tools ALTER COLUMN updated_at SET DEFAULT NOW();
+ALTER TABLE ai_tools_tombstones ALTER COLUMN deleted_at SET DEFAULT NOW();
@@ -0,0 +1,39 @@
+-- Batch update for Database.update_tools: one call updates many tools, each
+-- with its own values, and only tools that exist. An upsert on id would
+-- insert a tool that was archived or deleted since it was looked up, as a
+-- partial row; here a missing id matches nothing and stays missing.
+--
+-- rows is a JSON array of objects with an id plus the columns to change;
+-- columns an object leaves out keep their stored value. Returns how many
+-- tools were updated. A migration that adds a column to ai_tools must add it
+-- here too (updated_at is the trigger's, see 0008).
+
+CREATE OR REPLACE FUNCTION update_tools(rows JSONB) RETURNS INTEGER AS $$
+DECLARE
+    updated INTEGER;
+BEGIN
+    UPDATE ai_tools AS t
+    SET (name, description, url, source, discovered_date, summary, use_cases,
+         category, hype_score, github_stars, pricing, tags, logo_url) = (
+        SELECT p.name, p.description, p.url, p.source, p.discovered_date, p.summary, p.use_cases,
+               p.category, p.hype_score, p.github_stars, p.pricing, p.tags, p.logo_url
+        FROM jsonb_populate_record(t, r.value) AS p
+    )
+    FROM jsonb_array_elements(rows) AS r
+    WHERE t.id = (r.value->>'id')::BIGINT;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only the backend (service role) writes; Supabase grants new functions to
+-- its API roles by default
+REVOKE EXECUTE ON FUNCTION update_tools(JSONB) FROM PUBLIC;
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+        REVOKE EXECUTE ON FUNCTION update_tools(JSONB) FROM anon, authenticated;
+    END IF;
+END;
+$$;
@@ -0,0 +1,75 @@
+"""
+Single-Flight Reads
+Concurrent identical Database reads share one upstream query and its result
+"""
+
+import functools
+import threading
+from typing import Any, Dict
+
+from monitoring.metrics import DB_READS
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Turn arguments into something hashable for the in-flight key
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def single_flight(method):
+    """
+    Decorate a read method so that callers arriving while an identical call
+    (same arguments) is in flight wait for it instead of querying again
+
+    Only calls that overlap are shared - nothing is cached once the call
+    returns. Every caller gets the same result object, so callers must not
+    mutate it.
+    """
+    in_flight: Dict[Any, _Call] = {}
+    lock = threading.Lock()
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (_freeze(args), _freeze(kwargs))
+
+        with lock:
+            call = in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = in_flight[key] = _Call()
+
+        if not leader:
+            DB_READS.inc(method=name, result="coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        DB_READS.inc(method=name, result="issued")
+        try:
+            call.result = method(self, *args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with lock:
+                del in_flight[key]
+            call.done.set()
+
+    return wrapper
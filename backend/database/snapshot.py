@@ -0,0 +1,354 @@
+"""
+Catalog Snapshot
+Read-only copy of ai_tools in a memory-mapped binary file, so read endpoints
+don't need a database round trip
+
+File layout (all integers little-endian):
+    header   magic "AITSNAP1", format u32, version u64, section count u32
+    sections (name 16s, offset u64, length u64) per section, then the data:
+        ids            int64 per row, ascending (a row's position is its index here)
+        row_offsets    uint64 per row + 1, into "rows"
+        rows           each row as JSON, back to back
+        card_offsets   uint64 per row + 1, into "cards"
+        cards          each row's card view as JSON
+        by_created     uint32 positions, created_at descending (/api/tools order)
+        by_discovered  uint32 positions, discovered day descending then hype descending
+        discovered     int32 per position, discovered day as a date ordinal (0 = none)
+        tools_json     /api/tools body, and .gz alongside; same for cards_json
+        meta           JSON: built_at, count, stats, categories
+
+Every worker maps the same file, so they share one copy in the page cache.
+A new snapshot is written to a temp file and moved into place with
+os.replace; workers notice the new inode and switch over on their next read.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import orjson
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-worker build lock, each worker may build
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"AITSNAP1"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIQI")
+_SECTION = struct.Struct("<16sQQ")
+
+# How often readers stat() the file for a new version
+RELOAD_CHECK_SECONDS = 1.0
+
+# Minimum gap between automatic rebuild attempts (missing or stale file)
+REBUILD_RETRY_SECONDS = 60
+
+
+def _gzip(body: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+def _day(value: Optional[str]) -> int:
+    if not value:
+        return 0
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+def _desc_nulls_first(rows: List[dict], column: str) -> List[int]:
+    """
+    Positions sorted by column descending with NULLs first, like Postgres
+    """
+    present = [i for i, r in enumerate(rows) if r.get(column) is not None]
+    missing = [i for i, r in enumerate(rows) if r.get(column) is None]
+    present.sort(key=lambda i: rows[i][column], reverse=True)
+    return missing + present
+
+
+def _stats(rows: List[dict]) -> dict:
+    hype_scores = [r.get('hype_score') for r in rows if r.get('hype_score')]
+    categories = [r.get('category') for r in rows if r.get('category')]
+    return {
+        "total_tools": len(rows),
+        "avg_hype_score": round(sum(hype_scores) / len(hype_scores), 1) if hype_scores else 0,
+        "top_category": max(set(categories), key=categories.count) if categories else "N/A",
+    }
+
+
+def _categories(rows: List[dict]) -> List[dict]:
+    counts: Dict[str, int] = {}
+    for row in rows:
+        category = row.get('category', 'Uncategorized')
+        counts[category] = counts.get(category, 0) + 1
+    return [
+        {"name": name, "count": count}
+        for name, count in sorted(counts.items(), key=lambda x: x[1], reverse=True)
+    ]
+
+
+def write_snapshot(rows: List[dict], path: str, card_row) -> int:
+    """
+    Serialize rows into a snapshot file, replacing any previous one atomically
+
+    Args:
+        rows: Every ai_tools row
+        path: Destination file
+        card_row: Function turning a full row into its card view
+
+    Returns:
+        The new snapshot's version
+    """
+    rows = sorted(rows, key=lambda r: r['id'])
+    version = time.time_ns()
+
+    row_blobs = [orjson.dumps(r) for r in rows]
+    card_blobs = [orjson.dumps(card_row(r)) for r in rows]
+
+    def offsets(blobs: List[bytes]) -> bytes:
+        out = array('Q', [0])
+        for blob in blobs:
+            out.append(out[-1] + len(blob))
+        return out.tobytes()
+
+    by_created = _desc_nulls_first(rows, 'created_at')
+    days = [_day(r.get('discovered_date')) for r in rows]
+    # Within a day: hype descending, NULLs first (as Postgres orders them)
+    by_discovered = sorted(
+        range(len(rows)),
+        key=lambda i: (days[i], rows[i].get('hype_score') is None, rows[i].get('hype_score') or 0),
+        reverse=True
+    )
+
+    tools_json = b"[" + b",".join(row_blobs[i] for i in by_created) + b"]"
+    cards_json = b"[" + b",".join(card_blobs[i] for i in by_created) + b"]"
+
+    sections = {
+        "ids": array('q', (r['id'] for r in rows)).tobytes(),
+        "row_offsets": offsets(row_blobs),
+        "rows": b"".join(row_blobs),
+        "card_offsets": offsets(card_blobs),
+        "cards": b"".join(card_blobs),
+        "by_created": array('I', by_created).tobytes(),
+        "by_discovered": array('I', by_discovered).tobytes(),
+        "discovered": array('i', (days[i] for i in by_discovered)).tobytes(),
+        "tools_json": tools_json,
+        "tools_json.gz": _gzip(tools_json),
+        "cards_json": cards_json,
+        "cards_json.gz": _gzip(cards_json),
+        "meta": orjson.dumps({
+            "built_at": datetime.now().isoformat(),
+            "count": len(rows),
+            "stats": _stats(rows),
+            "categories": _categories(rows),
+        }),
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            offset = _HEADER.size + _SECTION.size * len(sections)
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, version, len(sections)))
+            for name, data in sections.items():
+                f.write(_SECTION.pack(name.encode(), offset, len(data)))
+                offset += len(data)
+            for data in sections.values():
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    return version
+
+
+class Snapshot:
+    """
+    One mapped snapshot file. All reads are slices of the map - nothing is
+    parsed until a single row has to be looked at
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, fmt, self.version, count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a format {FORMAT_VERSION} catalog snapshot")
+
+        view = memoryview(self._map)
+        self._sections: Dict[str, memoryview] = {}
+        for i in range(count):
+            name, offset, length = _SECTION.unpack_from(self._map, _HEADER.size + i * _SECTION.size)
+            self._sections[name.rstrip(b"\0").decode()] = view[offset:offset + length]
+
+        self.ids = self._sections["ids"].cast("q")
+        self._row_offsets = self._sections["row_offsets"].cast("Q")
+        self._card_offsets = self._sections["card_offsets"].cast("Q")
+        self._by_discovered = self._sections["by_discovered"].cast("I")
+        self._discovered = self._sections["discovered"].cast("i")
+        self.meta = orjson.loads(self._sections["meta"])
+
+    def list_body(self, view: str = "full", gzipped: bool = False) -> bytes:
+        """
+        Pre-rendered /api/tools body for the full or card view
+        """
+        name = "cards_json" if view == "card" else "tools_json"
+        return bytes(self._sections[name + (".gz" if gzipped else "")])
+
+    def row(self, tool_id: int) -> Optional[bytes]:
+        """
+        One row's JSON by id (binary search over the id column)
+        """
+        position = bisect_left(self.ids, tool_id)
+        if position == len(self.ids) or self.ids[position] != tool_id:
+            return None
+        return bytes(self._slice("rows", self._row_offsets, position))
+
+    def trending_body(self, day: date, view: str = "full") -> bytes:
+        """
+        JSON list of tools discovered on or after day, by hype score
+        """
+        name, offsets = ("cards", self._card_offsets) if view == "card" else ("rows", self._row_offsets)
+        parts = [self._slice(name, offsets, p) for p in self._by_discovered[:self.discovered_since(day)]]
+        return b"[" + b",".join(parts) + b"]"
+
+    def discovered_since(self, day: date) -> int:
+        """
+        Number of tools discovered on or after day
+        """
+        ordinal = day.toordinal()
+        count = 0
+        for value in self._discovered:
+            if value < ordinal:
+                break
+            count += 1
+        return count
+
+    def _slice(self, section: str, offsets: memoryview, position: int) -> memoryview:
+        return self._sections[section][offsets[position]:offsets[position + 1]]
+
+
+class CatalogSnapshot:
+    """
+    The snapshot this worker is serving, reloaded when the file is replaced
+    and rebuilt from Supabase when it gets older than max_age
+
+    Configuration (environment):
+        SNAPSHOT_ENABLED: "false" to always read from Supabase (default: on)
+        SNAPSHOT_PATH: snapshot file (default: in the temp directory)
+        SNAPSHOT_MAX_AGE: seconds before a rebuild is due (default: 600), which
+            picks up scans run outside this process (GitHub Actions)
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+        self.path = os.getenv(
+            "SNAPSHOT_PATH",
+            os.path.join(tempfile.gettempdir(), "ai-tool-tracker-catalog.snap")
+        )
+        self.max_age = float(os.getenv("SNAPSHOT_MAX_AGE", 600))
+        self._snapshot: Optional[Snapshot] = None
+        self._checked_at = 0.0
+        self._next_auto_build = 0.0
+        self._building = threading.Lock()
+
+    def current(self) -> Optional[Snapshot]:
+        """
+        The snapshot to serve from, or None to fall back to Supabase
+        """
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        if now - self._checked_at >= RELOAD_CHECK_SECONDS:
+            self._checked_at = now
+            self._check()
+        return self._snapshot
+
+    def refresh(self, background: bool = False):
+        """
+        Rebuild the snapshot from Supabase (one builder at a time across workers)
+
+        Args:
+            background: Build in a thread and return immediately
+        """
+        if not self.enabled:
+            return
+        if background:
+            threading.Thread(target=self.refresh, name="snapshot-build", daemon=True).start()
+            return
+        if not self._building.acquire(blocking=False):
+            return
+
+        lock_fd = None
+        try:
+            lock_fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                # Another worker is already building - it will replace the file
+                try:
+                    fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return
+
+            from database.connection import db
+            from api.projection import card_row
+
+            start = time.perf_counter()
+            rows = [row for page in db.iter_tool_pages() for row in page]
+            version = write_snapshot(rows, self.path, card_row)
+            logger.info(f"✅ Catalog snapshot {version} built: {len(rows)} tools in {time.perf_counter() - start:.2f}s")
+            self._checked_at = 0.0
+
+        except Exception as e:
+            logger.error(f"❌ Catalog snapshot build failed: {str(e)}")
+
+        finally:
+            if lock_fd is not None:
+                os.close(lock_fd)
+            self._building.release()
+
+    def _check(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._auto_build()
+            return
+
+        if self._snapshot is None or self._snapshot.inode != stat.st_ino:
+            try:
+                self._snapshot = Snapshot(self.path)
+                logger.info(f"Catalog snapshot {self._snapshot.version} loaded ({self._snapshot.meta['count']} tools)")
+            except Exception as e:
+                logger.error(f"❌ Could not load catalog snapshot: {str(e)}")
+
+        if time.time() - stat.st_mtime > self.max_age:
+            self._auto_build()
+
+    def _auto_build(self):
+        now = time.monotonic()
+        if now >= self._next_auto_build and not self._building.locked():
+            self._next_auto_build = now + REBUILD_RETRY_SECONDS
+            self.refresh(background=True)
+
+
+catalog = CatalogSnapshot()
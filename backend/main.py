@@ -3,8 +3,10 @@ FastAPI Main Server
 The backend API that frontend talks to
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 import logging
 from datetime import datetime
@@ -12,10 +14,15 @@ from datetime import datetime
 # Import our modules
 from database.connection import db
 from database.models import AITool, ToolStats
-from scheduler.daily_job import daily_job
-from scraper.producthunt_ingest import ingest_producthunt
-from scraper.huggingface_ingest import ingest_huggingface
-from scraper.github_ingest import ingest_github
+from database.snapshot import catalog
+from api.responses import (ClosingStreamingResponse, json_bytes_response, list_response,
+                           ndjson_chunks, wants_msgpack)
+from api.projection import select_columns, shape_rows
+from api.cursors import decode_cursor, encode_cursor
+from api.ratelimit import full_table_reads, rate_limit
+from scheduler.embedded import embedded_scheduler
+from monitoring.metrics import registry, CONTENT_TYPE
+from monitoring.middleware import PrometheusMiddleware
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -42,7 +49,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request counts, in-flight requests and latency per route
+app.add_middleware(PrometheusMiddleware)
+
 # ============== API ENDPOINTS ==============
+# Endpoints that query Supabase are plain `def`: FastAPI runs them in its
+# threadpool, so a slow query doesn't block the event loop and concurrent
+# identical reads can share one query (see database/singleflight.py)
 
 @app.get("/")
 async def root():
@@ -87,6 +100,9 @@ async def health_check():
     else:
         health_status["checks"]["environment"] = "healthy"
     
+    # Embedded scheduler role on this worker (leader, follower, disabled)
+    health_status["checks"]["scheduler"] = embedded_scheduler.role
+    
     # Check 3: Database connection
     try:
         response = db.client.table('ai_tools').select('id').limit(1).execute()
@@ -98,63 +114,219 @@ async def health_check():
     
     return health_status
 
-@app.get("/api/tools", response_model=List[dict])
-async def get_all_tools():
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus metrics (API requests, database calls, upstream HTTP calls)
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+@app.get("/api/tools", response_class=ORJSONResponse, dependencies=[Depends(rate_limit("read"))])
+def get_all_tools(
+    request: Request,
+    fields: Optional[str] = None,
+    view: str = "full",
+    include_archive: bool = False
+):
     """
     Get ALL AI tools from database without any filters
     Returns all tools sorted by created_at descending
+    
+    Query Parameters:
+    - fields: Comma separated columns to return, e.g. `id,name,hype_score`
+    - view: `full` (default) or `card` (only what the dashboard cards show)
+    - include_archive: Append archived tools (stale, low-hype) after the hot ones
+    
+    Send `Accept: application/x-msgpack` to get MessagePack instead of JSON
     """
+    columns = select_columns(fields, view)
+    
+    # Pre-rendered (and pre-gzipped) body from the catalog snapshot
+    snapshot = catalog.current()
+    if snapshot is not None and not fields and not include_archive and not wants_msgpack(request):
+        return json_bytes_response(
+            request, snapshot.list_body(view), snapshot.list_body(view, gzipped=True), snapshot.version
+        )
+    
+    # Full-table reads are expensive - only a few may hit Supabase at once
+    full_table_reads.acquire()
     try:
-        # Direct query to return ALL tools without filters
-        response = db.client.table('ai_tools').select("*").order('created_at', desc=True).execute()
-        tools = response.data
+        # ALL tools without filters (concurrent identical reads share one query)
+        tools = shape_rows(db.get_tools(columns, include_archive), "full" if fields else view)
         
         logger.info(f"TOOLS COUNT: {len(tools)}")
         logger.info(f"Sources found: {set(t.get('source') for t in tools)}")
         
-        return tools
+        return list_response(request, tools)
     
     except Exception as e:
         logger.error(f"Error fetching tools: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch tools")
+    
+    finally:
+        full_table_reads.release()
 
-@app.get("/api/tools/trending", response_model=List[dict])
-async def get_trending_tools():
+@app.get("/api/tools/trending", response_class=ORJSONResponse, dependencies=[Depends(rate_limit("read"))])
+def get_trending_tools(
+    request: Request,
+    fields: Optional[str] = None,
+    view: str = "full"
+):
     """
     Get today's trending AI tools
     
+    Takes the same `fields` / `view` parameters as /api/tools.
+    Send `Accept: application/x-msgpack` to get MessagePack instead of JSON
+    
     Returns:
         List of tools discovered today, sorted by hype score
     """
+    columns = select_columns(fields, view)
+    
+    snapshot = catalog.current()
+    if snapshot is not None and not fields and not wants_msgpack(request):
+        body = snapshot.trending_body(datetime.now().date(), view)
+        return json_bytes_response(request, body, version=snapshot.version)
+    
     try:
         logger.info("Fetching trending tools")
-        tools = db.get_trending_today()  # Fixed: removed await
+        tools = db.get_trending_today(columns)  # Fixed: removed await
+        tools = shape_rows(tools, "full" if fields else view)
         logger.info(f"Found {len(tools)} trending tools")
-        return tools
+        return list_response(request, tools)
     
     except Exception as e:
         logger.error(f"Error fetching trending tools: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch trending tools")
 
-@app.get("/api/tools/{tool_id}")
-async def get_tool_by_id(tool_id: int):
+@app.get("/api/tools/export", dependencies=[Depends(rate_limit("read"))])
+async def export_tools(
+    fields: Optional[str] = None,
+    view: str = "full",
+    gzip: bool = False,
+    include_archive: bool = False
+):
+    """
+    Stream the entire catalog as NDJSON (one JSON object per line)
+    
+    Pages through ai_tools by id and streams each page as soon as it is
+    read, so server memory stays flat however large the table gets.
+    
+    Query Parameters:
+    - fields / view: Same projections as /api/tools
+    - gzip: Compress the stream (Content-Encoding: gzip)
+    - include_archive: Stream archived tools after the hot ones
+    """
+    # Projections always include id, which the keyset pagination needs
+    columns = select_columns(fields, view)
+    pages = db.iter_tool_pages(columns, include_archive=include_archive)
+    
+    # Holds a full-table read slot until the response is done being sent
+    full_table_reads.acquire()
+    try:
+        # Read the first page up front so a database error is still a 500,
+        # not a truncated 200
+        first_page = await run_in_threadpool(next, pages, [])
+    except Exception as e:
+        full_table_reads.release()
+        logger.error(f"Error exporting tools: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to export tools")
+    except BaseException:
+        # Cancelled (the client went away) before there was a response to release it
+        full_table_reads.release()
+        raise
+    
+    def shaped_pages():
+        try:
+            yield shape_rows(first_page, "full" if fields else view)
+            for page in pages:
+                yield shape_rows(page, "full" if fields else view)
+        except Exception as e:
+            # Headers are already sent; the client sees a short stream
+            logger.error(f"Tool export aborted: {str(e)}")
+    
+    headers = {"Content-Disposition": 'attachment; filename="ai_tools.ndjson"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    
+    # The slot is released when the response finishes, not when the
+    # generator does: an aborted or never-read stream would otherwise keep it
+    return ClosingStreamingResponse(
+        ndjson_chunks(shaped_pages(), compress=gzip),
+        on_close=full_table_reads.release,
+        media_type="application/x-ndjson",
+        headers=headers
+    )
+
+@app.get("/api/tools/changes", response_class=ORJSONResponse, dependencies=[Depends(rate_limit("read"))])
+def get_tool_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    fields: Optional[str] = None,
+    view: str = "full"
+):
+    """
+    Incremental change feed for keeping a local copy of the catalog in sync
+    
+    Call without `since` for the first page of everything, then keep passing
+    back the returned `cursor` (until `has_more` is false, and later again for
+    new changes).
+    
+    Query Parameters:
+    - since: Cursor returned by the previous call
+    - limit: Max changed rows and max deletions per call (default: 500)
+    - fields / view: Same projections as /api/tools
+    
+    Returns:
+        Rows inserted or updated after the cursor (ordered by updated_at, id),
+        ids deleted after it, the new cursor and has_more
+    """
+    position = decode_cursor(since) if since else {}
+    
+    # The cursor is built from each row's updated_at and id
+    columns = select_columns(fields, view)
+    if columns != "*" and "updated_at" not in columns.split(","):
+        columns += ",updated_at"
+    
+    try:
+        page = db.get_changes(position, limit=limit, columns=columns)
+    except Exception as e:
+        logger.error(f"Error fetching changes: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch changes")
+    
+    return {
+        "changes": shape_rows(page["changes"], "full" if fields else view),
+        "deleted": page["deleted"],
+        "cursor": encode_cursor(page["cursor"]),
+        "has_more": page["has_more"]
+    }
+
+@app.get("/api/tools/{tool_id}", dependencies=[Depends(rate_limit("read"))])
+def get_tool_by_id(request: Request, tool_id: int, include_archive: bool = False):
     """
     Get a specific tool by ID
     
     Args:
         tool_id: Tool ID
+        include_archive: Also look up archived tools
     
     Returns:
         Tool details
     """
+    # Tools added since the snapshot was built (and archived tools) fall
+    # through to the database
+    snapshot = catalog.current()
+    body = snapshot.row(tool_id) if snapshot is not None else None
+    if body is not None:
+        return json_bytes_response(request, body, version=snapshot.version)
+    
     try:
-        # Direct query by ID
-        response = db.client.table('ai_tools').select("*").eq('id', tool_id).execute()
+        tool = db.get_tool(tool_id, include_archive)
         
-        if not response.data:
+        if tool is None:
             raise HTTPException(status_code=404, detail="Tool not found")
         
-        return response.data[0]
+        return tool
     
     except HTTPException:
         raise
@@ -162,20 +334,26 @@ async def get_tool_by_id(tool_id: int):
         logger.error(f"Error fetching tool: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch tool")
 
-@app.get("/api/stats", response_model=dict)
-async def get_stats():
+@app.get("/api/stats", response_model=dict, dependencies=[Depends(rate_limit("read"))])
+def get_stats():
     """
     Get overall statistics
     
     Returns:
         Dashboard statistics
     """
+    snapshot = catalog.current()
+    if snapshot is not None:
+        return {
+            **snapshot.meta["stats"],
+            "new_today": snapshot.discovered_since(datetime.now().date())
+        }
+    
     try:
-        # Direct query for all tools
-        response = db.client.table('ai_tools').select("*").execute()
-        tools = response.data
+        # Only the columns the stats need
+        tools = db.get_tools('hype_score,category')
         
-        trending = db.get_trending_today()  # Fixed: removed await
+        trending = db.get_trending_today('id')  # Fixed: removed await
         
         # Calculate stats
         total_tools = len(tools)
@@ -200,18 +378,20 @@ async def get_stats():
         logger.error(f"Error calculating stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get statistics")
 
-@app.get("/api/categories")
-async def get_categories():
+@app.get("/api/categories", dependencies=[Depends(rate_limit("read"))])
+def get_categories():
     """
     Get list of all categories
     
     Returns:
         List of unique categories with counts
     """
+    snapshot = catalog.current()
+    if snapshot is not None:
+        return snapshot.meta["categories"]
+    
     try:
-        # Direct query for all tools
-        response = db.client.table('ai_tools').select("*").execute()
-        tools = response.data
+        tools = db.get_tools('category')
         
         # Count categories
         category_counts = {}
@@ -235,44 +415,62 @@ async def get_categories():
         logger.error(f"Error fetching categories: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch categories")
 
-@app.post("/api/scan/manual")
+@app.post("/api/scan/manual", status_code=202, dependencies=[Depends(rate_limit("scan"))])
 async def trigger_manual_scan():
     """
-    Manually trigger the daily scan with detailed results
-    (For testing - in production would be scheduled)
+    Start a scan of every enabled source in the background
+    
+    Returns immediately. If a scan is already running, the request is
+    coalesced onto it and that job's id is returned instead.
     
     Returns:
-        Scan results with ingestion stats for each source
+        Job id and the URL to poll for progress and results
     """
+    # Scraping code is only loaded once a scan is requested (fast cold start)
+    from scheduler.daily_job import daily_job
+    from scheduler.jobs import scan_jobs
+    
     try:
         logger.info("Manual scan triggered")
         
-        # Run ingestion for each source
-        hf_result = ingest_huggingface()
-        gh_result = ingest_github()
-        # Product Hunt - DISABLED (blocks bots, requires login)
-        # ph_result = ingest_producthunt()
+        job, coalesced = scan_jobs.submit(
+            "manual", daily_job.scan_sources(), daily_job.time_budget, daily_job.source_budget
+        )
         
         return {
-            "status": "success",
-            "message": "Manual scan completed",
-            "timestamp": datetime.now().isoformat(),
-            "results": {
-                "huggingface": hf_result,
-                "github": gh_result
-                # "producthunt": ph_result  # Disabled
-            },
-            "summary": {
-                "total_scraped": hf_result.get("total_scraped", 0) + gh_result.get("total_scraped", 0),
-                "total_inserted": hf_result.get("total_inserted", 0) + gh_result.get("total_inserted", 0)
-            }
+            "status": job.status,
+            "message": "Scan already running" if coalesced else "Scan started",
+            "job_id": job.job_id,
+            "coalesced": coalesced,
+            "status_url": f"/api/scan/jobs/{job.job_id}",
+            "timestamp": datetime.now().isoformat()
         }
     
     except Exception as e:
-        logger.error(f"Manual scan failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Scan failed: {str(e)}")
+        logger.error(f"Manual scan failed to start: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Scan failed to start: {str(e)}")
+
+@app.get("/api/scan/jobs/{job_id}", dependencies=[Depends(rate_limit("read"))])
+async def get_scan_job(job_id: str):
+    """
+    Get the status and progress of a scan job
+    
+    Args:
+        job_id: Id returned by POST /api/scan/manual
+    
+    Returns:
+        Job status (queued, running, success, error), progress per source,
+        the scan log run_id and, once finished, ingestion stats per source
+    """
+    from scheduler.jobs import scan_jobs
+    
+    job = scan_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    return job.to_dict()
 
-@app.post("/api/scan/test")
+@app.post("/api/scan/test", dependencies=[Depends(rate_limit("scan"))])
 async def trigger_test_scan():
     """
     Run a limited test scan (3-5 tools only)
@@ -280,6 +478,8 @@ async def trigger_test_scan():
     Returns:
         Test scan results
     """
+    from scheduler.daily_job import daily_job
+    
     try:
         logger.info("Test scan triggered")
         tools = daily_job.test_run()  # Fixed: removed await
@@ -294,32 +494,32 @@ async def trigger_test_scan():
         logger.error(f"Test scan failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Test scan failed: {str(e)}")
 
-@app.get("/api/scan/logs")
-async def get_scan_logs(limit: int = 10):
+@app.get("/api/scan/logs", dependencies=[Depends(rate_limit("read"))])
+def get_scan_logs(
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
     """
-    Get recent scan logs
+    Get scan history, newest first
     
     Query Parameters:
-    - limit: Number of logs to return (default: 10)
+    - limit: Number of runs to return (default: 10, max: 100)
+    - offset: Number of runs to skip (for paging)
     
     Returns:
-        List of recent scan results
+        Scan runs with per-source rows: phase timings (scrape, dedup,
+        analyze, insert), HTTP requests/bytes and rows inserted/skipped/failed
     """
     try:
-        # For now, return a simulated log
-        # In production, this would query a logs table
+        page = db.get_scan_logs(limit=limit, offset=offset)
+        next_offset = offset + len(page["runs"])
+        
         return {
-            "logs": [
-                {
-                    "id": 1,
-                    "timestamp": datetime.now().isoformat(),
-                    "type": "manual",
-                    "status": "success",
-                    "huggingface": {"inserted": 5, "scraped": 10},
-                    "producthunt": {"inserted": 2, "scraped": 3}
-                }
-            ][:limit],
-            "note": "Full scan history requires a logs table in database"
+            "logs": page["runs"],
+            "total": page["total"],
+            "limit": limit,
+            "offset": offset,
+            "next_offset": next_offset if next_offset < page["total"] else None
         }
     
     except Exception as e:
@@ -350,6 +550,16 @@ async def startup_event():
         logger.info(f"Server running in {env} mode")
         logger.info("API ready for production traffic")
     
+    # Map the catalog snapshot now (or start building it) so the first
+    # read doesn't pay for it
+    snapshot = catalog.current()
+    if snapshot is not None:
+        logger.info(f"Catalog snapshot {snapshot.version} mapped ({snapshot.meta['count']} tools)")
+    
+    # In-process daily scan (only when SCHEDULER_ENABLED; one worker is leader)
+    embedded_scheduler.start()
+    logger.info(f"Scheduler: {embedded_scheduler.role}")
+    
     logger.info("=" * 60)
 
 @app.on_event("shutdown")
@@ -357,6 +567,12 @@ async def shutdown_event():
     """
     Runs when server stops
     """
+    import sys
+    
+    embedded_scheduler.shutdown()
+    # Parse workers only exist if this process ran a scan
+    if "scraper.parse_pool" in sys.modules:
+        sys.modules["scraper.parse_pool"].parse_pool.shutdown()
     logger.info("AI Tool Tracker API Shutting down...")
 
 # ============== RUN SERVER ==============
@@ -0,0 +1,80 @@
+"""
+Database Call Instrumentation
+Wraps the Supabase client so every query is timed per operation and table
+"""
+
+import time
+
+from .metrics import DB_LATENCY, DB_QUERIES
+
+# Builder methods that decide what kind of query is being made
+_OPERATIONS = {"select", "insert", "update", "upsert", "delete"}
+
+
+class InstrumentedQuery:
+    """
+    Proxy around a postgrest query builder
+
+    Every chained call is forwarded to the real builder; execute() is timed and
+    recorded under the operation (select/insert/...) and table name.
+    """
+
+    __slots__ = ("_builder", "_table", "_operation")
+
+    def __init__(self, builder, table: str, operation: str = "select"):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            # Properties such as `not_` hand back the builder itself
+            return self if attr is self._builder else attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if name in _OPERATIONS:
+                self._operation = name
+            if result is self._builder:
+                # Filters and modifiers return the same builder: keep this proxy
+                return self
+            if hasattr(result, "execute"):
+                return InstrumentedQuery(result, self._table, self._operation)
+            return result
+
+        return call
+
+    def execute(self):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            response = self._builder.execute()
+            outcome = "ok"
+            return response
+        finally:
+            DB_LATENCY.observe(time.perf_counter() - start, operation=self._operation, table=self._table)
+            DB_QUERIES.inc(operation=self._operation, table=self._table, outcome=outcome)
+
+
+class InstrumentedClient:
+    """
+    Proxy around supabase.Client whose table() queries and rpc() calls are
+    instrumented (an rpc is recorded under the function's name)
+    Anything else (auth, storage...) is passed straight through
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name: str) -> InstrumentedQuery:
+        return InstrumentedQuery(self._client.table(name), name)
+
+    def from_(self, name: str) -> InstrumentedQuery:
+        return self.table(name)
+
+    def rpc(self, fn: str, *args, **kwargs) -> InstrumentedQuery:
+        return InstrumentedQuery(self._client.rpc(fn, *args, **kwargs), fn, "rpc")
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
@@ -0,0 +1,270 @@
+"""
+Prometheus Metrics
+Tiny in-process counters, gauges and histograms rendered in the
+Prometheus text exposition format (served on /metrics)
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds (covers fast DB reads up to slow scrapes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    if value is None:
+        return ""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Base class: a named metric with a fixed set of label names
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        # Hot path: label values are expected to be strings already
+        return tuple(map(labels.get, self.labelnames))
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing value (e.g. requests served)
+    """
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down (e.g. requests currently in flight)
+    """
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets, plus sum and count
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the wall-clock duration of a with-block
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[:-1]) if state else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, hits in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += hits
+                le = 'le="' + _format_number(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    Holds every metric and renders them all for a scrape
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                return self._metrics[metric.name]
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text format (version 0.0.4)
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Starlette appends "; charset=utf-8" to text responses itself
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Global registry used by the API, database layer and scrapers
+registry = Registry()
+
+# ---- API requests ----
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+HTTP_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled", ("method", "route")
+)
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route", "status")
+)
+RATE_LIMITED = registry.counter(
+    "http_rate_limited_total", "Requests rejected with 429, per budget", ("budget",)
+)
+
+# ---- Database calls ----
+DB_QUERIES = registry.counter(
+    "db_queries_total", "Database calls made", ("operation", "table", "outcome")
+)
+DB_LATENCY = registry.histogram(
+    "db_query_duration_seconds", "Database call latency", ("operation", "table")
+)
+DB_READS = registry.counter(
+    "db_reads_total", "Database read method calls, issued upstream or coalesced onto an identical in-flight call",
+    ("method", "result")
+)
+
+# ---- Upstream (scraper / analyzer) HTTP calls ----
+UPSTREAM_REQUESTS = registry.counter(
+    "upstream_requests_total", "Outgoing HTTP requests", ("host", "method", "status")
+)
+UPSTREAM_LATENCY = registry.histogram(
+    "upstream_request_duration_seconds", "Outgoing HTTP request latency", ("host", "method")
+)
+UPSTREAM_BYTES = registry.counter(
+    "upstream_response_bytes_total", "Bytes received from upstream", ("host",)
+)
+UPSTREAM_RETRIES = registry.counter(
+    "upstream_retries_total", "Outgoing HTTP requests retried after an error or retryable status", ("host",)
+)
+UPSTREAM_HEDGES = registry.counter(
+    "upstream_hedged_requests_total", "Backup requests sent for slow calls, by which copy answered first",
+    ("host", "winner")
+)
+UPSTREAM_FAST_FAILS = registry.counter(
+    "upstream_fast_failures_total", "Requests not sent because of an open circuit or an expired deadline",
+    ("host", "reason")
+)
+UPSTREAM_BREAKER_STATE = registry.gauge(
+    "upstream_circuit_state", "Circuit breaker per host: 0 closed, 1 half-open, 2 open", ("host",)
+)
+
+# ---- Ingest pipeline stages ----
+INGEST_STAGE_ITEMS = registry.counter(
+    "ingest_stage_items_total", "Items each ingest pipeline stage has processed", ("source", "stage")
+)
+INGEST_STAGE_SECONDS = registry.counter(
+    "ingest_stage_busy_seconds_total", "Time each ingest pipeline stage spent working", ("source", "stage")
+)
@@ -0,0 +1,60 @@
+"""
+Request Metrics Middleware
+Records request counts, in-flight requests and latency per route and status
+"""
+
+import time
+
+from .metrics import HTTP_IN_PROGRESS, HTTP_LATENCY, HTTP_REQUESTS
+
+
+class PrometheusMiddleware:
+    """
+    Plain ASGI middleware (cheaper than BaseHTTPMiddleware, and safe for streaming)
+
+    Routes are labelled by their template ("/api/tools/{tool_id}") so that
+    label cardinality stays bounded; unknown paths are grouped as "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._patterns = None
+
+    def _route_label(self, scope) -> str:
+        if self._patterns is None:
+            # Compiled once, on the first request, after every route is registered
+            routes = scope["app"].router.routes if scope.get("app") else []
+            self._patterns = [
+                (route.path_regex, route.path) for route in routes
+                if hasattr(route, "path_regex")
+            ]
+        path = scope["path"]
+        for regex, template in self._patterns:
+            if regex.match(path):
+                return template
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_label(scope)
+        status_code = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc(method=method, route=route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            status = str(status_code[0])
+            HTTP_IN_PROGRESS.dec(method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
+            HTTP_LATENCY.observe(elapsed, method=method, route=route, status=status)
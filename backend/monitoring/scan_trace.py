@@ -0,0 +1,91 @@
+"""
+Scan Tracing
+Phase timings, HTTP counters and errors for the source currently being scanned
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Phases an ingest goes through for every source
+PHASES = ("scrape", "dedup", "analyze", "insert")
+
+# Keep scan log rows small even when every item fails
+MAX_ERRORS = 20
+
+_current = contextvars.ContextVar("scan_trace", default=None)
+
+
+class ScanTrace:
+    """
+    Accumulates what happened while one source was being ingested
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.phases = {name: 0.0 for name in PHASES}
+        self.http_requests = 0
+        self.http_bytes = 0
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def add_phase(self, name: str, seconds: float):
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_http(self, nbytes: int, requests: int = 1):
+        with self._lock:
+            self.http_requests += requests
+            self.http_bytes += nbytes
+
+    def add_error(self, message: str):
+        with self._lock:
+            if len(self.errors) < MAX_ERRORS:
+                self.errors.append(message[:500])
+
+
+@contextmanager
+def tracing(source: str):
+    """
+    Make a fresh ScanTrace current for the duration of the with-block
+    """
+    trace = ScanTrace(source)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def current_trace() -> Optional[ScanTrace]:
+    return _current.get()
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Time a block into the current trace (does nothing outside a scan)
+    """
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_phase(name, time.perf_counter() - start)
+
+
+def record_http(nbytes: int, requests: int = 1):
+    trace = _current.get()
+    if trace is not None:
+        trace.add_http(nbytes, requests)
+
+
+def record_error(message: str):
+    trace = _current.get()
+    if trace is not None:
+        trace.add_error(message)
@@ -0,0 +1,164 @@
+"""
+Adaptive Scan Scheduling
+Decides which sources a scheduled scan should scrape, from how much each
+source changed on its recent scans
+
+Every source scan logs its change rate: the share of scraped items that were
+new or had changed metrics (scheduler/scan_log.py). A source that keeps
+coming back with lots of changes is scanned more often; one that keeps
+coming back unchanged is scanned less. Each source gets its own interval,
+aimed at finding about SCAN_TARGET_CHANGE_RATE of its items changed per scan
+and kept within SCAN_MIN_INTERVAL..SCAN_MAX_INTERVAL.
+
+The intervals are worked out from the scan_logs table on every check, so
+they survive restarts and count scans from any runner (GitHub Actions, the
+embedded scheduler, manual scans).
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import db
+from scheduler.scan_log import change_rate
+
+logger = logging.getLogger(__name__)
+
+# A source is due once less than this share of its interval is left, so a
+# tick that fires a little early (cron jitter) doesn't push it a whole tick back
+DUE_SLACK = 0.1
+
+# Weight of the newest scan when updating an interval; the rest stays with
+# the interval the earlier scans settled on, so one odd scan can't swing it
+SMOOTHING = 0.5
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    # scan_logs are written in local time; Postgres may hand them back with an offset
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+class ScanPolicy:
+    """
+    Per-source scan intervals from each source's observed change rate
+
+    Configuration (environment):
+        SCAN_ADAPTIVE: "false" to scan every source every SCAN_BASE_INTERVAL
+            (default: on)
+        SCAN_BASE_INTERVAL: hours between scans of a source with no history
+            yet (default: 24)
+        SCAN_MIN_INTERVAL: shortest interval in hours (default: 6)
+        SCAN_MAX_INTERVAL: longest interval in hours (default: 72)
+        SCAN_TARGET_CHANGE_RATE: share of a source's items a scan should find
+            new or changed (default: 0.2)
+        SCAN_HISTORY: recent scans per source the interval is learned from (default: 20)
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("SCAN_ADAPTIVE", "true").lower() == "true"
+        self.base_interval = float(os.getenv("SCAN_BASE_INTERVAL", 24)) * 3600
+        self.min_interval = float(os.getenv("SCAN_MIN_INTERVAL", 6)) * 3600
+        self.max_interval = float(os.getenv("SCAN_MAX_INTERVAL", 72)) * 3600
+        self.target = float(os.getenv("SCAN_TARGET_CHANGE_RATE", 0.2))
+        self.history = int(os.getenv("SCAN_HISTORY", 20))
+
+    def interval(self, scans: List[dict]) -> float:
+        """
+        Seconds a source should wait between scans
+
+        Each scan that scraped something gives an estimate: if it found
+        `rate` of the items changed after `gap` seconds, about `target`
+        would have changed after gap * target / rate. The interval moves
+        part way towards each estimate in turn.
+
+        Args:
+            scans: The source's scan log rows, oldest first
+
+        Returns:
+            The interval in seconds, within the configured bounds
+        """
+        interval = self._clamp(self.base_interval)
+        if not self.enabled:
+            return interval
+
+        observed_at = None
+        for scan in scans:
+            rate = change_rate(scan)
+            started_at = _parse_time(scan.get("started_at"))
+            if rate is None or started_at is None:
+                # Failed or empty scans tell us nothing about the source
+                continue
+            if observed_at is not None:
+                gap = (started_at - observed_at).total_seconds()
+                if gap > 0:
+                    estimate = self._clamp(gap * self.target / rate if rate > 0 else self.max_interval)
+                    # Geometric blend: halving and doubling weigh the same
+                    interval = interval ** (1 - SMOOTHING) * estimate ** SMOOTHING
+            observed_at = started_at
+        return self._clamp(interval)
+
+    def plan(self, sources: List[str], now: Optional[datetime] = None) -> List[dict]:
+        """
+        Each source's interval, last scan and whether it is due now
+
+        A source whose history can't be read is due, so a broken logs table
+        falls back to scanning rather than to never scanning.
+
+        Args:
+            sources: Source names
+            now: Time to plan for (default: now)
+
+        Returns:
+            One dict per source: source, due, interval_hours, change_rate
+            (of the last scan that scraped something), last_scan, next_scan
+        """
+        now = now or datetime.now()
+        plans = []
+        for source in sources:
+            try:
+                scans = list(reversed(db.get_source_scans(source, self.history)))
+            except Exception as e:
+                logger.error(f"❌ Couldn't read scan history of {source}: {str(e)}")
+                scans = []
+
+            interval = self.interval(scans)
+            last_scan = _parse_time(scans[-1]["started_at"]) if scans else None
+            rates = [change_rate(scan) for scan in scans]
+            rates = [rate for rate in rates if rate is not None]
+            next_scan = last_scan + timedelta(seconds=interval) if last_scan else None
+            plans.append({
+                "source": source,
+                "due": next_scan is None or next_scan - now <= timedelta(seconds=interval * DUE_SLACK),
+                "interval_hours": round(interval / 3600, 2),
+                "change_rate": rates[-1] if rates else None,
+                "last_scan": last_scan.isoformat() if last_scan else None,
+                "next_scan": next_scan.isoformat() if next_scan else None,
+            })
+        return plans
+
+    def due(self, sources: List[str], now: Optional[datetime] = None) -> List[str]:
+        """
+        The sources that are due for a scan, in the order given
+        """
+        plans = self.plan(sources, now)
+        for p in plans:
+            logger.info(
+                f"Scan plan: {p['source']} every {p['interval_hours']}h "
+                f"(last change rate {p['change_rate']}), {'due' if p['due'] else 'next at ' + p['next_scan']}"
+            )
+        return [p["source"] for p in plans if p["due"]]
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self.max_interval, max(self.min_interval, seconds))
+
+
+scan_policy = ScanPolicy()
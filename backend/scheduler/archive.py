@@ -0,0 +1,92 @@
+"""
+Tool Archival
+Moves stale, low-hype tools out of ai_tools so the hot table stays small
+
+Usage (from the backend folder):
+    python -m scheduler.archive
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import db
+
+logger = logging.getLogger(__name__)
+
+# Rows moved per round trip
+BATCH_SIZE = 500
+
+
+class Archiver:
+    """
+    Moves tools into ai_tools_archive in two passes:
+    1. Stale: discovered more than ARCHIVE_AFTER_DAYS ago with a hype score
+       under ARCHIVE_MAX_HYPE (or none)
+    2. Overflow: everything past the newest ARCHIVE_MAX_HOT_ROWS, so the hot
+       table stays bounded even on days that add more than they age out
+
+    Configuration (environment):
+        ARCHIVE_ENABLED: "false" to never archive (default: on)
+        ARCHIVE_AFTER_DAYS: age before a low-hype tool is archived (default: 90)
+        ARCHIVE_MAX_HYPE: tools at or above this hype stay hot (default: 50)
+        ARCHIVE_MAX_HOT_ROWS: hard cap on the hot table, 0 for none (default: 10000)
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+        self.after_days = int(os.getenv("ARCHIVE_AFTER_DAYS", 90))
+        self.max_hype = int(os.getenv("ARCHIVE_MAX_HYPE", 50))
+        self.max_hot_rows = int(os.getenv("ARCHIVE_MAX_HOT_ROWS", 10000))
+
+    def run(self) -> dict:
+        """
+        Archive everything that is due
+
+        Returns:
+            Counts of stale and overflow tools archived
+        """
+        stats = {"stale": 0, "overflow": 0}
+        if not self.enabled:
+            return stats
+
+        start = time.perf_counter()
+        try:
+            cutoff = datetime.now() - timedelta(days=self.after_days)
+            stats["stale"] = self._drain(lambda: db.get_stale_tools(cutoff, self.max_hype, BATCH_SIZE))
+
+            if self.max_hot_rows > 0:
+                stats["overflow"] = self._drain(lambda: db.get_overflow_tools(self.max_hot_rows, BATCH_SIZE))
+
+            logger.info(
+                f"✅ Archived {stats['stale']} stale and {stats['overflow']} overflow tools "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+
+        except Exception as e:
+            logger.error(f"❌ Archival failed: {str(e)}")
+
+        return stats
+
+    @staticmethod
+    def _drain(fetch) -> int:
+        # Archived rows leave ai_tools, so every fetch returns the next batch
+        archived = 0
+        while True:
+            batch = fetch()
+            moved = db.archive_tools(batch)
+            archived += moved
+            # A batch that didn't move would come back forever
+            if len(batch) < BATCH_SIZE or not moved:
+                return archived
+
+
+archiver = Archiver()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(archiver.run())
@@ -19,6 +19,9 @@ from scraper.huggingface_ingest import ingest_huggingface
 from scraper.github_ingest import ingest_github
 from database.connection import db
 from database.models import AITool
+from scheduler.scan_log import ScanRun
+from scheduler.archive import archiver
+from scheduler.adaptive import scan_policy
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,6 +29,14 @@ logger = logging.getLogger(__name__)
 class DailyJob:
     """
     Orchestrates the daily scraping and analysis process
+    
+    Configuration (environment):
+        SCAN_TIME_BUDGET: seconds a whole scan may spend scraping, 0 for no
+            limit (default: 1800)
+        SCAN_SOURCE_BUDGET: seconds each source may spend, 0 for no limit (default: 600)
+    
+    A source that runs out of time stops scraping and stores what it has.
+    Scheduled scans only scrape the sources that are due (scheduler/adaptive.py).
     """
     
     def __init__(self):
@@ -35,6 +46,30 @@ class DailyJob:
             'huggingface': ingest_huggingface,
             'github': ingest_github
         }
+        self.time_budget = float(os.getenv("SCAN_TIME_BUDGET", 1800)) or None
+        self.source_budget = float(os.getenv("SCAN_SOURCE_BUDGET", 600)) or None
+    
+    def scan_run(self, trigger: str) -> ScanRun:
+        """
+        A scan run carrying this job's time budgets down to each source
+        """
+        return ScanRun(trigger, self.time_budget, self.source_budget)
+    
+    def scan_sources(self, due_only: bool = False) -> List[tuple]:
+        """
+        Enabled sources, in the order they are scanned
+        
+        Args:
+            due_only: Only the sources whose scan interval has passed
+        
+        Returns:
+            (source name, ingest function) pairs
+        """
+        # Product Hunt - DISABLED (blocks bots, requires login)
+        names = ['huggingface', 'github']
+        if due_only:
+            names = scan_policy.due(names)
+        return [(name, self.ingestion_sources[name]) for name in names]
     
     async def run_daily_scan(self):
         """
@@ -47,33 +82,35 @@ class DailyJob:
         
         all_ingestion_results = {}
         
-        # Step 1: Run ingestion for each source
+        # Every source, and the run as a whole, is written to the scan log
+        run = self.scan_run("daily")
+        
+        # Step 1: Run ingestion for each source that is due
         logger.info("\nPHASE 1: INGESTION (Scraping + DB Storage)")
+        sources = self.scan_sources(due_only=True)
+        if not sources:
+            logger.info("No source is due for a scan")
+            return
         
         try:
-            # Product Hunt - DISABLED (blocks bots, requires login)
-            # logger.info("\nRunning Product Hunt ingestion...")
-            # ph_result = ingest_producthunt()
-            # all_ingestion_results['producthunt'] = ph_result
-            # logger.info(f"   PH Result: inserted={ph_result.get('inserted', 0)}, scraped={ph_result.get('scraped', 0)}")
-            
-            # Hugging Face
-            logger.info("\nRunning Hugging Face ingestion...")
-            hf_result = ingest_huggingface()
-            all_ingestion_results['huggingface'] = hf_result
-            logger.info(f"   HF Result: inserted={hf_result.get('total_inserted', 0)}, scraped={hf_result.get('total_scraped', 0)}")
-            
-            # GitHub
-            logger.info("\nRunning GitHub ingestion...")
-            gh_result = ingest_github()
-            all_ingestion_results['github'] = gh_result
-            logger.info(f"   GH Result: inserted={gh_result.get('total_inserted', 0)}, scraped={gh_result.get('total_scraped', 0)}")
+            # Product Hunt - DISABLED (blocks bots, requires login), see scan_sources()
+            for name, ingest in sources:
+                logger.info(f"\nRunning {name} ingestion...")
+                result = run.run_source(name, ingest)
+                all_ingestion_results[name] = result
+                logger.info(f"   Result: inserted={result.get('total_inserted', 0)}, scraped={result.get('total_scraped', 0)}")
             
         except Exception as e:
             logger.error(f"Error during ingestion: {str(e)}")
         
-        # Step 2: Get newly inserted tools from database
-        logger.info("\nPHASE 2: SUMMARY")
+        run.finish()
+        
+        # Step 2: Move stale, low-hype tools to the archive
+        logger.info("\nPHASE 2: ARCHIVAL")
+        archived = archiver.run()
+        
+        # Step 3: Get newly inserted tools from database
+        logger.info("\nPHASE 3: SUMMARY")
         
         try:
             # Get tools discovered today
@@ -83,7 +120,7 @@ class DailyJob:
         except Exception as e:
             logger.error(f"Error during summary: {str(e)}")
         
-        # Step 3: Final summary
+        # Step 4: Final summary
         total_inserted = sum(
             r.get('inserted', 0) if isinstance(r, dict) else r.get('total_inserted', 0) 
             for r in all_ingestion_results.values()
@@ -99,6 +136,7 @@ class DailyJob:
         logger.info(f"   Sources processed: {len(all_ingestion_results)}")
         logger.info(f"   Total tools scraped: {total_scraped}")
         logger.info(f"   New tools inserted: {total_inserted}")
+        logger.info(f"   Tools archived: {archived['stale'] + archived['overflow']}")
         logger.info(f"   Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         logger.info("=" * 60)
     
@@ -108,12 +146,15 @@ class DailyJob:
         """
         logger.info("TEST RUN - Limited ingestion")
         
+        run = self.scan_run("test")
+        
         try:
             # Hugging Face ingestion  
-            hf_result = ingest_huggingface()
+            hf_result = run.run_source('huggingface', ingest_huggingface)
             
             # GitHub ingestion
-            gh_result = ingest_github()
+            gh_result = run.run_source('github', ingest_github)
+            run.finish()
             
             logger.info(f"Test results: HF={hf_result}, GH={gh_result}")
             
@@ -123,6 +164,7 @@ class DailyJob:
             }
         except Exception as e:
             logger.error(f"Test run failed: {str(e)}")
+            run.finish(status="error")
             return {"error": str(e)}
 
 # Create job instance
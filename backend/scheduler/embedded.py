@@ -0,0 +1,173 @@
+"""
+Embedded Scheduler
+Runs the daily scan on a cron schedule inside the API process, on one worker only
+
+Each run only scrapes the sources that are due (scheduler/adaptive.py), so
+the cron sets how often sources are checked, not how often they are scraped
+"""
+
+import logging
+import os
+import tempfile
+from typing import TYPE_CHECKING, Optional
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if TYPE_CHECKING:
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+# APScheduler and the scan code are imported only once the scheduler is
+# enabled, so read-only API workers don't load them at startup
+
+logger = logging.getLogger(__name__)
+
+# Same times as the GitHub Actions workflow (every 6 hours from 01:00 UTC)
+DEFAULT_CRON = "0 1,7,13,19 * * *"
+DEFAULT_JITTER = 300          # seconds, spreads runs so upstreams don't see a spike on the minute
+MISFIRE_GRACE = 3600          # a run missed by up to an hour (restart, deploy) still fires once
+ELECTION_INTERVAL = 60        # how often followers retry to become leader
+
+
+class LeaderLock:
+    """
+    Non-blocking exclusive lock on a file, held for as long as the process lives
+
+    Every uvicorn worker on the host tries the same file; the one that gets
+    it is the leader. The OS drops the lock if the leader dies, so another
+    worker can take over on its next attempt.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+
+        import fcntl
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        # Record who holds it, for debugging
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class EmbeddedScheduler:
+    """
+    APScheduler wrapper that only schedules the scan on the elected leader
+
+    Configuration (environment):
+        SCHEDULER_ENABLED: "true" to run scans in-process (default: off, the
+            GitHub Actions workflow runs them)
+        SCHEDULER_CRON: crontab expression in UTC for checking which sources
+            are due (default: "0 1,7,13,19 * * *")
+        SCHEDULER_JITTER: max random delay in seconds (default: 300)
+        SCHEDULER_LOCK_FILE: leader lock path (default: in the temp directory)
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+        self.cron = os.getenv("SCHEDULER_CRON", DEFAULT_CRON)
+        self.jitter = int(os.getenv("SCHEDULER_JITTER", DEFAULT_JITTER))
+        self.lock = LeaderLock(os.getenv(
+            "SCHEDULER_LOCK_FILE",
+            os.path.join(tempfile.gettempdir(), "ai-tool-tracker-scheduler.lock")
+        ))
+        self._scheduler: Optional["BackgroundScheduler"] = None
+
+    @property
+    def role(self) -> str:
+        if self._scheduler is None:
+            return "disabled"
+        return "leader" if self.lock.held else "follower"
+
+    def start(self):
+        """
+        Start the scheduler and try to become leader (no-op unless enabled)
+        """
+        if not self.enabled or self._scheduler is not None:
+            return
+
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        self._scheduler = BackgroundScheduler(
+            timezone="UTC",
+            job_defaults={
+                "coalesce": True,        # several missed runs fire once, not back to back
+                "max_instances": 1,
+                "misfire_grace_time": MISFIRE_GRACE,
+            }
+        )
+        self._scheduler.start()
+
+        if not self._elect():
+            logger.info(f"Scheduler: another worker is leader, retrying every {ELECTION_INTERVAL}s")
+            self._scheduler.add_job(self._elect, "interval", seconds=ELECTION_INTERVAL, id="leader-election")
+
+    def shutdown(self):
+        if self._scheduler is not None:
+            self._scheduler.shutdown(wait=False)
+            self._scheduler = None
+        self.lock.release()
+
+    def _elect(self) -> bool:
+        if not self.lock.acquire():
+            return False
+
+        from apscheduler.triggers.cron import CronTrigger
+
+        minute, hour, day, month, day_of_week = self.cron.split()
+        trigger = CronTrigger(
+            minute=minute, hour=hour, day=day, month=month, day_of_week=day_of_week,
+            timezone="UTC", jitter=self.jitter
+        )
+        self._scheduler.add_job(self.run_scan, trigger, id="daily-scan", replace_existing=True)
+        if self._scheduler.get_job("leader-election"):
+            self._scheduler.remove_job("leader-election")
+
+        next_run = self._scheduler.get_job("daily-scan").next_run_time
+        logger.info(f"✅ Scheduler leader (pid {os.getpid()}), next scan at {next_run}")
+        return True
+
+    def run_scan(self):
+        """
+        Scheduled scan of the sources that are due. Goes through the shared
+        job manager, so it joins a manual scan that is already running
+        instead of starting another
+        """
+        from scheduler.daily_job import daily_job
+        from scheduler.jobs import scan_jobs
+
+        sources = daily_job.scan_sources(due_only=True)
+        if not sources:
+            logger.info("Scheduled scan: no source is due")
+            return
+
+        job, coalesced = scan_jobs.submit(
+            "daily", sources, daily_job.time_budget, daily_job.source_budget
+        )
+        if coalesced:
+            logger.info(f"Scheduled scan joined running job {job.job_id}")
+        job.done.wait()
+
+
+embedded_scheduler = EmbeddedScheduler()
@@ -0,0 +1,161 @@
+"""
+Background Scan Jobs
+Runs scans off the request path and reports their progress by job id
+"""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.snapshot import catalog
+from scheduler.archive import archiver
+from scheduler.scan_log import ScanRun
+
+logger = logging.getLogger(__name__)
+
+# How many finished jobs stay queryable through /api/scan/jobs/{id}
+MAX_JOBS = 50
+
+Source = Tuple[str, Callable[[], dict]]
+
+
+class ScanJob:
+    """
+    One submitted scan: its status, progress and per-source results
+    """
+
+    def __init__(self, trigger: str, sources: List[Source], budget: Optional[float] = None,
+                 source_budget: Optional[float] = None):
+        self.job_id = uuid.uuid4().hex
+        self.trigger = trigger
+        self.sources = sources
+        self.budget = budget
+        self.source_budget = source_budget
+        self.status = "queued"
+        self.run_id: Optional[str] = None
+        self.current_source: Optional[str] = None
+        self.completed: List[str] = []
+        self.results: Dict[str, dict] = {}
+        self.error: Optional[str] = None
+        self.submitted_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.done = threading.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "run_id": self.run_id,
+            "progress": {
+                "current_source": self.current_source,
+                "completed": list(self.completed),
+                "total": len(self.sources),
+            },
+            "results": dict(self.results),
+            "summary": {
+                "total_scraped": sum(r.get("total_scraped", 0) for r in self.results.values()),
+                "total_inserted": sum(r.get("total_inserted", 0) for r in self.results.values()),
+                "total_updated": sum(r.get("total_updated", 0) for r in self.results.values()),
+            },
+            "error": self.error,
+            "submitted_at": self.submitted_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ScanJobManager:
+    """
+    Runs at most one scan at a time in a background thread
+
+    submit() is single-flight: while a scan is queued or running, further
+    submissions are coalesced onto it instead of starting a duplicate scan
+    that would race on the per-URL dedup check
+    """
+
+    def __init__(self, max_jobs: int = MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, ScanJob]" = OrderedDict()
+        self._active: Optional[ScanJob] = None
+        self._lock = threading.Lock()
+
+    def submit(self, trigger: str, sources: List[Source], budget: Optional[float] = None,
+               source_budget: Optional[float] = None) -> Tuple[ScanJob, bool]:
+        """
+        Start a scan in the background, or join the one already running
+
+        Args:
+            trigger: What asked for the scan ("manual", "daily", ...)
+            sources: (source name, ingest function) pairs, run in order
+            budget: Seconds the whole scan may spend on upstream calls (None: no limit)
+            source_budget: Seconds each source may spend (None: no limit)
+
+        Returns:
+            (job, coalesced) - coalesced is True when an existing job was returned
+        """
+        with self._lock:
+            if self._active is not None:
+                logger.info(f"Scan already running ({self._active.job_id}), coalescing {trigger} request")
+                return self._active, True
+
+            job = ScanJob(trigger, sources, budget, source_budget)
+            self._active = job
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        thread = threading.Thread(target=self._run, args=(job,), name=f"scan-{job.job_id[:8]}", daemon=True)
+        thread.start()
+        return job, False
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        return self._jobs.get(job_id)
+
+    def active(self) -> Optional[ScanJob]:
+        return self._active
+
+    def _run(self, job: ScanJob):
+        run = ScanRun(job.trigger, job.budget, job.source_budget)
+        job.run_id = run.run_id
+        job.status = "running"
+        job.started_at = datetime.now()
+        logger.info(f"Scan job {job.job_id} started ({job.trigger})")
+
+        try:
+            for source, ingest in job.sources:
+                job.current_source = source
+                job.results[source] = run.run_source(source, ingest)
+                job.completed.append(source)
+            run.finish()
+            # Keep the hot table bounded before the snapshot copies it
+            archiver.run()
+            # Read endpoints serve from the snapshot - publish the new rows
+            catalog.refresh()
+            job.status = "success"
+            logger.info(f"✅ Scan job {job.job_id} finished")
+
+        except Exception as e:
+            logger.error(f"❌ Scan job {job.job_id} failed: {str(e)}")
+            run.finish(status="error")
+            job.status = "error"
+            job.error = str(e)
+
+        finally:
+            job.current_source = None
+            job.finished_at = datetime.now()
+            with self._lock:
+                self._active = None
+            job.done.set()
+
+
+# Shared by the API and the scheduler so both go through the same guard
+scan_jobs = ScanJobManager()
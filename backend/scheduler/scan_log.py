@@ -0,0 +1,181 @@
+"""
+Scan Run Log
+Records every scan (daily, manual, test) in the scan_logs table:
+one row per source as it finishes, then one summary row for the run
+"""
+
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import db
+from monitoring.scan_trace import PHASES, ScanTrace, tracing
+from scraper.resilience import deadline
+
+logger = logging.getLogger(__name__)
+
+COUNT_KEYS = ("scraped", "inserted", "updated", "skipped", "failed")
+
+
+def _row_counts(result: dict) -> Dict[str, int]:
+    """
+    Sum scraped/inserted/updated/skipped/failed over an ingest result
+
+    Handles every result shape: flat (Product Hunt), or nested per kind
+    ("models"/"spaces" for Hugging Face, "repos" for GitHub)
+    """
+    totals = {key: 0 for key in COUNT_KEYS}
+    groups = [v for v in result.values() if isinstance(v, dict)] or [result]
+    for group in groups:
+        for key in COUNT_KEYS:
+            totals[key] += group.get(key, 0) or 0
+    return totals
+
+
+def change_rate(row: dict) -> Optional[float]:
+    """
+    Share of a source row's scraped items that were new or changed
+
+    Uses the stored change_rate if there is one (rows logged before it was
+    added only have the counts). None if nothing was scraped.
+    """
+    if row.get("change_rate") is not None:
+        return row["change_rate"]
+    scraped = row.get("rows_scraped") or 0
+    if not scraped:
+        return None
+    changed = (row.get("rows_inserted") or 0) + (row.get("rows_updated") or 0)
+    return round(min(1.0, changed / scraped), 4)
+
+
+class ScanRun:
+    """
+    One scan run. Wrap each source's ingest call with run_source(), then call finish()
+
+    Each source runs under a deadline (scraper/resilience.py): its own
+    source_budget, cut short by whatever is left of the run's budget
+
+    Example:
+        run = ScanRun("manual", budget=1800, source_budget=600)
+        hf_result = run.run_source("huggingface", ingest_huggingface)
+        run.finish()
+    """
+
+    def __init__(self, trigger: str, budget: Optional[float] = None,
+                 source_budget: Optional[float] = None):
+        self.run_id = uuid.uuid4().hex
+        self.trigger = trigger
+        self.budget = budget
+        self.source_budget = source_budget
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.sources: List[dict] = []
+
+    def time_left(self, source: bool = False) -> Optional[float]:
+        """
+        Seconds the run (or, with source=True, a source starting now) may
+        still take, or None if unlimited
+        """
+        budgets = []
+        if self.budget:
+            budgets.append(max(0.0, self.budget - (time.perf_counter() - self._start)))
+        if source and self.source_budget:
+            budgets.append(self.source_budget)
+        return min(budgets) if budgets else None
+
+    def run_source(self, source: str, ingest: Callable[[], dict]) -> dict:
+        """
+        Run one source's ingest function and log a row for it
+
+        Args:
+            source: Source name ("huggingface", "github", ...)
+            ingest: Ingest function to call
+
+        Returns:
+            Whatever the ingest function returned
+        """
+        started_at = datetime.now()
+        start = time.perf_counter()
+        result: dict = {}
+        with tracing(source) as trace, deadline(self.time_left(source=True)):
+            try:
+                result = ingest()
+                return result
+            except Exception as e:
+                trace.add_error(str(e))
+                result = {"status": "error", "error": str(e)}
+                raise
+            finally:
+                if result.get("error"):
+                    trace.add_error(str(result["error"]))
+                row = self._row("source", started_at, time.perf_counter() - start, trace, result)
+                self.sources.append(row)
+                db.insert_scan_logs([row])
+
+    def finish(self, status: Optional[str] = None) -> dict:
+        """
+        Log the summary row for the whole run
+
+        Args:
+            status: Overrides the status derived from the sources
+
+        Returns:
+            The summary row
+        """
+        row = {
+            "run_id": self.run_id,
+            "kind": "run",
+            "trigger": self.trigger,
+            "source": None,
+            "status": status or self._overall_status(),
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now().isoformat(),
+            "duration_ms": round((time.perf_counter() - self._start) * 1000),
+            "errors": [e for s in self.sources for e in s["errors"]][:20],
+        }
+        for name in PHASES:
+            row[f"{name}_ms"] = sum(s[f"{name}_ms"] for s in self.sources)
+        for key in ("http_requests", "http_bytes"):
+            row[key] = sum(s[key] for s in self.sources)
+        for key in COUNT_KEYS:
+            row[f"rows_{key}"] = sum(s[f"rows_{key}"] for s in self.sources)
+
+        db.insert_scan_logs([row])
+        return row
+
+    def _overall_status(self) -> str:
+        statuses = {s["status"] for s in self.sources}
+        if not statuses or statuses == {"success"}:
+            return "success"
+        if statuses == {"error"}:
+            return "error"
+        return "warning"
+
+    def _row(self, kind: str, started_at: datetime, seconds: float,
+             trace: ScanTrace, result: dict) -> dict:
+        row = {
+            "run_id": self.run_id,
+            "kind": kind,
+            "trigger": self.trigger,
+            "source": trace.source,
+            "status": result.get("status", "success"),
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now().isoformat(),
+            "duration_ms": round(seconds * 1000),
+            "http_requests": trace.http_requests,
+            "http_bytes": trace.http_bytes,
+            "errors": list(trace.errors),
+        }
+        for name in PHASES:
+            row[f"{name}_ms"] = round(trace.phases.get(name, 0.0) * 1000)
+        for key, value in _row_counts(result).items():
+            row[f"rows_{key}"] = value
+        # What the adaptive scheduler learns from (scheduler/adaptive.py)
+        row["change_rate"] = change_rate(row)
+        return row
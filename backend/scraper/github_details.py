@@ -0,0 +1,195 @@
+"""
+GitHub Repository Details
+Fills in what the trending page doesn't show (topics, license, last push,
+forks, homepage, owner avatar) for a whole batch of repos with one GraphQL
+query: each repo is an aliased `repository(owner:, name:)` field
+
+Results are cached per repo for GITHUB_DETAILS_CACHE_TTL, so repos that stay
+on the trending page across scans aren't looked up again until they expire.
+Without GITHUB_TOKEN (GitHub's GraphQL API needs one) repos pass through as
+scraped.
+
+Configuration (environment):
+    GITHUB_TOKEN: token for the GraphQL API; no token, no details
+    GITHUB_GRAPHQL_URL: endpoint (default: https://api.github.com/graphql)
+    GITHUB_DETAILS_BATCH: repos per query (default: 50)
+    GITHUB_DETAILS_CACHE_TTL: seconds a repo's details are reused (default: 21600)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from monitoring.scan_trace import record_error
+from scraper import http_client
+
+logger = logging.getLogger(__name__)
+
+# Repos whose details are kept, oldest evicted first
+CACHE_SIZE = 5000
+
+REPO_FIELDS = """
+fragment RepoDetails on Repository {
+  stargazerCount
+  forkCount
+  pushedAt
+  homepageUrl
+  licenseInfo { spdxId name }
+  owner { avatarUrl }
+  repositoryTopics(first: 10) { nodes { topic { name } } }
+}
+"""
+
+
+def _owner_and_name(url: str) -> Optional[Tuple[str, str]]:
+    """
+    ("owner", "repo") from https://github.com/owner/repo, or None
+    """
+    parts = url.split("github.com/", 1)[-1].strip("/").split("/")
+    if len(parts) < 2 or not parts[0] or not parts[1]:
+        return None
+    return parts[0], parts[1]
+
+
+def build_query(repos: List[Tuple[str, str]]) -> Tuple[str, dict]:
+    """
+    One query for every repo, aliased r0, r1, ...
+
+    Owners and names go in as variables, never into the query text
+
+    Returns:
+        (query, variables)
+    """
+    params = []
+    fields = []
+    variables = {}
+    for i, (owner, name) in enumerate(repos):
+        params.append(f"$o{i}: String!, $n{i}: String!")
+        fields.append(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoDetails }}")
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+    query = f"query({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}\n" + REPO_FIELDS
+    return query, variables
+
+
+def _details(node: dict) -> dict:
+    """
+    Record fields from one repository node
+    """
+    license_info = node.get("licenseInfo") or {}
+    topics = (node.get("repositoryTopics") or {}).get("nodes") or []
+    return {
+        "stars": node.get("stargazerCount"),
+        "forks": node.get("forkCount"),
+        "pushed_at": node.get("pushedAt"),
+        "homepage": node.get("homepageUrl") or None,
+        "license": license_info.get("spdxId") or license_info.get("name"),
+        "logo_url": (node.get("owner") or {}).get("avatarUrl"),
+        "topics": [t["topic"]["name"] for t in topics if t.get("topic")],
+    }
+
+
+class GitHubDetails:
+    """
+    Batched, cached repo details from GitHub's GraphQL API
+    """
+
+    def __init__(self):
+        self.token = os.getenv("GITHUB_TOKEN")
+        self.url = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+        self.batch_size = int(os.getenv("GITHUB_DETAILS_BATCH", 50))
+        self.cache_ttl = float(os.getenv("GITHUB_DETAILS_CACHE_TTL", 21600))
+        # url -> (fetched at, details); None details = repo not found
+        self._cache: "OrderedDict[str, Tuple[float, Optional[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def enrich(self, repos: List[dict]) -> List[dict]:
+        """
+        Add details to scraped repos (a batch stage of the ingest pipeline)
+
+        Repos are looked up in one query per GITHUB_DETAILS_BATCH uncached
+        repos. A failed lookup leaves its repos as scraped - they are still
+        stored, just without the extra fields.
+
+        Args:
+            repos: Scraped repo records with a github.com url
+
+        Returns:
+            The same records, with stars, forks, pushed_at, homepage,
+            license, logo_url and topics where found
+        """
+        if not self.enabled or not repos:
+            return repos
+
+        missing = [repo["url"] for repo in repos if self._cached(repo["url"]) is None]
+        missing = [url for url in dict.fromkeys(missing) if _owner_and_name(url)]
+        for start in range(0, len(missing), self.batch_size):
+            self._fetch(missing[start:start + self.batch_size])
+
+        for repo in repos:
+            cached = self._cached(repo["url"])
+            if cached and cached[1]:
+                # Scraped values win only where GitHub gave nothing
+                repo.update({key: value for key, value in cached[1].items() if value is not None})
+        return repos
+
+    def _cached(self, url: str) -> Optional[Tuple[float, Optional[dict]]]:
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.cache_ttl:
+                del self._cache[url]
+                return None
+            return entry
+
+    def _store(self, url: str, details: Optional[dict]):
+        with self._lock:
+            self._cache[url] = (time.monotonic(), details)
+            self._cache.move_to_end(url)
+            while len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _fetch(self, urls: List[str]):
+        query, variables = build_query([_owner_and_name(url) for url in urls])
+        try:
+            # A query only reads, so it is safe to retry like a GET
+            response = http_client.post(
+                self.url, json={"query": query, "variables": variables},
+                headers={"Authorization": f"bearer {self.token}"},
+                timeout=15, idempotent=True
+            )
+            response.raise_for_status()
+            payload = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"❌ GitHub details lookup failed for {len(urls)} repos: {str(e)}")
+            record_error(f"github details: {str(e)}")
+            return
+
+        data = payload.get("data") or {}
+        if not data and payload.get("errors"):
+            message = payload["errors"][0].get("message", "unknown error")
+            logger.error(f"❌ GitHub details query rejected: {message}")
+            record_error(f"github details: {message}")
+            return
+
+        # A repo that was renamed or deleted comes back null (with a NOT_FOUND
+        # error next to the other repos' data) - remember that too
+        found = 0
+        for i, url in enumerate(urls):
+            node = data.get(f"r{i}")
+            self._store(url, _details(node) if node else None)
+            found += node is not None
+        logger.info(f"✅ GitHub details for {found}/{len(urls)} repos in one query")
+
+
+github_details = GitHubDetails()
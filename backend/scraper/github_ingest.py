@@ -8,14 +8,37 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scraper.github_scraper import github_scraper
-from database.connection import db
+from scraper.github_details import github_details
 from database.models import AITool
+from scraper.refresh import stream_tools
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _build_tool(repo: dict) -> AITool:
+    # Analyzer fields (summary, use_cases, category, hype_score) are present
+    # unless enrichment is switched off; topics and logo_url come from the
+    # GitHub details lookup when GITHUB_TOKEN is set
+    tags = [repo.get("language", "python"), "ai", "github"]
+    tags += [topic for topic in repo.get("topics", []) if topic not in tags]
+    return AITool(
+        name=repo["name"],
+        description=repo.get("description", "AI repository from GitHub"),
+        url=repo["url"],
+        source="github",
+        summary=repo.get("summary"),
+        use_cases=repo.get("use_cases"),
+        category=repo.get("category", "AI"),
+        pricing="free",  # Open source repos are free
+        hype_score=repo.get("hype_score", min(100, 50 + min(repo.get("today_stars", 0), 50))),  # Base 50 + today's stars
+        github_stars=repo.get("stars", 0),
+        tags=tags[:10],
+        logo_url=repo.get("logo_url")
+    )
+
+
 def ingest_github():
     """
     Ingest GitHub trending AI repositories into the database
@@ -28,73 +51,33 @@ def ingest_github():
     logger.info("Starting GitHub ingestion")
     
     try:
-        # STEP 1: Run the scraper (Python repos with AI filter)
-        repos = github_scraper.scrape_trending_ai_repos(language="python")
-        
-        # Log raw count BEFORE processing
-        logger.info(f"GitHub Scraping returned {len(repos)} repos")
-        
-        # STEP 2: Track stats
-        stats = {
-            "scraped": len(repos),
-            "inserted": 0,
-            "skipped": 0,
-            "failed": 0
-        }
-        
-        # STEP 3: Ingest each repo
-        for repo in repos:
-            try:
-                # Prevent duplicates by URL
-                existing = db.client.table("ai_tools") \
-                    .select("id") \
-                    .eq("url", repo["url"]) \
-                    .execute()
-                
-                if existing.data:
-                    stats["skipped"] += 1
-                    logger.debug(f"Skipped duplicate repo: {repo['name']}")
-                    continue
-                
-                # Create AITool model
-                ai_tool = AITool(
-                    name=repo["name"],
-                    description=repo.get("description", "AI repository from GitHub"),
-                    url=repo["url"],
-                    source="github",
-                    category="AI",
-                    pricing="free",  # Open source repos are free
-                    hype_score=min(100, 50 + min(repo.get("today_stars", 0), 50)),  # Base 50 + today's stars
-                    github_stars=repo.get("stars", 0),
-                    tags=[repo.get("language", "python"), "ai", "github"]
-                )
-                
-                # Insert to database (only count if successful)
-                result = db.insert_tool(ai_tool)
-                if result:
-                    stats["inserted"] += 1
-                    logger.info(f"Inserted GitHub repo: {ai_tool.name} | Stars: {repo.get('stars', 0)} | Today: {repo.get('today_stars', 0)}")
-            
-            except Exception as e:
-                stats["failed"] += 1
-                logger.error(f"Failed to insert repo {repo.get('name', 'Unknown')}: {str(e)}")
-                continue
+        # Scrape, build and store as one pipeline: each repo is written while
+        # the scraper is still on the next ones. Repo details (topics,
+        # license, forks...) are fetched for the whole batch in one query
+        stats = stream_tools(
+            "github",
+            github_scraper.iter_trending_ai_repos(language="python"),
+            _build_tool,
+            details=github_details.enrich if github_details.enabled else None
+        )
         
-        # STEP 4: Log final summary
+        # Log final summary
         summary = f"""
 GitHub ingest complete!
    Total Scraped: {stats['scraped']}
    Total Inserted: {stats['inserted']}
-   Total Skipped (duplicates): {stats['skipped']}
+   Total Updated (metrics changed): {stats['updated']}
+   Total Skipped (unchanged): {stats['skipped']}
    Total Failed: {stats['failed']}
         """
         logger.info(summary)
         
         return {
-            "status": "success" if stats["inserted"] > 0 or stats["scraped"] == 0 else "warning",
+            "status": "success" if stats["inserted"] + stats["updated"] > 0 or stats["scraped"] == 0 else "warning",
             "repos": stats,
             "total_scraped": stats["scraped"],
-            "total_inserted": stats["inserted"]
+            "total_inserted": stats["inserted"],
+            "total_updated": stats["updated"]
         }
     
     except Exception as e:
@@ -102,9 +85,10 @@ GitHub ingest complete!
         return {
             "status": "error",
             "error": str(e),
-            "repos": {"scraped": 0, "inserted": 0, "skipped": 0, "failed": 0},
+            "repos": {"scraped": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0},
             "total_scraped": 0,
-            "total_inserted": 0
+            "total_inserted": 0,
+            "total_updated": 0
         }
 
 
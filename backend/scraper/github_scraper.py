@@ -3,11 +3,11 @@ GitHub Trending Scraper
 Finds trending AI repositories on GitHub
 """
 
-import requests
+from scraper import http_client
+from scraper.parse_pool import parse_pool
 from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import Dict, Iterator, List
 import logging
-import time
 import os
 
 logging.basicConfig(level=logging.INFO)
@@ -35,6 +35,18 @@ class GitHubScraper:
         Returns:
             List of trending repositories with their data
         """
+        return list(self.iter_trending_ai_repos(language))
+    
+    def iter_trending_ai_repos(self, language: str = "python") -> Iterator[Dict]:
+        """
+        Scrape GitHub trending repos, yielding each AI repo as soon as it is parsed
+        
+        Args:
+            language: Programming language filter (default: python)
+        
+        Yields:
+            Trending repositories with their data
+        """
         logger.info(f"🔍 Scraping GitHub Trending ({language})...")
         
         try:
@@ -42,40 +54,26 @@ class GitHubScraper:
             url = f"{self.base_url}/{language}?since=daily"
             
             # Make request
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = http_client.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find all repository cards
-            repos = []
-            repo_articles = soup.find_all('article', class_='Box-row')
+            # Parse HTML (in a parse worker, off this thread)
+            repos = parse_pool.run(parse_trending_page, response.content)
             
-            logger.info(f"Found {len(repo_articles)} trending repos")
+            found = 0
+            logger.info(f"Found {len(repos)} trending repos")
             
-            for article in repo_articles[:20]:  # Get top 20
-                try:
-                    repo_data = self._parse_repo_card(article)
-                    
-                    # Filter for AI-related repos
-                    if self._is_ai_related(repo_data):
-                        repos.append(repo_data)
-                        logger.info(f"✅ Found AI repo: {repo_data['name']}")
-                
-                except Exception as e:
-                    logger.error(f"Error parsing repo: {str(e)}")
-                    continue
-                
-                # Be polite - small delay between processing
-                time.sleep(0.5)
+            for repo_data in repos:
+                # Filter for AI-related repos
+                if self._is_ai_related(repo_data):
+                    found += 1
+                    logger.info(f"✅ Found AI repo: {repo_data['name']}")
+                    yield repo_data
             
-            logger.info(f"✅ Found {len(repos)} AI-related repos")
-            return repos
+            logger.info(f"✅ Found {found} AI-related repos")
         
         except Exception as e:
             logger.error(f"❌ Error scraping GitHub: {str(e)}")
-            return []
     
     def _parse_repo_card(self, article) -> Dict:
         """
@@ -168,4 +166,24 @@ class GitHubScraper:
         return any(keyword in text for keyword in ai_keywords)
 
 # Create scraper instance
-github_scraper = GitHubScraper()
\ No newline at end of file
+github_scraper = GitHubScraper()
+
+
+def parse_trending_page(html: bytes) -> List[Dict]:
+    """
+    Repo cards of a trending page as dicts (runs in the parse pool)
+    
+    Args:
+        html: Raw page
+    
+    Returns:
+        The top 20 repos, AI-related or not
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    repos = []
+    for article in soup.find_all('article', class_='Box-row')[:20]:  # Get top 20
+        try:
+            repos.append(github_scraper._parse_repo_card(article))
+        except Exception as e:
+            logger.error(f"Error parsing repo: {str(e)}")
+    return repos
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Shared HTTP Client
+All outgoing requests from scrapers and the analyzer go through here, so
+upstream latency, status codes and bytes are recorded per host (and counted
+towards the scan log of the source being ingested)
+
+Requests are also made resilient here (see scraper/resilience.py):
+- Idempotent requests (GET/HEAD, or idempotent=True) are retried after
+  connection errors, timeouts, 429 and 5xx, with exponential backoff and jitter
+- A host that keeps failing trips its circuit breaker and is failed fast
+- Hedged requests (hosts in UPSTREAM_HEDGE_HOSTS, or hedge=True) get a backup
+  copy if no answer came within UPSTREAM_HEDGE_AFTER; the first answer wins
+- The current deadline caps every timeout, and no request starts after it
+
+Configuration (environment):
+    UPSTREAM_RETRIES: retries of an idempotent request (default: 2)
+    UPSTREAM_HEDGE_HOSTS: comma separated hosts whose idempotent requests are
+        hedged (default: huggingface.co,api-inference.huggingface.co)
+    UPSTREAM_HEDGE_AFTER: seconds to wait before sending the backup (default: 2)
+"""
+
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import Iterator, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from monitoring.metrics import (
+    UPSTREAM_BYTES, UPSTREAM_FAST_FAILS, UPSTREAM_HEDGES, UPSTREAM_LATENCY,
+    UPSTREAM_REQUESTS, UPSTREAM_RETRIES,
+)
+from monitoring.scan_trace import record_http
+from scraper.resilience import (
+    BACKOFF_MAX, CircuitOpenError, DeadlineExceeded, backoff, breaker, remaining,
+)
+
+RETRIES = int(os.getenv("UPSTREAM_RETRIES", 2))
+HEDGE_HOSTS = frozenset(
+    h.strip() for h in os.getenv(
+        "UPSTREAM_HEDGE_HOSTS", "huggingface.co,api-inference.huggingface.co"
+    ).split(",") if h.strip()
+)
+HEDGE_AFTER = float(os.getenv("UPSTREAM_HEDGE_AFTER", 2))
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS")
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# One pooled session so repeated calls to the same host reuse connections
+_session = requests.Session()
+
+# Runs both copies of a hedged request
+_hedge_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="upstream-hedge")
+
+
+def request(method: str, url: str, idempotent: Optional[bool] = None,
+            hedge: Optional[bool] = None, **kwargs) -> requests.Response:
+    """
+    Make an HTTP request and record its metrics
+
+    Args:
+        method: HTTP method ("GET", "POST", ...)
+        url: Full URL
+        idempotent: Safe to send more than once (default: GET/HEAD/OPTIONS)
+        hedge: Send a backup copy if slow (default: idempotent requests to UPSTREAM_HEDGE_HOSTS)
+        **kwargs: Passed through to requests (headers, params, json, timeout...)
+
+    Returns:
+        The requests.Response (the last one, if every retry got a retryable status)
+
+    Raises:
+        DeadlineExceeded: the current deadline passed before the request could start
+        CircuitOpenError: the host's circuit breaker is open
+    """
+    method = method.upper()
+    host = urlparse(url).hostname or "unknown"
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    if hedge is None:
+        hedge = idempotent and host in HEDGE_HOSTS and not kwargs.get("stream")
+    circuit = breaker(host)
+    attempts = 1 + (RETRIES if idempotent else 0)
+
+    for attempt in range(1, attempts + 1):
+        left = remaining()
+        if left is not None and left <= 0:
+            UPSTREAM_FAST_FAILS.inc(host=host, reason="deadline")
+            raise DeadlineExceeded(f"deadline passed before {method} {url}")
+        try:
+            circuit.before_request()
+        except CircuitOpenError:
+            UPSTREAM_FAST_FAILS.inc(host=host, reason="circuit_open")
+            raise
+
+        error = None
+        response = None
+        settled = False
+        try:
+            response = _hedged(method, url, host, kwargs) if hedge else _send(method, url, host, kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            circuit.record_failure()
+            settled = True
+            error = e
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                circuit.record_success()
+                settled = True
+                return response
+            # 429 is the host pacing us, not the host failing
+            if response.status_code >= 500:
+                circuit.record_failure()
+                settled = True
+        finally:
+            # A 429 or an unexpected error says nothing about the host, but a
+            # half-open breaker's trial must still close or reopen it
+            if not settled:
+                circuit.record_inconclusive()
+
+        delay = backoff(attempt)
+        if response is not None and response.status_code == 429:
+            delay = max(delay, _retry_after(response))
+        left = remaining()
+        if attempt == attempts or (left is not None and delay >= left):
+            if error is not None:
+                raise error
+            return response
+
+        UPSTREAM_RETRIES.inc(host=host)
+        time.sleep(delay)
+
+
+def _send(method: str, url: str, host: str, kwargs: dict) -> requests.Response:
+    left = remaining()
+    if left is not None:
+        # Never wait on a response past the deadline
+        timeout = kwargs.get("timeout")
+        if isinstance(timeout, tuple):
+            timeout = tuple(min(t, left) if t is not None else left for t in timeout)
+        else:
+            timeout = left if timeout is None else min(timeout, left)
+        kwargs = dict(kwargs, timeout=timeout)
+
+    status = "error"
+    nbytes = 0
+    start = time.perf_counter()
+    try:
+        response = _session.request(method, url, **kwargs)
+        status = str(response.status_code)
+        if not kwargs.get("stream"):
+            nbytes = len(response.content)
+        return response
+    finally:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, host=host, method=method)
+        UPSTREAM_REQUESTS.inc(host=host, method=method, status=status)
+        UPSTREAM_BYTES.inc(nbytes, host=host)
+        record_http(nbytes)
+
+
+def _hedged(method: str, url: str, host: str, kwargs: dict) -> requests.Response:
+    """
+    Send the request; if it hasn't answered within HEDGE_AFTER, send it again
+    and return whichever copy answers first
+    """
+    def submit():
+        # Copies run on pool threads: carry the scan trace and deadline along
+        return _hedge_pool.submit(contextvars.copy_context().run, _send, method, url, host, kwargs)
+
+    primary = submit()
+    left = remaining()
+    if wait([primary], timeout=HEDGE_AFTER).done or (left is not None and left <= HEDGE_AFTER):
+        return primary.result()
+
+    backup = submit()
+    futures = [primary, backup]
+    for future in as_completed(futures):
+        if future.exception() is None:
+            UPSTREAM_HEDGES.inc(host=host, winner="primary" if future is primary else "backup")
+            return future.result()
+    # Both copies failed: report the original's error
+    return primary.result()
+
+
+def _retry_after(response: requests.Response) -> float:
+    try:
+        return min(BACKOFF_MAX, float(response.headers.get("Retry-After", 0)))
+    except ValueError:
+        return 0.0
+
+
+def iter_body(response: requests.Response, chunk_size: int = 65536) -> Iterator[bytes]:
+    """
+    Read the body of a stream=True response chunk by chunk
+
+    Its bytes are counted as they arrive, as a buffered response's are when
+    it is received
+    """
+    host = urlparse(response.url).hostname or "unknown"
+    for chunk in response.iter_content(chunk_size):
+        UPSTREAM_BYTES.inc(len(chunk), host=host)
+        record_http(len(chunk), requests=0)
+        yield chunk
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
@@ -8,14 +8,48 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scraper.huggingface_scraper import huggingface_scraper
-from database.connection import db
 from database.models import AITool
+from scraper.refresh import stream_tools
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _build_model_tool(model: dict) -> AITool:
+    # Analyzer fields (summary, use_cases, category, hype_score) are present
+    # unless enrichment is switched off
+    return AITool(
+        name=model["name"],
+        description=model.get("description", "AI model from Hugging Face"),
+        url=model["url"],
+        source="huggingface",
+        summary=model.get("summary"),
+        use_cases=model.get("use_cases"),
+        category=model.get("category", model.get("pipeline_tag", "AI")),
+        pricing="free",  # Most HF models are free
+        hype_score=model.get("hype_score", min(100, 50 + model.get("likes", 0))),  # Base 50 + likes
+        tags=model.get("tags", [])
+    )
+
+
+def _build_space_tool(space: dict) -> AITool:
+    # Analyzer fields (summary, use_cases, category, hype_score) are present
+    # unless enrichment is switched off
+    return AITool(
+        name=space["name"],
+        description=space.get("description", "AI space from Hugging Face"),
+        url=space["url"],
+        source="huggingface-space",
+        summary=space.get("summary"),
+        use_cases=space.get("use_cases"),
+        category="Demo App",  # Spaces are listed as demos whatever they do
+        pricing="free",  # Most HF spaces are free
+        hype_score=space.get("hype_score", min(100, 50 + space.get("likes", 0))),
+        tags=space.get("tags", [])
+    )
+
+
 def ingest_huggingface():
     """
     Ingest Hugging Face models and spaces into the database
@@ -28,115 +62,42 @@ def ingest_huggingface():
     logger.info("Starting Hugging Face ingestion")
     
     try:
-        # STEP 1: Run the scrapers
-        models = huggingface_scraper.scrape_trending_models(limit=20)
-        spaces = huggingface_scraper.scrape_trending_spaces(limit=10)
-        
-        # Log raw counts BEFORE processing
-        logger.info(f"HF Scraping returned {len(models)} models and {len(spaces)} spaces")
-        
-        # STEP 2: Track stats
+        # Scrape, build and store each kind as a pipeline: tools are written
+        # while the rest of the listing is still being parsed
         stats = {
-            "models": {"scraped": len(models), "inserted": 0, "skipped": 0, "failed": 0},
-            "spaces": {"scraped": len(spaces), "inserted": 0, "skipped": 0, "failed": 0}
+            "models": stream_tools(
+                "huggingface", huggingface_scraper.iter_trending_models(limit=20), _build_model_tool
+            ),
+            "spaces": stream_tools(
+                "huggingface-space", huggingface_scraper.iter_trending_spaces(limit=10), _build_space_tool
+            )
         }
         
-        # STEP 3: Ingest models
-        for model in models:
-            try:
-                # Prevent duplicates by URL
-                existing = db.client.table("ai_tools") \
-                    .select("id") \
-                    .eq("url", model["url"]) \
-                    .execute()
-                
-                if existing.data:
-                    stats["models"]["skipped"] += 1
-                    logger.debug(f"Skipped duplicate model: {model['name']}")
-                    continue
-                
-                # Create AITool model
-                ai_tool = AITool(
-                    name=model["name"],
-                    description=model.get("description", "AI model from Hugging Face"),
-                    url=model["url"],
-                    source="huggingface",
-                    category=model.get("pipeline_tag", "AI"),
-                    pricing="free",  # Most HF models are free
-                    hype_score=min(100, 50 + model.get("likes", 0)),  # Base 50 + likes
-                    tags=model.get("tags", [])
-                )
-                
-                # Insert to database (only count if successful)
-                result = db.insert_tool(ai_tool)
-                if result:
-                    stats["models"]["inserted"] += 1
-                    logger.info(f"✅ Inserted HF model: {ai_tool.name} | Likes: {model.get('likes', 0)}")
-            
-            except Exception as e:
-                stats["models"]["failed"] += 1
-                logger.error(f"❌ Failed to insert model {model.get('name', 'Unknown')}: {str(e)}")
-                continue
-        
-        # STEP 4: Ingest spaces
-        for space in spaces:
-            try:
-                # Prevent duplicates by URL
-                existing = db.client.table("ai_tools") \
-                    .select("id") \
-                    .eq("url", space["url"]) \
-                    .execute()
-                
-                if existing.data:
-                    stats["spaces"]["skipped"] += 1
-                    logger.debug(f"⏭️ Skipped duplicate space: {space['name']}")
-                    continue
-                
-                # Create AITool model
-                ai_tool = AITool(
-                    name=space["name"],
-                    description=space.get("description", "AI space from Hugging Face"),
-                    url=space["url"],
-                    source="huggingface-space",
-                    category="Demo App",
-                    pricing="free",  # Most HF spaces are free
-                    hype_score=min(100, 50 + space.get("likes", 0)),
-                    tags=space.get("tags", [])
-                )
-                
-                # Insert to database (only count if successful)
-                result = db.insert_tool(ai_tool)
-                if result:
-                    stats["spaces"]["inserted"] += 1
-                    logger.info(f"✅ Inserted HF space: {ai_tool.name} | SDK: {space.get('sdk', 'unknown')}")
-            
-            except Exception as e:
-                stats["spaces"]["failed"] += 1
-                logger.error(f"❌ Failed to insert space {space.get('name', 'Unknown')}: {str(e)}")
-                continue
-        
-        # STEP 5: Log final summary
+        # Log final summary
         total_inserted = stats["models"]["inserted"] + stats["spaces"]["inserted"]
+        total_updated = stats["models"]["updated"] + stats["spaces"]["updated"]
         total_scraped = stats["models"]["scraped"] + stats["spaces"]["scraped"]
         
         summary = f"""
 🎉 Hugging Face ingest complete!
    📊 Total Scraped: {total_scraped}
    ✅ Total Inserted: {total_inserted}
-   ⏭️ Total Skipped (duplicates): {stats["models"]["skipped"] + stats["spaces"]["skipped"]}
+   🔄 Total Updated (metrics changed): {total_updated}
+   ⏭️ Total Skipped (unchanged): {stats["models"]["skipped"] + stats["spaces"]["skipped"]}
    ❌ Total Failed: {stats["models"]["failed"] + stats["spaces"]["failed"]}
    
-   Models: Inserted={stats["models"]["inserted"]}, Skipped={stats["models"]["skipped"]}
-   Spaces: Inserted={stats["spaces"]["inserted"]}, Skipped={stats["spaces"]["skipped"]}
+   Models: Inserted={stats["models"]["inserted"]}, Updated={stats["models"]["updated"]}, Skipped={stats["models"]["skipped"]}
+   Spaces: Inserted={stats["spaces"]["inserted"]}, Updated={stats["spaces"]["updated"]}, Skipped={stats["spaces"]["skipped"]}
         """
         logger.info(summary)
         
         return {
-            "status": "success" if total_inserted > 0 or total_scraped == 0 else "warning",
+            "status": "success" if total_inserted + total_updated > 0 or total_scraped == 0 else "warning",
             "models": stats["models"],
             "spaces": stats["spaces"],
             "total_scraped": total_scraped,
-            "total_inserted": total_inserted
+            "total_inserted": total_inserted,
+            "total_updated": total_updated
         }
     
     except Exception as e:
@@ -144,8 +105,8 @@ def ingest_huggingface():
         return {
             "status": "error",
             "error": str(e),
-            "models": {"scraped": 0, "inserted": 0, "skipped": 0, "failed": 0},
-            "spaces": {"scraped": 0, "inserted": 0, "skipped": 0, "failed": 0}
+            "models": {"scraped": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0},
+            "spaces": {"scraped": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0}
         }
 
 
@@ -1,15 +1,52 @@
 """
 Hugging Face Scraper
 Finds new AI models and spaces
+
+Listings (`full=true`, so every entity carries its card data and file list)
+are decoded as they stream in, one entity at a time, and each entity is cut
+down to the fields _parse_model/_parse_space read before the next is
+decoded. Entities are ranked by likes in a heap holding only the K most
+liked - K being the listing's limit unless HF_TOP_K says otherwise - so
+memory depends on K rather than on the size of the response.
+
+Configuration (environment):
+    HF_STREAM_DECODE: decode listings incrementally, "false" to read each
+        listing whole with response.json() (default: true)
+    HF_TOP_K: keep only the K most liked entities of a listing, 0 for all
+        of them (default: the limit the listing was requested with)
 """
 
-import requests
-from typing import List, Dict
+from scraper import http_client
+from scraper.json_stream import iter_array
+from typing import Dict, Iterator, List, Tuple
+import heapq
 import logging
+import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Entity fields _parse_model/_parse_space read; the rest of a full=true
+# entity (siblings, config, card data...) is dropped as soon as it's decoded
+MODEL_FIELDS = ("id", "likes", "downloads", "tags", "pipeline_tag", "description")
+SPACE_FIELDS = ("id", "likes", "sdk", "tags", "description")
+
+
+def _likes(entity: dict) -> int:
+    likes = entity.get('likes')
+    return likes if isinstance(likes, (int, float)) else 0
+
+
+def _project(entity: dict, fields: Tuple[str, ...]) -> dict:
+    """
+    Just `fields` of an entity, plus its card description
+    """
+    projected = {field: entity[field] for field in fields if field in entity}
+    card = entity.get('cardData')
+    if isinstance(card, dict) and card.get('description'):
+        projected['cardData'] = {'description': card['description']}
+    return projected
+
 class HuggingFaceScraper:
     """
     Scrapes Hugging Face for trending AI models
@@ -19,6 +56,10 @@ class HuggingFaceScraper:
     def __init__(self):
         self.api_base = "https://huggingface.co/api"
         self.site_base = "https://huggingface.co"
+        self.stream_decode = os.getenv("HF_STREAM_DECODE", "true").lower() == "true"
+        # None: keep as many as the listing's limit
+        top_k = os.getenv("HF_TOP_K")
+        self.top_k = int(top_k) if top_k else None
     
     def scrape_trending_models(self, limit: int = 20) -> List[Dict]:
         """
@@ -30,6 +71,18 @@ class HuggingFaceScraper:
         Returns:
             List of model data sorted by likes (trending)
         """
+        return list(self.iter_trending_models(limit))
+    
+    def iter_trending_models(self, limit: int = 20) -> Iterator[Dict]:
+        """
+        Get trending AI models from Hugging Face, yielding each as it is parsed
+        
+        Args:
+            limit: Number of models to fetch
+        
+        Yields:
+            Model data, most liked first
+        """
         logger.info("🔍 Scraping Hugging Face models...")
         
         try:
@@ -43,40 +96,30 @@ class HuggingFaceScraper:
                 'full': 'true'  # Get full model info
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            models_data = response.json()
+            # Manually rank by likes to get trending models
+            models_data, raw_count = self._most_liked(url, params, MODEL_FIELDS, limit)
             
             # Log raw count for debugging
-            logger.info(f"🧪 HuggingFace raw models count: {len(models_data)}")
-            
-            # Manually sort by likes to get trending models
-            models_data = sorted(
-                models_data,
-                key=lambda x: x.get('likes', 0),
-                reverse=True
-            )
+            logger.info(f"🧪 HuggingFace raw models count: {raw_count}")
             
             logger.info(f"🧪 HuggingFace sorted models (top 5 likes): {[m.get('likes', 0) for m in models_data[:5]]}")
             
-            models = []
+            found = 0
             for model in models_data:
                 try:
                     model_info = self._parse_model(model)
-                    models.append(model_info)
+                    found += 1
                     logger.info(f"✅ Found model: {model_info['name']}")
+                    yield model_info
                 
                 except Exception as e:
                     logger.error(f"Error parsing model: {str(e)}")
                     continue
             
-            logger.info(f"✅ Found {len(models)} trending models")
-            return models
+            logger.info(f"✅ Found {found} trending models")
         
         except Exception as e:
             logger.error(f"❌ Error scraping Hugging Face: {str(e)}")
-            return []
     
     def scrape_trending_spaces(self, limit: int = 10) -> List[Dict]:
         """
@@ -88,6 +131,18 @@ class HuggingFaceScraper:
         Returns:
             List of space data sorted by likes (trending)
         """
+        return list(self.iter_trending_spaces(limit))
+    
+    def iter_trending_spaces(self, limit: int = 10) -> Iterator[Dict]:
+        """
+        Get trending Spaces (demo apps) from Hugging Face, yielding each as it is parsed
+        
+        Args:
+            limit: Number of spaces to fetch
+        
+        Yields:
+            Space data, most liked first
+        """
         logger.info("🔍 Scraping Hugging Face Spaces...")
         
         try:
@@ -100,40 +155,73 @@ class HuggingFaceScraper:
                 'full': 'true'
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            spaces_data = response.json()
+            # Manually rank by likes to get trending spaces
+            spaces_data, raw_count = self._most_liked(url, params, SPACE_FIELDS, limit)
             
             # Log raw count for debugging
-            logger.info(f"🧪 HuggingFace raw spaces count: {len(spaces_data)}")
-            
-            # Manually sort by likes to get trending spaces
-            spaces_data = sorted(
-                spaces_data,
-                key=lambda x: x.get('likes', 0),
-                reverse=True
-            )
+            logger.info(f"🧪 HuggingFace raw spaces count: {raw_count}")
             
             logger.info(f"🧪 HuggingFace sorted spaces (top 5 likes): {[s.get('likes', 0) for s in spaces_data[:5]]}")
             
-            spaces = []
+            found = 0
             for space in spaces_data:
                 try:
                     space_info = self._parse_space(space)
-                    spaces.append(space_info)
+                    found += 1
                     logger.info(f"✅ Found space: {space_info['name']}")
+                    yield space_info
                 
                 except Exception as e:
                     logger.error(f"Error parsing space: {str(e)}")
                     continue
             
-            logger.info(f"✅ Found {len(spaces)} trending spaces")
-            return spaces
+            logger.info(f"✅ Found {found} trending spaces")
         
         except Exception as e:
             logger.error(f"❌ Error scraping Spaces: {str(e)}")
-            return []
+    
+    def _most_liked(self, url: str, params: dict, fields: Tuple[str, ...],
+                    limit: int) -> Tuple[List[dict], int]:
+        """
+        Fetch a listing and rank its entities by likes
+        
+        Args:
+            url: Listing endpoint
+            params: Query parameters
+            fields: Entity fields to keep
+            limit: Entities the listing was asked for, kept unless HF_TOP_K is set
+        
+        Returns:
+            (entities cut down to `fields`, most liked first - at most K of
+            them, 0 meaning all; number of entities in the listing)
+        """
+        top_k = limit if self.top_k is None else self.top_k
+        response = http_client.get(url, params=params, timeout=10, stream=self.stream_decode)
+        try:
+            response.raise_for_status()
+            if self.stream_decode:
+                entities = iter_array(http_client.iter_body(response))
+            else:
+                entities = response.json()
+            
+            # Min-heap on (likes, -position): the root is the entity to drop
+            # next, and on equal likes the later one goes, as a stable sort would
+            heap = []
+            count = 0
+            for count, entity in enumerate(entities, 1):
+                if not isinstance(entity, dict):
+                    continue
+                key = (_likes(entity), -count)
+                if top_k and len(heap) >= top_k:
+                    if key < heap[0][:2]:
+                        continue
+                    heapq.heapreplace(heap, (*key, _project(entity, fields)))
+                else:
+                    heapq.heappush(heap, (*key, _project(entity, fields)))
+        finally:
+            response.close()
+        
+        return [entry[2] for entry in sorted(heap, reverse=True)], count
     
     def _parse_model(self, model_data: dict) -> Dict:
         """
@@ -0,0 +1,116 @@
+"""
+Incremental JSON Decoding
+Decodes a JSON array from a byte stream one element at a time, so a large
+API listing never sits in memory whole - neither as bytes nor as Python
+objects. Only the element being decoded (and the chunk it arrived in) is
+held at any moment.
+
+Example:
+    response = http_client.get(url, stream=True)
+    for model in iter_array(http_client.iter_body(response)):
+        ...
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = " \t\n\r,]"
+
+
+class _Reader:
+    """
+    A text buffer over the byte chunks, refilled as the decoder needs more
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        # Chunks can end mid character
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Append the next chunk; False once the stream is exhausted
+        """
+        if self.eof:
+            return False
+        # Drop what has been decoded already
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self.buf += text
+                return True
+        self.buf += self._utf8.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """
+        The next non-whitespace character, left unconsumed
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                raise ValueError("JSON stream ended early")
+
+    def value(self) -> Any:
+        """
+        Decode the next complete JSON value
+        """
+        self.peek()
+        while True:
+            available = len(self.buf) - self.pos
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number cut off at a chunk edge ("12", "1.", "1e") decodes
+                # too: only trust a value an element delimiter follows
+                if self.eof or (end < len(self.buf) and self.buf[end] in _DELIMITERS):
+                    self.pos = end
+                    return value
+            # Incomplete: read until there's twice as much before trying
+            # again, so a large element isn't rescanned once per chunk
+            while len(self.buf) - self.pos < 2 * available and self.fill():
+                pass
+
+
+def iter_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array as they are decoded
+
+    Args:
+        chunks: The UTF-8 encoded array, in chunks of any size
+
+    Yields:
+        Each element, in order
+
+    Raises:
+        ValueError: the stream isn't a JSON array, or ends inside one
+    """
+    reader = _Reader(chunks)
+    if reader.peek() != "[":
+        raise ValueError("expected a JSON array")
+    reader.pos += 1
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"expected ',' or ']' in JSON array, got {separator!r}")
@@ -0,0 +1,121 @@
+"""
+HTML Parse Pool
+Runs BeautifulSoup parsing in worker processes, so parsing scraped pages
+neither holds the GIL the fetching and API threads need nor caps a scan at
+one core
+
+A parse function takes the raw page bytes (plus plain arguments) and
+returns plain dicts; it must be a module-level function so workers can
+import it. The pool starts on first use and its workers stay up, already
+importing the scrapers and BeautifulSoup, for every later scan in the
+process.
+
+Example:
+    repos = parse_pool.run(parse_trending_page, response.content)
+
+Configuration (environment):
+    PARSE_WORKERS: worker processes, 0 to parse on the calling thread
+        (default: CPU count, at most 4)
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _warm():
+    """
+    Worker start-up: import the parsers once, before the first page arrives
+    """
+    from bs4 import BeautifulSoup
+
+    import scraper.github_scraper  # noqa: F401
+    import scraper.producthunt_scraper  # noqa: F401
+
+    BeautifulSoup("<p>warm</p>", "html.parser")
+
+
+def _warm_noop(_):
+    return None
+
+
+class ParsePool:
+    """
+    A lazily started, long-lived process pool for parse functions
+    """
+
+    def __init__(self):
+        self.workers = int(os.getenv("PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def run(self, fn: Callable, *args) -> Any:
+        """
+        Call fn(*args) in a worker and return its result
+
+        If the pool is off, or a worker died (the pool is then restarted for
+        the next call), the parse runs on the calling thread instead.
+        """
+        if self.workers <= 0:
+            return fn(*args)
+        try:
+            return self._get().submit(fn, *args).result()
+        except BrokenProcessPool:
+            logger.error("❌ Parse worker died, restarting the pool")
+            self._reset()
+            return fn(*args)
+
+    def map(self, fn: Callable, items: Iterable) -> List[Any]:
+        """
+        fn(item) for every item, spread over the workers, in input order
+        """
+        items = list(items)
+        if self.workers <= 0:
+            return [fn(item) for item in items]
+        try:
+            return list(self._get().map(fn, items))
+        except BrokenProcessPool:
+            logger.error("❌ Parse worker died, restarting the pool")
+            self._reset()
+            return [fn(item) for item in items]
+
+    def start(self):
+        """
+        Start every worker now rather than on the first parse
+        """
+        if self.workers > 0:
+            list(self._get().map(_warm_noop, range(self.workers)))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _get(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # forkserver: forking the threaded API process could copy a
+                # lock some other thread holds; workers start from a clean one
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context, initializer=_warm
+                )
+                logger.info(f"✅ Parse pool started ({self.workers} workers)")
+            return self._executor
+
+    def _reset(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+parse_pool = ParsePool()
@@ -0,0 +1,266 @@
+"""
+Ingest Pipeline
+Runs an ingest as stages in their own threads joined by bounded queues, so
+fetching, analysis and database writes overlap instead of taking turns
+
+Example:
+    pipeline = Pipeline("github")
+    pipeline.stage("analyze", build_tool)
+    pipeline.stage("dedup", deduper, batch_size=50)
+    pipeline.stage("insert", write_batch)
+    results = pipeline.run(github_scraper.iter_trending_ai_repos())
+
+The source iterable is timed as the "scrape" stage, and is no longer read
+once the current deadline (scraper/resilience.py) has passed. A run takes
+about as long as its slowest stage; a full queue blocks the stage feeding
+it, which caps memory at a few queues' worth of items.
+"""
+
+import contextvars
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+from monitoring.metrics import INGEST_STAGE_ITEMS, INGEST_STAGE_SECONDS
+from monitoring.scan_trace import current_trace, record_error
+from scraper.resilience import expired
+
+logger = logging.getLogger(__name__)
+
+# Items waiting between two stages
+QUEUE_SIZE = 100
+
+# A batch stage flushes a partial batch once its input has been idle this long
+BATCH_WAIT_SECONDS = 0.5
+
+_DONE = object()
+
+
+class StageStats:
+    """
+    What one stage did: items taken in and handed on, and time spent working
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, items_in: int, items_out: int, seconds: float, failed: int = 0):
+        with self._lock:
+            self.items_in += items_in
+            self.items_out += items_out
+            self.failed += failed
+            self.busy_seconds += seconds
+
+    @property
+    def per_second(self) -> float:
+        return self.items_in / self.busy_seconds if self.busy_seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "failed": self.failed,
+            "busy_ms": round(self.busy_seconds * 1000),
+            "per_second": round(self.per_second, 1),
+        }
+
+
+class _Stage:
+    def __init__(self, name: str, fn: Callable, workers: int, batch_size: Optional[int],
+                 phase: Optional[str]):
+        self.name = name
+        self.phase = phase or name
+        self.fn = fn
+        self.workers = workers
+        self.batch_size = batch_size
+        self.stats = StageStats(name)
+
+
+class Pipeline:
+    """
+    A source iterable followed by stages
+
+    A per-item stage's function takes one item and returns the item to pass
+    on, or None to drop it. A batch stage's function takes a list of up to
+    batch_size items and returns a list of items to pass on. Items that
+    raise are dropped and recorded as errors on the current scan.
+    """
+
+    def __init__(self, source: str, queue_size: int = QUEUE_SIZE):
+        self.source = source
+        self.queue_size = queue_size
+        self.scrape = StageStats("scrape")
+        self._stages: List[_Stage] = []
+
+    def stage(self, name: str, fn: Callable, workers: int = 1,
+              batch_size: Optional[int] = None, phase: Optional[str] = None) -> "Pipeline":
+        """
+        Append a stage
+
+        Args:
+            name: Stage name, also the scan log phase its time is billed to
+            fn: Per-item or batch function (see class docstring)
+            workers: Threads running fn side by side (output order is then not kept)
+            batch_size: Hand fn lists of up to this many items
+            phase: Scan log phase to bill instead of the stage name
+
+        Returns:
+            The pipeline, for chaining
+        """
+        self._stages.append(_Stage(name, fn, workers, batch_size, phase))
+        return self
+
+    @property
+    def stats(self) -> List[StageStats]:
+        return [self.scrape] + [stage.stats for stage in self._stages]
+
+    def run(self, items: Iterable) -> list:
+        """
+        Push every item from the source through all stages
+
+        Returns:
+            What the last stage passed on
+        """
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self._stages) + 1)]
+        results = []
+        start = time.perf_counter()
+
+        threads = [self._thread("scrape", self._produce, items, queues[0])]
+        for i, stage in enumerate(self._stages):
+            remaining = [stage.workers]
+            for n in range(stage.workers):
+                threads.append(self._thread(
+                    f"{stage.name}-{n}", self._consume, stage, queues[i], queues[i + 1], remaining
+                ))
+        for thread in threads:
+            thread.start()
+
+        # Drain the last queue here so the final stage never blocks
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                break
+            results.append(item)
+        for thread in threads:
+            thread.join()
+
+        self._report(time.perf_counter() - start)
+        return results
+
+    def _thread(self, name: str, target: Callable, *args) -> threading.Thread:
+        # Each thread gets its own copy of the caller's context, so phase()
+        # and record_error() still reach the scan being traced
+        context = contextvars.copy_context()
+        return threading.Thread(
+            target=context.run, args=(target, *args),
+            name=f"ingest-{self.source}-{name}", daemon=True
+        )
+
+    def _produce(self, items: Iterable, out: queue.Queue):
+        iterator = iter(items)
+        try:
+            while True:
+                if expired():
+                    # Out of time: what was scraped so far is still written
+                    logger.error(f"❌ {self.source} scrape stopped: deadline reached")
+                    record_error("scrape: deadline reached")
+                    break
+                began = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    # The scraper gave up part way: keep what it produced
+                    logger.error(f"❌ {self.source} scrape failed: {str(e)}")
+                    record_error(f"scrape: {str(e)}")
+                    break
+                finally:
+                    self._bill("scrape", self.scrape, time.perf_counter() - began)
+                self.scrape.add(1, 1, 0.0)
+                out.put(item)
+        finally:
+            out.put(_DONE)
+
+    def _consume(self, stage: _Stage, inbox: queue.Queue, out: queue.Queue, remaining: list):
+        try:
+            if stage.batch_size:
+                self._consume_batches(stage, inbox, out)
+            else:
+                while True:
+                    item = inbox.get()
+                    if item is _DONE:
+                        break
+                    self._call(stage, item, out, batch=False)
+        finally:
+            # Siblings need to see the end too; the last one out passes it on
+            inbox.put(_DONE)
+            with stage.stats._lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                out.put(_DONE)
+
+    def _consume_batches(self, stage: _Stage, inbox: queue.Queue, out: queue.Queue):
+        batch = []
+        while True:
+            try:
+                item = inbox.get(timeout=BATCH_WAIT_SECONDS if batch else None)
+            except queue.Empty:
+                # Upstream is slow: write what we have rather than wait for a full batch
+                self._call(stage, batch, out, batch=True)
+                batch = []
+                continue
+            if item is _DONE:
+                break
+            batch.append(item)
+            if len(batch) >= stage.batch_size:
+                self._call(stage, batch, out, batch=True)
+                batch = []
+        if batch:
+            self._call(stage, batch, out, batch=True)
+
+    def _call(self, stage: _Stage, item, out: queue.Queue, batch: bool):
+        count = len(item) if batch else 1
+        began = time.perf_counter()
+        try:
+            result = stage.fn(item)
+        except Exception as e:
+            self._bill(stage.phase, stage.stats, time.perf_counter() - began)
+            stage.stats.add(count, 0, 0.0, failed=count)
+            logger.error(f"❌ {self.source} {stage.name} failed on {count} item(s): {str(e)}")
+            record_error(f"{stage.name}: {str(e)}")
+            return
+        self._bill(stage.phase, stage.stats, time.perf_counter() - began)
+
+        passed = (result or []) if batch else ([] if result is None else [result])
+        stage.stats.add(count, len(passed), 0.0)
+        for value in passed:
+            out.put(value)
+
+    def _bill(self, name: str, stats: StageStats, seconds: float):
+        stats.add(0, 0, seconds)
+        trace = current_trace()
+        if trace is not None:
+            trace.add_phase(name, seconds)
+
+    def _report(self, wall_seconds: float):
+        for stats in self.stats:
+            INGEST_STAGE_ITEMS.inc(stats.items_in, source=self.source, stage=stats.name)
+            INGEST_STAGE_SECONDS.inc(stats.busy_seconds, source=self.source, stage=stats.name)
+        slowest = max(self.stats, key=lambda s: s.busy_seconds)
+        logger.info(
+            f"{self.source} pipeline: {wall_seconds:.2f}s wall, slowest stage {slowest.name} "
+            f"({slowest.busy_seconds:.2f}s busy) | "
+            + " | ".join(
+                f"{s.name}: {s.items_in} in, {s.busy_seconds:.2f}s, {s.per_second:.0f}/s"
+                for s in self.stats
+            )
+        )
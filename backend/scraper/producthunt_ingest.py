@@ -8,14 +8,30 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scraper.producthunt_scraper import producthunt_scraper
-from database.connection import db
 from database.models import AITool
+from scraper.refresh import stream_tools
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _build_tool(product: dict) -> AITool:
+    # Analyzer fields (summary, use_cases, category, pricing, hype_score) are
+    # present unless enrichment is switched off
+    return AITool(
+        name=product["name"],
+        description=product.get("description", "AI product from Product Hunt"),
+        url=product["url"],
+        source="producthunt",
+        summary=product.get("summary"),
+        use_cases=product.get("use_cases"),
+        category=product.get("category", "AI"),
+        pricing=product.get("pricing", "unknown"),
+        hype_score=product.get("hype_score", 50)  # Default score for PH products
+    )
+
+
 def ingest_producthunt():
     """
     Ingest Product Hunt AI products into the database
@@ -28,63 +44,23 @@ def ingest_producthunt():
     logger.info("Starting Product Hunt ingestion")
     
     try:
-        # STEP 1: Run the scraper
-        products = producthunt_scraper.scrape_ai_products()
-        
-        # Log raw count BEFORE processing
-        logger.info(f"PH Scraping returned {len(products)} products")
-        
-        # STEP 2: Track stats
-        scraped = len(products)
-        inserted = 0
-        skipped = 0
-        failed = 0
-        
-        # STEP 3: Ingest each product
-        for product in products:
-            try:
-                # Prevent duplicates by URL
-                existing = db.client.table("ai_tools") \
-                    .select("id") \
-                    .eq("url", product["url"]) \
-                    .execute()
-                
-                if existing.data:
-                    skipped += 1
-                    logger.info(f"Skipped duplicate: {product['name']}")
-                    continue
-                
-                # Create AITool model
-                ai_tool = AITool(
-                    name=product["name"],
-                    description=product.get("description", "AI product from Product Hunt"),
-                    url=product["url"],
-                    source="producthunt",
-                    category="AI",
-                    pricing="unknown",
-                    hype_score=50  # Default score for PH products
-                )
-                
-                # Insert to database
-                result = db.insert_tool(ai_tool)
-                if result:
-                    inserted += 1
-                    logger.info(f"✅ Inserted PH tool: {ai_tool.name} | ID: {result.get('id', 'unknown')}")
-                else:
-                    failed += 1
-                    logger.warning(f"DB insert failed for {product.get('name', 'Unknown')}, no error but no data returned.")
-
-            except Exception as e:
-                failed += 1
-                logger.error(f"❌ Failed to insert {product.get('name', 'Unknown')}: {str(e)}")
-                continue
+        # Scrape, build and store as one pipeline. Products come from the
+        # topic page's embedded data; their upvotes feed the hype score, so a
+        # product seen again has its score refreshed as the votes grow
+        counts = stream_tools("producthunt", producthunt_scraper.iter_ai_products(), _build_tool)
+        scraped = counts["scraped"]
+        inserted = counts["inserted"]
+        updated = counts["updated"]
+        skipped = counts["skipped"]
+        failed = counts["failed"]
         
-        # STEP 4: Log final summary
+        # Log final summary
         summary = f"""
 🎉 Product Hunt ingest complete!
    📊 Scraped: {scraped}
    ✅ Inserted: {inserted}
-   ⏭️ Skipped (duplicates): {skipped}
+   🔄 Updated: {updated}
+   ⏭️ Skipped (unchanged): {skipped}
    ❌ Failed: {failed}
         """
         logger.info(summary)
@@ -92,9 +68,10 @@ def ingest_producthunt():
         return {
             "scraped": scraped,
             "inserted": inserted,
+            "updated": updated,
             "skipped": skipped,
             "failed": failed,
-            "status": "success" if inserted > 0 or scraped == 0 else "warning"
+            "status": "success" if inserted + updated > 0 or scraped == 0 else "warning"
         }
     
     except Exception as e:
@@ -102,6 +79,7 @@ def ingest_producthunt():
         return {
             "scraped": 0,
             "inserted": 0,
+            "updated": 0,
             "skipped": 0,
             "failed": 0,
             "status": "error",
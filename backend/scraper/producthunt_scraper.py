@@ -1,11 +1,19 @@
 """
 Product Hunt Scraper
 Finds new AI product launches
+
+The topic page embeds its products as structured data (the Next.js data
+blob, and JSON-LD on some pages) with name, tagline and vote count, so one
+listing request is enough. A product page is only fetched for a product the
+embedded data doesn't cover, or covers without a tagline or votes.
 """
 
-import requests
+from scraper import http_client
+from scraper.parse_pool import parse_pool
+from scraper.resilience import CircuitOpenError, DeadlineExceeded
 from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional
+import json
 import logging
 import time
 import os
@@ -13,6 +21,38 @@ import os
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# schema.org types a JSON-LD product can come as
+JSON_LD_PRODUCT_TYPES = {'Product', 'SoftwareApplication', 'WebApplication', 'MobileApplication'}
+
+
+def _walk(node) -> Iterator[Dict]:
+    """
+    Every dict in a parsed JSON document, depth first, in document order
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _load_script(script) -> Optional[object]:
+    try:
+        return json.loads(script.string or '')
+    except ValueError:
+        return None
+
+
+def _vote_count(value) -> Optional[int]:
+    try:
+        return int(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return None
+
+
 class ProductHuntScraper:
     """
     Scrapes Product Hunt for AI product launches
@@ -32,121 +72,239 @@ class ProductHuntScraper:
         Returns:
             List of AI products with their data
         """
+        return list(self.iter_ai_products())
+    
+    def iter_ai_products(self) -> Iterator[Dict]:
+        """
+        Scrape today's AI product launches, yielding each product as soon as
+        it is complete
+        
+        Yields:
+            AI products with their data
+        """
         logger.info("🔍 Scraping Product Hunt for AI products...")
         
         try:
             # Product Hunt homepage shows today's launches
             url = f"{self.base_url}/topics/artificial-intelligence"
             
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = http_client.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Parse HTML (in a parse worker, off this thread)
+            candidates = parse_pool.run(parse_listing_page, response.content)
+            embedded_count = sum(1 for product in candidates if product.get('name'))
             
-            products = []
-            ai_filtered_products = []
-            
-            # Find product cards (Note: PH structure changes often)
-            # This is a simplified scraper - real implementation might need updates
-            product_links = soup.find_all('a', href=True)
+            logger.info(f"🔍 Found {len(candidates)} products on page ({embedded_count} from embedded data)")
             
-            logger.info(f"🔍 Found {len(product_links)} total links on page")
-            
-            visited_urls = set()
-            scraped_count = 0
+            products = []
+            fetched_count = 0
             ai_related_count = 0
             
-            for link in product_links[:50]:  # Check first 50 links (increased for better coverage)
-                href = link.get('href', '')
-                
-                # Product Hunt URLs look like: /posts/product-name
-                if '/posts/' in href and href not in visited_urls:
-                    visited_urls.add(href)
-                    scraped_count += 1
-                    
-                    try:
-                        product_data = self._scrape_product_page(href)
-                        
-                        if product_data:
-                            # Check if AI-related BEFORE adding
-                            is_ai = self._is_ai_related(product_data)
-                            
-                            if is_ai:
-                                ai_related_count += 1
-                                products.append(product_data)
-                                logger.info(f"✅ Found AI product: {product_data['name']} | URL: {product_data['url']}")
-                            else:
-                                logger.debug(f"⏭️ Skipped non-AI product: {product_data.get('name', 'Unknown')}")
-                    
-                    except Exception as e:
-                        logger.error(f"Error scraping product: {str(e)}")
-                        continue
+            for product_data in candidates:
+                try:
+                    if self._is_incomplete(product_data):
+                        product_data = self._scrape_product_page(product_data['url'], product_data)
+                        fetched_count += 1
+                        # Be polite
+                        time.sleep(1)
                     
-                    # Be polite
-                    time.sleep(1)
-                    
-                    # Limit to 10 products per run
-                    if len(products) >= 10:
-                        break
+                    # Check if AI-related BEFORE adding
+                    if self._is_ai_related(product_data):
+                        ai_related_count += 1
+                        products.append(product_data)
+                        logger.info(f"✅ Found AI product: {product_data['name']} | URL: {product_data['url']}")
+                        yield product_data
+                    else:
+                        logger.debug(f"⏭️ Skipped non-AI product: {product_data.get('name', 'Unknown')}")
+                
+                except (DeadlineExceeded, CircuitOpenError):
+                    # Every other page would fail the same way: stop here
+                    raise
+                except Exception as e:
+                    logger.error(f"Error scraping product: {str(e)}")
+                    continue
+                
+                # Limit to 10 products per run
+                if len(products) >= 10:
+                    break
             
             # DEBUG: Log what we found BEFORE returning
-            logger.info(f"🧪 Raw products scraped: {scraped_count}")
+            logger.info(f"🧪 Products found: {len(candidates)} ({fetched_count} product pages fetched)")
             logger.info(f"🧪 Products passing AI filter: {ai_related_count}")
             logger.info(f"🧪 Final products returned: {len(products)}")
             
             # Log sample of products for debugging
             for p in products[:5]:
-                logger.info(f"🧪 Product: {p['name']} | {p['url']}")
+                logger.info(f"🧪 Product: {p['name']} | {p['url']} | {p['upvotes']} upvotes")
             
             logger.info(f"✅ Found {len(products)} AI products")
-            return products
         
         except Exception as e:
             logger.error(f"❌ Error scraping Product Hunt: {str(e)}")
-            return []
     
-    def _scrape_product_page(self, product_url: str) -> Dict:
+    def _parse_listing(self, html: bytes) -> List[Dict]:
         """
-        Scrape individual product page
+        Products on a listing page: those it embeds as data, then any other
+        product links (PH structure changes often - these get their own page
+        fetched)
         
         Args:
-            product_url: Relative URL of product page
+            html: Raw page
         
         Returns:
-            Product data dictionary
+            Product dicts, link-only ones with just a url
         """
-        full_url = f"{self.base_url}{product_url}"
+        soup = BeautifulSoup(html, 'html.parser')
+        candidates = self._embedded_products(soup)
+        listed = {product['url'] for product in candidates}
         
-        response = requests.get(full_url, headers=self.headers, timeout=10)
-        response.raise_for_status()
+        for link in soup.find_all('a', href=True)[:50]:  # Check first 50 links
+            href = link.get('href', '')
+            
+            # Product Hunt URLs look like: /posts/product-name
+            if '/posts/' in href:
+                full_url = self._post_url(href)
+                if full_url not in listed:
+                    listed.add(full_url)
+                    candidates.append({'url': full_url})
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        return candidates
+    
+    def _embedded_products(self, soup: BeautifulSoup) -> List[Dict]:
+        """
+        Products embedded in a page as data, in page order
         
-        # Extract product name from URL
-        product_name = product_url.split('/posts/')[1] if '/posts/' in product_url else "Unknown"
-        product_name = product_name.replace('-', ' ').title()
+        Reads the Next.js data blob (posts in its Apollo cache) and JSON-LD
+        blocks; a product found in both gets the fields either one has.
         
-        # Try to find description (meta tag)
-        description = ""
-        meta_desc = soup.find('meta', {'name': 'description'})
-        if meta_desc:
-            description = meta_desc.get('content', '')
+        Args:
+            soup: Parsed page
         
-        # Try to find tagline
-        if not description:
-            # Look for h1 or main heading
-            h1 = soup.find('h1')
-            if h1:
-                description = h1.get_text(strip=True)
+        Returns:
+            Product dicts with url and whatever of name, description and
+            upvotes the data had
+        """
+        found: Dict[str, Dict] = {}
+        
+        def add(product: Dict):
+            merged = found.setdefault(product['url'], {'url': product['url']})
+            for key, value in product.items():
+                if merged.get(key) in (None, ''):
+                    merged[key] = value
+        
+        script = soup.find('script', id='__NEXT_DATA__')
+        data = _load_script(script) if script else None
+        for node in _walk(data):
+            slug = node.get('slug')
+            if isinstance(slug, str) and isinstance(node.get('name'), str) and (
+                    node.get('__typename') == 'Post' or 'tagline' in node or 'votesCount' in node):
+                add(self._product(
+                    f"/posts/{slug}", node['name'],
+                    node.get('tagline') or node.get('description'),
+                    _vote_count(node.get('votesCount', node.get('votes_count')))
+                ))
+        
+        for script in soup.find_all('script', type='application/ld+json'):
+            for node in _walk(_load_script(script)):
+                types = node.get('@type')
+                types = set(types) if isinstance(types, list) else {types}
+                url = node.get('url') or node.get('@id') or ''
+                if not (types & JSON_LD_PRODUCT_TYPES) or '/posts/' not in str(url) or not node.get('name'):
+                    continue
+                votes = None
+                stats = node.get('interactionStatistic') or []
+                for stat in stats if isinstance(stats, list) else [stats]:
+                    if isinstance(stat, dict) and 'userInteractionCount' in stat:
+                        votes = _vote_count(stat['userInteractionCount'])
+                add(self._product(url, node['name'], node.get('description'), votes))
         
+        return list(found.values())
+    
+    def _product(self, href: str, name: str, description: Optional[str], upvotes: Optional[int]) -> Dict:
         return {
-            'name': product_name,
-            'url': full_url,
-            'description': description or "AI product from Product Hunt",
+            'name': name,
+            'url': self._post_url(href),
+            'description': description,
             'source': 'producthunt',
-            'upvotes': 0  # Would need more complex scraping for real upvotes
+            'upvotes': upvotes,
         }
     
+    def _post_url(self, href: str) -> str:
+        """
+        Absolute post URL without query string or fragment, so a product
+        keeps one URL however a page links to it
+        """
+        path = href.split('?')[0].split('#')[0]
+        return path if path.startswith('http') else f"{self.base_url}{path}"
+    
+    def _is_incomplete(self, product_data: Dict) -> bool:
+        return not product_data.get('name') or not product_data.get('description') \
+            or product_data.get('upvotes') is None
+    
+    def _scrape_product_page(self, full_url: str, known: Optional[Dict] = None) -> Dict:
+        """
+        Scrape individual product page for the fields the listing didn't have
+        
+        Args:
+            full_url: Absolute URL of product page
+            known: Fields already found for the product
+        
+        Returns:
+            Product data dictionary
+        """
+        response = http_client.get(full_url, headers=self.headers, timeout=10)
+        response.raise_for_status()
+        
+        return parse_pool.run(parse_product_page, response.content, full_url, known)
+    
+    def _parse_product_page(self, html: bytes, full_url: str, known: Optional[Dict] = None) -> Dict:
+        """
+        Complete a product from its page: embedded data first, then the
+        markup (h1, meta description, vote button)
+        
+        Args:
+            html: Raw page
+            full_url: Absolute URL of product page
+            known: Fields already found for the product
+        
+        Returns:
+            Product data dictionary
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        product = dict(known or {})
+        product.setdefault('source', 'producthunt')
+        product['url'] = full_url
+        for embedded in self._embedded_products(soup):
+            if embedded['url'] == full_url:
+                for key, value in embedded.items():
+                    if product.get(key) in (None, ''):
+                        product[key] = value
+        
+        if not product.get('name'):
+            h1 = soup.find('h1')
+            slug = full_url.split('/posts/')[1] if '/posts/' in full_url else "Unknown"
+            product['name'] = h1.get_text(strip=True) if h1 else slug.replace('-', ' ').title()
+        
+        # Try to find description (meta tag), then the tagline heading
+        if not product.get('description'):
+            meta_desc = soup.find('meta', {'name': 'description'})
+            if meta_desc:
+                product['description'] = meta_desc.get('content', '')
+        if not product.get('description'):
+            heading = soup.find('h2') or soup.find('h1')
+            if heading:
+                product['description'] = heading.get_text(strip=True)
+        product['description'] = product.get('description') or "AI product from Product Hunt"
+        
+        if product.get('upvotes') is None:
+            button = soup.find(attrs={'data-test': 'vote-button'})
+            product['upvotes'] = _vote_count(button.get_text(strip=True)) if button else None
+        product['upvotes'] = product['upvotes'] or 0
+        
+        return product
+    
     def _is_ai_related(self, product_data: Dict) -> bool:
         """
         Check if product is AI-related
@@ -169,4 +327,18 @@ class ProductHuntScraper:
         return any(keyword in text for keyword in ai_keywords)
 
 # Create scraper instance
-producthunt_scraper = ProductHuntScraper()
\ No newline at end of file
+producthunt_scraper = ProductHuntScraper()
+
+
+def parse_listing_page(html: bytes) -> List[Dict]:
+    """
+    Products on a topic page (runs in the parse pool)
+    """
+    return producthunt_scraper._parse_listing(html)
+
+
+def parse_product_page(html: bytes, full_url: str, known: Optional[Dict] = None) -> Dict:
+    """
+    A product completed from its own page (runs in the parse pool)
+    """
+    return producthunt_scraper._parse_product_page(html, full_url, known)
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""
+Ingest Storage with Refresh
+Saves one scrape's tools: new URLs are inserted, and tools seen before get
+their metrics refreshed instead of being skipped
+
+stream_tools() runs a scrape as a pipeline (scraper/pipeline.py): records
+are spooled to disk (scraper/spool.py), completed a batch at a time by the
+source's own lookup if it has one, enriched by the AI analyzer, built
+into tools, deduplicated and written in micro-batches while the scraper is
+still fetching. If the previous run of a source died part way, its
+unfinished records are ingested from the spool first, ahead of the scrape.
+save_tools() stores an already collected list the same way.
+
+Configuration (environment):
+    INGEST_REFRESH: "false" to skip tools that already exist, as ingest used
+        to (default: refresh)
+    INGEST_BATCH_SIZE: tools looked up and written per round trip (default: 50)
+    INGEST_ENRICH: "false" to skip AI analysis (summary, use cases, category,
+        pricing, hype score) when scans must be fast (default: enrich)
+"""
+
+import itertools
+import os
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.analyzer import ai_analyzer
+from database.connection import db
+from database.models import AITool
+from monitoring.scan_trace import phase, record_error
+from scraper.pipeline import Pipeline
+from scraper.spool import spool
+
+logger = logging.getLogger(__name__)
+
+# Columns a re-scrape can change. Stars and likes feed hype_score; the rest
+# of a tool (name, description, category...) is left as first seen
+METRIC_COLUMNS = ("github_stars", "hype_score")
+
+LOOKUP_COLUMNS = ",".join(("id", "url") + METRIC_COLUMNS)
+
+REFRESH = os.getenv("INGEST_REFRESH", "true").lower() == "true"
+
+BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 50))
+
+ENRICH = os.getenv("INGEST_ENRICH", "true").lower() == "true"
+
+
+def changed_metrics(tool: AITool, stored: dict) -> dict:
+    """
+    Metric columns whose scraped value differs from the stored one
+
+    Args:
+        tool: Freshly scraped tool
+        stored: Its row in ai_tools
+
+    Returns:
+        {column: new value} for each changed column (empty if none)
+    """
+    changes = {}
+    for column in METRIC_COLUMNS:
+        value = getattr(tool, column)
+        # A source that doesn't report a metric never clears it
+        if value is not None and value != stored.get(column):
+            changes[column] = value
+    return changes
+
+
+class WriteBatch:
+    """
+    One micro-batch sorted by Deduper: tools to insert, metric updates to
+    apply and URLs of tools that needed neither
+    """
+
+    def __init__(self):
+        self.new: List[AITool] = []
+        self.updates: List[dict] = []
+        self.unchanged: List[str] = []
+        # Filled in by write_batch: URLs that are now stored as scraped
+        self.written: List[str] = []
+
+
+class Deduper:
+    """
+    Sorts tools into new, changed and unchanged with one lookup per batch
+
+    Every URL seen is remembered, so a tool that turns up twice in one scrape
+    is stored once even when the copies land in different batches.
+    """
+
+    def __init__(self, refresh: bool = REFRESH):
+        self.refresh = refresh
+        self._stored: Dict[str, Optional[dict]] = {}
+
+    def __call__(self, tools: List[AITool]) -> List[WriteBatch]:
+        unknown = list({tool.url for tool in tools if tool.url not in self._stored})
+        if unknown:
+            self._stored.update(db.get_tools_by_url(unknown, LOOKUP_COLUMNS))
+
+        batch = WriteBatch()
+        for tool in tools:
+            if tool.url not in self._stored:
+                batch.new.append(tool)
+                # Being inserted: later copies of this URL are duplicates
+                self._stored[tool.url] = None
+                continue
+
+            row = self._stored[tool.url]
+            changes = changed_metrics(tool, row) if self.refresh and row else {}
+            if changes:
+                batch.updates.append({'id': row['id'], **changes})
+                row.update(changes)
+            else:
+                batch.unchanged.append(tool.url)
+                logger.debug(f"Skipped unchanged tool: {tool.name}")
+
+        return [batch]
+
+
+def write_batch(batch: WriteBatch) -> Dict[str, int]:
+    """
+    Insert a batch's new tools and apply its metric updates, one request each
+
+    Returns:
+        Counts of inserted, updated, skipped and failed tools
+    """
+    counts = {"inserted": 0, "updated": 0, "skipped": len(batch.unchanged), "failed": 0}
+    batch.written = list(batch.unchanged)
+
+    if batch.new:
+        saved = {row.get("url") for row in db.insert_tools(batch.new)}
+        for tool in batch.new:
+            if tool.url in saved:
+                counts["inserted"] += 1
+                batch.written.append(tool.url)
+                logger.info(f"✅ Inserted {tool.source} tool: {tool.name}")
+            else:
+                counts["failed"] += 1
+                record_error(f"{tool.name}: insert returned no data")
+
+    if batch.updates:
+        try:
+            counts["updated"] = db.update_tools(batch.updates)
+            batch.written.extend(update["url"] for update in batch.updates)
+        except Exception as e:
+            counts["failed"] += len(batch.updates)
+            logger.error(f"❌ Failed to refresh {len(batch.updates)} tools: {str(e)}")
+            record_error(f"refresh of {len(batch.updates)} tools: {str(e)}")
+
+    return counts
+
+
+def stream_tools(source: str, items: Iterable[dict], build: Callable[[dict], AITool],
+                 refresh: bool = REFRESH, enrich: bool = ENRICH,
+                 details: Optional[Callable[[List[dict]], List[dict]]] = None) -> Dict[str, int]:
+    """
+    Scrape, enrich, build and store tools as a pipeline, batch by batch
+
+    Args:
+        source: Source name for logs, stage metrics and the spool
+        items: Scraped records, ideally a generator that fetches lazily
+        build: Turns one record into an AITool (raising drops the record);
+            enriched records carry summary, use_cases, category, pricing and hype_score
+        refresh: Update changed metrics of tools already stored
+        enrich: Run the AI analyzer over each record before building it
+        details: Adds upstream fields to a batch of records with one request
+            (e.g. GitHub repo details); runs before the analyzer, billed as scraping
+
+    Returns:
+        Counts of scraped, inserted, updated, skipped and failed tools
+    """
+    if enrich:
+        def analyze(record: dict) -> AITool:
+            return build(ai_analyzer.analyze_tool(record))
+        workers = ai_analyzer.workers
+    else:
+        analyze, workers = build, 1
+
+    spooled = spool.enabled and spool.claim(source)
+    if spool.enabled and not spooled:
+        logger.info(f"Spool: {source} is being ingested elsewhere, running unspooled")
+    if spooled:
+        # What a crashed run left goes first, then the scrape as usual
+        resumed = spool.resume(source) if spool.pending(source) else ()
+        items = itertools.chain(resumed, spool.append(source, items))
+
+    def write(batch: WriteBatch) -> Dict[str, int]:
+        counts = write_batch(batch)
+        if spooled:
+            spool.checkpoint(source, batch.written)
+        return counts
+
+    # "analyze" is billed to the scan log's analyze phase
+    pipeline = Pipeline(source)
+    if details is not None:
+        pipeline.stage("details", details, batch_size=BATCH_SIZE, phase="scrape")
+    pipeline \
+        .stage("analyze", analyze, workers=workers) \
+        .stage("dedup", Deduper(refresh), batch_size=BATCH_SIZE) \
+        .stage("insert", write)
+
+    counts = {"scraped": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0}
+    try:
+        for result in pipeline.run(items):
+            for key, count in result.items():
+                counts[key] += count
+        if spooled:
+            spool.finish(source)
+    finally:
+        if spooled:
+            spool.release(source)
+
+    counts["scraped"] = pipeline.scrape.items_out
+    counts["failed"] += sum(stats.failed for stats in pipeline.stats)
+    return counts
+
+
+def save_tools(tools: List[AITool], refresh: bool = REFRESH) -> Dict[str, int]:
+    """
+    Store a scrape's tools with one batched lookup instead of one per tool
+
+    Args:
+        tools: Tools built from the scrape
+        refresh: Update changed metrics of tools already stored (otherwise skip them)
+
+    Returns:
+        Counts of inserted, updated, skipped and failed tools
+    """
+    with phase("dedup"):
+        batch = Deduper(refresh)(tools)[0]
+    with phase("insert"):
+        return write_batch(batch)
@@ -0,0 +1,178 @@
+"""
+Upstream Resilience
+Deadlines, per-host circuit breakers and retry backoff for the shared HTTP
+client (scraper/http_client.py)
+
+A deadline is set around a block of work with `with deadline(seconds):` and
+holds for everything that block calls, including pipeline threads started
+inside it (they copy the caller's context). Requests made under it get their
+timeout cut to the time left, and once it has passed no new request starts.
+
+Configuration (environment):
+    UPSTREAM_BREAKER_FAILURES: consecutive failures before a host's breaker
+        opens and its requests fail fast (default: 5)
+    UPSTREAM_BREAKER_COOLDOWN: seconds an open breaker waits before letting
+        one trial request through (default: 60)
+    UPSTREAM_BACKOFF_BASE: first retry delay in seconds, doubled each retry (default: 0.5)
+    UPSTREAM_BACKOFF_MAX: longest retry delay in seconds (default: 8)
+"""
+
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import requests
+
+from monitoring.metrics import UPSTREAM_BREAKER_STATE
+
+logger = logging.getLogger(__name__)
+
+BREAKER_FAILURES = int(os.getenv("UPSTREAM_BREAKER_FAILURES", 5))
+BREAKER_COOLDOWN = float(os.getenv("UPSTREAM_BREAKER_COOLDOWN", 60))
+BACKOFF_BASE = float(os.getenv("UPSTREAM_BACKOFF_BASE", 0.5))
+BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", 8))
+
+# time.monotonic() after which no request may start; None for no deadline
+_deadline = contextvars.ContextVar("upstream_deadline", default=None)
+
+
+class DeadlineExceeded(requests.RequestException):
+    """
+    The time budget of the current scan or source has run out
+    """
+
+
+class CircuitOpenError(requests.RequestException):
+    """
+    The host has been failing, so the request wasn't sent
+    """
+
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """
+    Give the enclosed work `seconds` to finish its upstream calls
+
+    A deadline already in force is never extended, only shortened. None
+    leaves the current one as it is.
+    """
+    if seconds is None:
+        yield
+        return
+
+    ends = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(ends if current is None else min(ends, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left before the current deadline (never negative), or None
+    """
+    ends = _deadline.get()
+    return None if ends is None else max(0.0, ends - time.monotonic())
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def backoff(attempt: int) -> float:
+    """
+    Delay before retry number `attempt` (1, 2, ...): exponential with full
+    jitter, so clients that failed together don't retry together
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Fails a host's requests fast after it has failed repeatedly
+
+    closed: requests go through; BREAKER_FAILURES consecutive failures open it
+    open: requests fail with CircuitOpenError until BREAKER_COOLDOWN passes
+    half-open: one trial request goes through; success closes, failure (or
+        an inconclusive answer) reopens; if the trial never reports back, the
+        next one goes through after another BREAKER_COOLDOWN
+    """
+
+    def __init__(self, host: str, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.host = host
+        self.failure_threshold = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """
+        Raises:
+            CircuitOpenError if the host is not being called right now
+        """
+        with self._lock:
+            if self.state == "closed":
+                return
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                # From half-open too: a trial that never reported back
+                # mustn't keep the host shut for good
+                self.opened_at = time.monotonic()
+                self._set("half-open")
+                return
+            raise CircuitOpenError(f"circuit open for {self.host} after {self.failures} failures")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != "closed":
+                logger.info(f"✅ {self.host} recovered, circuit closed")
+                self._set("closed")
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.error(f"❌ {self.host} failed {self.failures} times, circuit open for {self.cooldown:.0f}s")
+                self.opened_at = time.monotonic()
+                self._set("open")
+
+    def record_inconclusive(self):
+        """
+        An answer that says nothing about the host's health (a 429, an
+        unexpected error): ignored while closed, but a half-open trial that
+        ends this way reopens the breaker rather than leaving it half-open
+        """
+        with self._lock:
+            if self.state == "half-open":
+                logger.error(f"❌ {self.host} trial request inconclusive, circuit open for {self.cooldown:.0f}s")
+                self.opened_at = time.monotonic()
+                self._set("open")
+
+    def _set(self, state: str):
+        self.state = state
+        UPSTREAM_BREAKER_STATE.set({"closed": 0, "half-open": 1, "open": 2}[state], host=self.host)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(host: str) -> CircuitBreaker:
+    """
+    The shared breaker for a host
+    """
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
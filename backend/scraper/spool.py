@@ -0,0 +1,253 @@
+"""
+Scrape Spool
+Local SQLite queue of scraped records with a status per record, so an ingest
+that dies part way resumes from disk instead of scraping everything again
+
+Records are appended as the scraper yields them and checkpointed as done
+once the batch holding them has been written. Both are applied together,
+one SQLite transaction per INGEST_SPOOL_BATCH records, and a record is
+inserted in the same transaction as (or before) its done mark. A crash
+loses at most the last batch: records scraped but not yet spooled, which
+the next run's scrape brings back anyway, and done marks not yet applied,
+whose records are resumed and deduplicated. A run that gets to the end
+drops its done records and marks whatever is left failed, so only a run
+that died part way leaves records pending. The next run of the
+source feeds those through the pipeline first, then scrapes as usual: what
+the crash lost is recovered without a scan being skipped. A record whose
+write the database rejected isn't queued again - the next scrape brings it
+back fresh if the source still lists it. Records are matched to their batch
+by URL: writing the same URL twice is harmless, since a resumed record
+whose insert landed before the crash is simply deduplicated.
+
+A run holds its source's spool with an exclusive flock (as the embedded
+scheduler's leader lock does), so a manual job and the scheduler never
+resume each other's records: whichever comes second ingests unspooled.
+
+Configuration (environment):
+    INGEST_SPOOL_ENABLED: "false" to ingest straight from the scrapers (default: on)
+    INGEST_SPOOL_PATH: spool database (default: in the temp directory, one
+        per SUPABASE_URL)
+    INGEST_SPOOL_MAX_ATTEMPTS: runs a record may go through before it is
+        marked failed instead of retried again (default: 3)
+    INGEST_SPOOL_BATCH: records appended or checkpointed per SQLite
+        transaction (default: 500)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Iterable, Iterator
+
+import orjson
+
+try:
+    import fcntl
+except ImportError:  # Windows: no locking, one process at a time
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spool (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    url TEXT,
+    record BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_spool_source_status ON spool (source, status, seq);
+CREATE INDEX IF NOT EXISTS idx_spool_source_url ON spool (source, url);
+"""
+
+_INSERT = "INSERT INTO spool (source, url, record) VALUES (?, ?, ?)"
+
+
+class Spool:
+    """
+    Per-source queue of scraped records: pending until written, then done
+    (or failed once out of attempts)
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("INGEST_SPOOL_ENABLED", "true").lower() == "true"
+        # Deployments sharing a host (and its temp directory) get a spool each
+        deployment = hashlib.sha1(os.getenv("SUPABASE_URL", "").encode()).hexdigest()[:8]
+        self.path = os.getenv(
+            "INGEST_SPOOL_PATH",
+            os.path.join(tempfile.gettempdir(), f"ai-tool-tracker-spool-{deployment}.db")
+        )
+        self.max_attempts = int(os.getenv("INGEST_SPOOL_MAX_ATTEMPTS", 3))
+        self.batch_size = int(os.getenv("INGEST_SPOOL_BATCH", 500))
+        self._conn = None
+        # source -> rows appended but not yet inserted
+        self._unflushed: Dict[str, list] = {}
+        # source -> URLs checkpointed but not yet marked done
+        self._written: Dict[str, list] = {}
+        # source -> fd of the lock file held while ingesting it
+        self._claims: Dict[str, int] = {}
+        # The scrape and insert stages run on different threads
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            # WAL keeps each commit to an append, without an fsync per record
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def claim(self, source: str) -> bool:
+        """
+        Take the source's spool for this run
+
+        Returns:
+            False if another run (in this process or another) is ingesting
+            the source: its pending records aren't this run's to resume
+        """
+        fd = os.open(f"{self.path}.{source}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+        with self._lock:
+            self._claims[source] = fd
+        return True
+
+    def release(self, source: str):
+        with self._lock:
+            # A run that failed part way keeps what it scraped, to resume
+            self._flush(source)
+            fd = self._claims.pop(source, None)
+        if fd is not None:
+            os.close(fd)
+
+    def pending(self, source: str) -> int:
+        """
+        Unfinished records of a source; more than zero means the last run
+        died part way and the next one should resume() them
+        """
+        with self._lock:
+            db = self._db()
+            # Records that keep failing are given up on rather than retried forever
+            given_up = db.execute(
+                "UPDATE spool SET status = 'failed' "
+                "WHERE source = ? AND status = 'pending' AND attempts >= ?",
+                (source, self.max_attempts)
+            ).rowcount
+            if given_up:
+                logger.error(f"❌ Spool: gave up on {given_up} {source} records after {self.max_attempts} attempts")
+            return db.execute(
+                "SELECT count(*) FROM spool WHERE source = ? AND status = 'pending'", (source,)
+            ).fetchone()[0]
+
+    def append(self, source: str, items: Iterable[dict]) -> Iterator[dict]:
+        """
+        Spool each record from a fresh scrape, then pass it on
+
+        Failed records of the source's previous runs are cleared first.
+        """
+        with self._lock:
+            self._db().execute("DELETE FROM spool WHERE source = ? AND status = 'failed'", (source,))
+
+        for record in items:
+            with self._lock:
+                rows = self._unflushed.setdefault(source, [])
+                rows.append((source, record.get("url"), orjson.dumps(record)))
+                if len(rows) >= self.batch_size:
+                    self._flush(source)
+            yield record
+
+    def _flush(self, source: str):
+        """
+        Insert the source's appended rows and mark its checkpointed URLs done,
+        in one transaction (caller holds the lock)
+        """
+        rows = self._unflushed.pop(source, None)
+        urls = self._written.pop(source, None)
+        if not rows and not urls:
+            return
+        db = self._db()
+        db.execute("BEGIN")
+        if rows:
+            db.executemany(_INSERT, rows)
+        # One statement per chunk rather than per URL (older SQLite builds
+        # allow 999 parameters)
+        for i in range(0, len(urls or ()), 500):
+            chunk = urls[i:i + 500]
+            db.execute(
+                "UPDATE spool SET status = 'done' WHERE source = ? AND status = 'pending' "
+                f"AND url IN ({','.join('?' * len(chunk))})",
+                (source, *chunk)
+            )
+        db.execute("COMMIT")
+
+    def resume(self, source: str) -> Iterator[dict]:
+        """
+        The unfinished records of an interrupted run, in scrape order
+
+        Read when iteration starts, so records append() adds afterwards
+        aren't included
+        """
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "UPDATE spool SET attempts = attempts + 1 WHERE source = ? AND status = 'pending'",
+                (source,)
+            )
+            rows = db.execute(
+                "SELECT record FROM spool WHERE source = ? AND status = 'pending' ORDER BY seq",
+                (source,)
+            ).fetchall()
+
+        logger.info(f"Spool: resuming {len(rows)} unfinished {source} records before scraping")
+        for (record,) in rows:
+            yield orjson.loads(record)
+
+    def checkpoint(self, source: str, urls: Iterable[str]):
+        """
+        Mark the records with these URLs as written (on disk with the next
+        flush: at most INGEST_SPOOL_BATCH records later)
+        """
+        with self._lock:
+            written = self._written.setdefault(source, [])
+            written.extend(urls)
+            if len(written) >= self.batch_size:
+                self._flush(source)
+
+    def finish(self, source: str):
+        """
+        Close a run that got to the end: its done records are dropped, and
+        whatever is still pending was dropped along the way or had its write
+        rejected, and is marked failed rather than resumed - the next scrape
+        brings it back fresh
+        """
+        with self._lock:
+            self._flush(source)
+            db = self._db()
+            db.execute("BEGIN")
+            db.execute("DELETE FROM spool WHERE source = ? AND status = 'done'", (source,))
+            db.execute(
+                "UPDATE spool SET status = 'failed' WHERE source = ? AND status = 'pending'", (source,)
+            )
+            db.execute("COMMIT")
+
+    def counts(self, source: str) -> Dict[str, int]:
+        """
+        Records of a source by status
+        """
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT status, count(*) FROM spool WHERE source = ? GROUP BY status", (source,)
+            ).fetchall()
+        return dict(rows)
+
+
+spool = Spool()
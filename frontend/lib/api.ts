@@ -16,7 +16,10 @@ interface ToolFilters {
 
 export async function getAllTools(filters: ToolFilters = {}) {
   try {
-    const response = await axios.get(`${API_BASE_URL}/api/tools`);
+    // Only the fields ToolCard renders
+    const response = await axios.get(`${API_BASE_URL}/api/tools`, {
+      params: { view: 'card' },
+    });
     let tools = response.data;
 
     // Normalize filters
@@ -48,7 +51,8 @@ export async function getAllTools(filters: ToolFilters = {}) {
 export async function getTrendingTools() {
   try {
     const response = await axios.get(
-      `${API_BASE_URL}/api/tools/trending`
+      `${API_BASE_URL}/api/tools/trending`,
+      { params: { view: 'card' } }
     );
     return response.data;
   } catch (error) {